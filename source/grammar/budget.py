@@ -0,0 +1,168 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Licensing
+#
+# Chomsky Grammar Transformations Budget
+# Copyright (C) 2018 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import time
+import functools
+
+from debug_tools import getLogger
+
+from .intermediate_grammar import IntermediateGrammar
+
+log = getLogger( 127, __name__ )
+
+
+class GrammarBudgetExceeded(RuntimeError):
+    """
+        Raised inside a grammar transformation when it exceeds one of the `GrammarBudget` limits.
+    """
+
+    def __init__(self, message):
+        super().__init__( message )
+
+
+class GrammarBudget(object):
+    """
+        Limits how much a grammar can grow or how long its transformations can run, as
+        `eliminate_left_recursion()`, `eliminate_indirect_factors()`, etc, can blow up the grammar
+        size exponentially.
+
+        A limit set to 0 means unlimited.
+    """
+
+    def __init__(self, maximum_productions=0, maximum_symbols=0, maximum_seconds=0):
+        """
+            `maximum_productions` the maximum count of productions the grammar can have
+            `maximum_symbols` the maximum count of symbols the grammar productions can have together
+            `maximum_seconds` the wall clock time the outermost transformation can take
+        """
+        ## The maximum count of productions the grammar can have
+        self.maximum_productions = maximum_productions
+
+        ## The maximum count of symbols on all the grammar productions together
+        self.maximum_symbols = maximum_symbols
+
+        ## The maximum wall clock time in seconds the outermost transformation can take
+        self.maximum_seconds = maximum_seconds
+
+        ## The time when the current outermost transformation must be aborted
+        self.deadline = 0
+
+        ## How many budgeted transformations are currently running, one inside another
+        self.depth = 0
+
+    def start(self):
+        """
+            Starts the wall clock for a new outermost transformation.
+        """
+
+        if self.maximum_seconds:
+            self.deadline = time.time() + self.maximum_seconds
+
+        else:
+            self.deadline = 0
+
+    def check(self, grammar, operation_name):
+        """
+            Raises `GrammarBudgetExceeded` if the `grammar` exceeded any of this budget limits.
+        """
+        self.check_deadline( operation_name )
+
+        if self.maximum_productions and grammar.productions_count > self.maximum_productions:
+            raise GrammarBudgetExceeded( "`%s()` exceeded the maximum productions count of %s (%s productions)" % (
+                    operation_name, self.maximum_productions, grammar.productions_count ) )
+
+        if self.maximum_symbols and grammar.symbols_count > self.maximum_symbols:
+            raise GrammarBudgetExceeded( "`%s()` exceeded the maximum symbols count of %s (%s symbols)" % (
+                    operation_name, self.maximum_symbols, grammar.symbols_count ) )
+
+    def check_deadline(self, operation_name):
+        """
+            Raises `GrammarBudgetExceeded` if the outermost transformation exceeded its time, which
+            is also checked on the loops not adding any productions, see `ChomskyGrammar._check_cancelled()`.
+        """
+
+        if self.deadline and time.time() > self.deadline:
+            raise GrammarBudgetExceeded( "`%s()` exceeded the maximum time of %s seconds" % (
+                    operation_name, self.maximum_seconds ) )
+
+
+def enforce_budget(function_to_decorate=None, aborted_result=None):
+    """
+        Decorator for the grammar transformations which have to respect the grammar `budget`.
+
+        When the budget is exceeded, the grammar is restored to its state before the outermost
+        transformation started, and the reason is recorded on the grammar operations history. Then,
+        the outermost transformation returns `aborted_result`, instead of throwing the exception.
+
+        Only the outermost transformation copies the grammar productions, as the transformations
+        called by it, for example, `eliminate_unuseful()` by `convert_to_proper()`, are aborted
+        together with it.
+    """
+
+    if function_to_decorate is None:
+        return functools.partial( enforce_budget, aborted_result=aborted_result )
+
+    @functools.wraps( function_to_decorate )
+    def wrapper(grammar, *args, **kargs):
+        budget = grammar.budget
+
+        if budget is None:
+            return function_to_decorate( grammar, *args, **kargs )
+
+        is_outermost = not budget.depth
+
+        if is_outermost:
+            budget.start()
+            productions = grammar._copy_productions()
+            initial_symbol = grammar.initial_symbol
+            optional_symbols = set( grammar.optional_symbols )
+
+        budget.depth += 1
+        grammar.budget_operations.append( function_to_decorate.__name__ )
+
+        try:
+            return function_to_decorate( grammar, *args, **kargs )
+
+        except GrammarBudgetExceeded as error:
+
+            if not is_outermost:
+                raise
+
+            grammar._restore_productions( productions, initial_symbol, optional_symbols )
+
+            # Do not use `_save_history()` as the restored grammar can be equal to the last one saved
+            if grammar.is_saving_history:
+                grammar.operations_history.append( IntermediateGrammar( grammar, "Budget Exceeded", IntermediateGrammar.END ) )
+                grammar.is_history_skipped = False
+                grammar._save_data( "%s, the grammar was restored to its state before `%s()` started.",
+                        str( error ), function_to_decorate.__name__ )
+
+            log( 1, "%s", error )
+            grammar.last_budget_error = error
+            return aborted_result
+
+        finally:
+            budget.depth -= 1
+            grammar.budget_operations.pop()
+
+    return wrapper
@@ -0,0 +1,63 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Licensing
+#
+# Chomsky Grammar Cancellation
+# Copyright (C) 2018 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from debug_tools import getLogger
+
+log = getLogger( 127, __name__ )
+
+
+class Cancelled(BaseException):
+    """
+        Raised inside a grammar operation when its `CancellationToken` was cancelled.
+
+        As `asyncio.CancelledError`, it is not an `Exception`, then, the handlers catching any
+        error, as the user interface `ignore_exceptions()`, do not report it as an error.
+    """
+
+
+class CancellationToken(object):
+    """
+        Stops the grammar operations cooperatively, see `ChomskyGrammar.cancellation_token`.
+
+        The operations check the token on their loops iterations boundaries, and raise `Cancelled`
+        after it was cancelled by another thread, as the user interface, instead of the thread
+        running them being terminated, which could leave its Python state corrupted.
+    """
+
+    def __init__(self):
+        ## Whether `cancel()` was called
+        self.is_cancelled = False
+
+    def cancel(self):
+        """
+            Requests the operations using this token to stop.
+        """
+        self.is_cancelled = True
+
+    def check(self):
+        """
+            Raises `Cancelled` if this token was cancelled.
+        """
+
+        if self.is_cancelled:
+            raise Cancelled( "The operation was cancelled." )
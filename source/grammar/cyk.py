@@ -0,0 +1,234 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Licensing
+#
+# Chomsky Grammar CYK Recognizer
+# Copyright (C) 2018 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from debug_tools import getLogger
+
+from .symbols import Terminal
+from .symbols import split_sentence
+from .production import epsilon_production
+
+log = getLogger( 127, __name__ )
+
+try:
+    import numpy
+
+except ImportError:
+    numpy = None
+
+
+class CYKRecognizer(object):
+    """
+        Cocke–Younger–Kasami recognizer for grammars on the Chomsky Normal Form, taking O(n³) time
+        on the sentence length for any context free grammar.
+
+        Each chart cell is the set of non terminals deriving a sentence substring. When NumPy is
+        available, the cells of all substrings with the same length are computed together by
+        boolean matrices operations, otherwise each cell is a Python integer bitset over the non
+        terminal's ids.
+    """
+
+    def __init__(self, grammar, use_numpy=None):
+        """
+            Builds the recognizer for the given `grammar`, which must be on the Chomsky Normal Form,
+            see `ChomskyGrammar.convert_to_cnf()`.
+
+            If `use_numpy` is None, NumPy is used when it is installed.
+        """
+
+        if not grammar.is_cnf():
+            raise RuntimeError( "The grammar must be on the Chomsky Normal Form! See `convert_to_cnf()`.\n%s" % grammar )
+
+        if use_numpy is None:
+            use_numpy = numpy is not None
+
+        elif use_numpy and numpy is None:
+            raise RuntimeError( "NumPy is not installed, use `use_numpy=False` instead." )
+
+        productions_keys = grammar.productions
+
+        ## The list of start symbols Productions, whose index is their non terminal id
+        self.non_terminals = grammar.initial_symbol_as_first()
+
+        ## A dictionary with the non terminal id for each start symbol
+        self.non_terminal_ids = { start_symbol: index for index, start_symbol in enumerate( self.non_terminals ) }
+
+        ## Whether the vectorized NumPy implementation is used
+        self.use_numpy = use_numpy
+
+        ## Whether the grammar generates the empty sentence
+        self.accepts_epsilon = grammar.has_production( grammar.initial_symbol, epsilon_production )
+
+        ## The non terminal id of the grammar initial symbol, or None if it has no productions
+        self.initial_id = self.non_terminal_ids.get( grammar.initial_symbol ) if grammar.initial_symbol in productions_keys else None
+
+        ## A dictionary with the bitset of the non terminals deriving each terminal string
+        self.terminal_bits = {}
+
+        ## The list of binary productions `A -> B C` as tuples of non terminal ids (A, B, C)
+        self.binary_rules = []
+
+        for start_symbol in productions_keys:
+            start_id = self.non_terminal_ids[start_symbol]
+
+            for production in productions_keys[start_symbol]:
+
+                if len( production ) == 2:
+                    self.binary_rules.append( ( start_id, self.non_terminal_ids[production[0]], self.non_terminal_ids[production[1]] ) )
+
+                elif len( production ) == 1 and type( production[0] ) is Terminal:
+                    terminal = str( production[0] )
+                    self.terminal_bits[terminal] = self.terminal_bits.get( terminal, 0 ) | ( 1 << start_id )
+
+        ## For each non terminal id B, a dictionary with the bitset of the non terminals A for each
+        ## non terminal id C, such as there is a production `A -> B C`
+        self.rules_by_left = [{} for _ in self.non_terminals]
+
+        ## For each non terminal id B, the bitset of the non terminals C such as `A -> B C` exists
+        self.right_masks = [0] * len( self.non_terminals )
+
+        for start_id, left_id, right_id in self.binary_rules:
+            rules = self.rules_by_left[left_id]
+            rules[right_id] = rules.get( right_id, 0 ) | ( 1 << start_id )
+            self.right_masks[left_id] |= 1 << right_id
+
+        if use_numpy:
+            self._build_numpy_tables()
+
+    def _build_numpy_tables(self):
+        non_terminals_count = len( self.non_terminals )
+        binary_rules = self.binary_rules
+
+        ## The arrays with the B and C non terminal ids of each binary rule `A -> B C`
+        self.rules_left = numpy.array( [rule[1] for rule in binary_rules], dtype=numpy.intp )
+        self.rules_right = numpy.array( [rule[2] for rule in binary_rules], dtype=numpy.intp )
+
+        ## The boolean incidence matrix with one row per binary rule, which is True on the column of
+        ## the rule non terminal A
+        self.rules_incidence = numpy.zeros( ( len( binary_rules ), non_terminals_count ), dtype=bool )
+
+        for index, rule in enumerate( binary_rules ):
+            self.rules_incidence[index, rule[0]] = True
+
+        ## A dictionary with the boolean vector of the non terminals deriving each terminal string
+        self.terminal_vectors = {}
+
+        for terminal, bits in self.terminal_bits.items():
+            vector = numpy.zeros( non_terminals_count, dtype=bool )
+
+            for non_terminal_id in range( non_terminals_count ):
+                vector[non_terminal_id] = bool( bits >> non_terminal_id & 1 )
+
+            self.terminal_vectors[terminal] = vector
+
+    def recognize(self, sentence):
+        """
+            Return True when the given `sentence` belongs to the grammar language. See
+            `split_sentence()` for the accepted `sentence` formats.
+        """
+        tokens = split_sentence( sentence )
+
+        if self.initial_id is None:
+            return False
+
+        if not tokens:
+            return self.accepts_epsilon
+
+        for token in tokens:
+
+            if token not in self.terminal_bits:
+                return False
+
+        if self.use_numpy:
+            return self._recognize_numpy( tokens )
+
+        return self._recognize_bitsets( tokens )
+
+    def _recognize_bitsets(self, tokens):
+        tokens_count = len( tokens )
+        right_masks = self.right_masks
+        rules_by_left = self.rules_by_left
+
+        # chart[length - 1][start] is the bitset of the non terminals deriving tokens[start:start+length]
+        chart = [[self.terminal_bits[token] for token in tokens]]
+
+        for length in range( 2, tokens_count + 1 ):
+            cells = []
+
+            for start in range( tokens_count - length + 1 ):
+                cell = 0
+
+                for split in range( 1, length ):
+                    left_bits = chart[split - 1][start]
+
+                    if not left_bits:
+                        continue
+
+                    right_bits = chart[length - split - 1][start + split]
+
+                    if not right_bits:
+                        continue
+
+                    while left_bits:
+                        lowest_bit = left_bits & -left_bits
+                        left_id = lowest_bit.bit_length() - 1
+                        left_bits ^= lowest_bit
+
+                        matches = right_bits & right_masks[left_id]
+
+                        if matches:
+                            rules = rules_by_left[left_id]
+
+                            while matches:
+                                lowest_bit = matches & -matches
+                                cell |= rules[lowest_bit.bit_length() - 1]
+                                matches ^= lowest_bit
+
+                cells.append( cell )
+
+            chart.append( cells )
+
+        return bool( chart[tokens_count - 1][0] >> self.initial_id & 1 )
+
+    def _recognize_numpy(self, tokens):
+        tokens_count = len( tokens )
+        rules_left = self.rules_left
+        rules_right = self.rules_right
+        rules_incidence = self.rules_incidence
+
+        # chart[length - 1, start] is the boolean vector of the non terminals deriving tokens[start:start+length]
+        chart = numpy.zeros( ( tokens_count, tokens_count, len( self.non_terminals ) ), dtype=bool )
+        chart[0] = [self.terminal_vectors[token] for token in tokens]
+
+        for length in range( 2, tokens_count + 1 ):
+            starts_count = tokens_count - length + 1
+            rules_matched = numpy.zeros( ( starts_count, len( rules_left ) ), dtype=bool )
+
+            # Which rules `A -> B C` match each substring, for all substrings starts at once
+            for split in range( 1, length ):
+                left_cells = chart[split - 1, :starts_count]
+                right_cells = chart[length - split - 1, split:split + starts_count]
+                rules_matched |= left_cells[:, rules_left] & right_cells[:, rules_right]
+
+            chart[length - 1, :starts_count] = rules_matched @ rules_incidence
+
+        return bool( chart[tokens_count - 1, 0, self.initial_id] )
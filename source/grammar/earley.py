@@ -0,0 +1,572 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Licensing
+#
+# Chomsky Grammar Earley Parser
+# Copyright (C) 2018 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from debug_tools import getLogger
+from debug_tools.utilities import sort_alphabetically_and_by_length
+
+from .symbols import Terminal
+from .symbols import split_sentence
+from .production import epsilon_terminal
+
+log = getLogger( 127, __name__ )
+
+
+class SymbolNode(object):
+    """
+        A Shared Packed Parse Forest node for a terminal, non terminal or epsilon `symbol` deriving
+        the tokens from `start` to `end`. The non terminal's nodes have one PackedNode on
+        `families` for each different way they derive these tokens, i.e., when there is more than
+        one family, the sentence is ambiguous.
+    """
+    __slots__ = ( 'symbol', 'start', 'end', 'families' )
+
+    def __init__(self, symbol, start, end):
+        self.symbol = symbol
+        self.start = start
+        self.end = end
+        self.families = []
+
+    def __str__(self):
+        return "%s, %s, %s" % ( self.symbol if len( self.symbol ) else "&", self.start, self.end )
+
+    def is_ambiguous(self):
+        return len( self.families ) > 1
+
+    def count_trees(self):
+        """
+            Return how many parse trees this forest has, or `float( 'inf' )` if it has cycles,
+            which happens when the grammar has cycles as `A -> B` and `B -> A`.
+        """
+        counts = {}
+        stack = [(self, False)]
+
+        while stack:
+            node, is_expanded = stack.pop()
+
+            if is_expanded:
+                total = 0
+
+                for family in node.families:
+                    family_count = 1
+
+                    for child in family.children():
+                        family_count *= counts[child] if child.families else 1
+
+                    total += family_count
+
+                counts[node] = total
+                continue
+
+            if node in counts:
+                continue
+
+            # A node which is being counted, i.e., it is its own descendant
+            counts[node] = None
+            stack.append( (node, True) )
+
+            for family in node.families:
+
+                for child in family.children():
+
+                    if not child.families:
+                        continue
+
+                    if child in counts:
+
+                        if counts[child] is None:
+                            return float( 'inf' )
+
+                        continue
+
+                    stack.append( (child, False) )
+
+        return counts[self] if self.families else 1
+
+    def forest_str(self):
+        """
+            Return all nodes reachable from this one, one per line, with their families as
+            `S, 0, 3: (a, 0, 1) (S, 1, 3)`, where the intermediate nodes are shown as dotted rules.
+        """
+        lines = []
+        visited = { self }
+        stack = [self]
+
+        while stack:
+            node = stack.pop()
+
+            if not node.families:
+                continue
+
+            families = []
+
+            for family in node.families:
+                children = family.children()
+                families.append( " ".join( "(%s)" % child for child in children ) )
+
+                for child in reversed( children ):
+
+                    if child not in visited:
+                        visited.add( child )
+                        stack.append( child )
+
+            lines.append( "%s: %s" % ( node, " | ".join( families ) ) )
+
+        return "\n".join( lines )
+
+
+class IntermediateNode(SymbolNode):
+    """
+        A Shared Packed Parse Forest node for the first `dot` symbols of the production `rule`
+        deriving the tokens from `start` to `end`. They binarize the forest, therefore, each
+        PackedNode has at most two children.
+    """
+    __slots__ = ( 'rule', 'dot' )
+
+    def __init__(self, symbol, rule, dot, start, end):
+        super().__init__( symbol, start, end )
+        self.rule = rule
+        self.dot = dot
+
+    def __str__(self):
+        symbols = [str( symbol ) for symbol in self.rule]
+        symbols.insert( self.dot, "." )
+        return "%s -> %s, %s, %s" % ( self.symbol, " ".join( symbols ), self.start, self.end )
+
+
+class PackedNode(object):
+    """
+        One way of deriving a SymbolNode or IntermediateNode, where the `left` node derives the
+        production symbols before the last one, and the `right` node derives the last one. The
+        `left` node is None when there is only one symbol before the dot.
+    """
+    __slots__ = ( 'rule', 'split', 'left', 'right' )
+
+    def __init__(self, rule, split, left, right):
+        self.rule = rule
+        self.split = split
+        self.left = left
+        self.right = right
+
+    def children(self):
+        return [self.right] if self.left is None else [self.left, self.right]
+
+
+class EarleyParser(object):
+    """
+        Earley parser for any context free grammar, working directly with the ChomskyGrammar
+        productions, i.e., without converting them to some normal form first.
+
+        The epsilon productions are handled with the Aycock and Horspool fix: when the next symbol
+        of an item is a non terminal deriving epsilon, see `ChomskyGrammar.non_terminal_epsilon()`,
+        the item is also advanced over it while predicting.
+
+        Each item is an integer `origin * dotted_rules_count + dotted_rule_id`, so advancing its dot
+        is adding 1 to it. Each position item set keeps hash indices by the next symbol, which are
+        used for completing and scanning items without going through the whole set.
+
+        The tokens can be fed one at a time with `feed()`, then `forest()` builds the Shared Packed
+        Parse Forest (SPPF) of the tokens fed so far. The `recognize()` and `parse()` methods feed
+        whole sentences.
+    """
+
+    def __init__(self, grammar):
+        """
+            Builds the parser tables for the given `grammar`. If it is on its compact epsilon free
+            form, its optional symbols are expanded first.
+        """
+        grammar.expand_optional_symbols()
+        productions_keys = grammar.productions
+
+        ## The list of start symbols Productions, with the grammar initial symbol as first, whose
+        ## index is their non terminal id
+        self.non_terminals = [start_symbol for start_symbol in grammar.initial_symbol_as_first() if start_symbol in productions_keys]
+
+        ## A dictionary with the non terminal id for each start symbol
+        self.non_terminal_ids = { start_symbol: index for index, start_symbol in enumerate( self.non_terminals ) }
+
+        ## The non terminal id of the grammar initial symbol, or None if it has no productions
+        self.initial_id = self.non_terminal_ids.get( grammar.initial_symbol )
+
+        ## A dictionary with the terminal id for each terminal string
+        self.token_ids = {}
+
+        ## The list of Terminal's, whose index is their terminal id
+        self.terminals = []
+
+        ## The list of rules as tuples (start symbol, production), whose index is their rule id
+        self.rules = []
+
+        ## For each non terminal id, the list with the dotted rule id of its rules with the dot on
+        ## the beginning
+        self.predictions = [[] for _ in self.non_terminals]
+
+        ## For each dotted rule id, the code of the symbol after its dot: the terminal id, or
+        ## `-1 - non_terminal_id` for non terminals, or None when the dot is on the end
+        self.next_codes = []
+
+        ## For each dotted rule id, its rule id
+        self.dotted_rules = []
+
+        ## For each dotted rule id, its rule non terminal id
+        self.dotted_non_terminals = []
+
+        ## For each dotted rule id, the position of its dot
+        self.dotted_positions = []
+
+        non_terminal_epsilon = grammar.non_terminal_epsilon()
+
+        ## For each non terminal id, whether it can derive epsilon
+        self.nullable = [start_symbol in non_terminal_epsilon for start_symbol in self.non_terminals]
+
+        for non_terminal_id, start_symbol in enumerate( self.non_terminals ):
+
+            for production in sort_alphabetically_and_by_length( productions_keys[start_symbol] ):
+                symbols = [symbol for symbol in production if len( symbol )]
+                codes = self._encode( symbols )
+
+                # Productions with undefined non terminal's can never be completed
+                if codes is None:
+                    continue
+
+                rule_id = len( self.rules )
+                self.rules.append( ( start_symbol, symbols ) )
+                self.predictions[non_terminal_id].append( len( self.next_codes ) )
+
+                for dot, code in enumerate( codes + [None] ):
+                    self.next_codes.append( code )
+                    self.dotted_rules.append( rule_id )
+                    self.dotted_non_terminals.append( non_terminal_id )
+                    self.dotted_positions.append( dot )
+
+        ## The count of dotted rules, used to encode the items
+        self.dotted_rules_count = len( self.next_codes )
+
+        self.reset()
+
+    def _encode(self, symbols):
+        codes = []
+
+        for symbol in symbols:
+
+            if type( symbol ) is Terminal:
+                terminal = str( symbol )
+
+                if terminal not in self.token_ids:
+                    self.token_ids[terminal] = len( self.terminals )
+                    self.terminals.append( symbol )
+
+                codes.append( self.token_ids[terminal] )
+
+            else:
+
+                if symbol not in self.non_terminal_ids:
+                    return None
+
+                codes.append( -1 - self.non_terminal_ids[symbol] )
+
+        return codes
+
+    def reset(self):
+        """
+            Discards all tokens fed and starts a new sentence.
+        """
+
+        ## The list of tokens fed so far
+        self.tokens = []
+
+        ## For each position, a list with its items on the order they were added
+        self.items = []
+
+        ## For each position, a set with its items, used to check whether an item already exists
+        self.items_sets = []
+
+        ## For each position, a dictionary with the items waiting for each non terminal id
+        self.waiting = []
+
+        ## For each position, a dictionary with the items waiting for each terminal id
+        self.scanning = []
+
+        ## For each position, a dictionary with the origins of the completed items of each non terminal id
+        self.completed = []
+
+        initial_items = []
+
+        if self.initial_id is not None:
+            initial_items = list( self.predictions[self.initial_id] )
+
+        self._process_set( initial_items )
+
+    def _process_set(self, seed_items):
+        """
+            Creates the item set for the next position, starting with the `seed_items` advanced by
+            the scanner, then runs the predictor and completer until no new items are added.
+        """
+        position = len( self.items )
+        dotted_rules_count = self.dotted_rules_count
+        next_codes = self.next_codes
+        predictions = self.predictions
+        nullable = self.nullable
+        waiting_sets = self.waiting
+        dotted_non_terminals = self.dotted_non_terminals
+
+        items = list( seed_items )
+        items_set = set( items )
+        waiting = {}
+        scanning = {}
+        completed = {}
+
+        self.items.append( items )
+        self.items_sets.append( items_set )
+        waiting_sets.append( waiting )
+        self.scanning.append( scanning )
+        self.completed.append( completed )
+
+        predicted = set()
+        position_offset = position * dotted_rules_count
+
+        def add(item):
+
+            if item not in items_set:
+                items_set.add( item )
+                items.append( item )
+
+        index = 0
+
+        while index < len( items ):
+            item = items[index]
+            index += 1
+
+            origin, dotted_rule_id = divmod( item, dotted_rules_count )
+            code = next_codes[dotted_rule_id]
+
+            if code is None:
+                non_terminal_id = dotted_non_terminals[dotted_rule_id]
+
+                if non_terminal_id in completed:
+                    completed[non_terminal_id].add( origin )
+
+                else:
+                    completed[non_terminal_id] = { origin }
+
+                # The items waiting on this position were already advanced by the predictor, as
+                # this non terminal derives epsilon
+                if origin == position:
+                    continue
+
+                for waiting_item in waiting_sets[origin].get( non_terminal_id, () ):
+                    add( waiting_item + 1 )
+
+            elif code >= 0:
+
+                if code in scanning:
+                    scanning[code].append( item )
+
+                else:
+                    scanning[code] = [item]
+
+            else:
+                non_terminal_id = -1 - code
+
+                if non_terminal_id in waiting:
+                    waiting[non_terminal_id].append( item )
+
+                else:
+                    waiting[non_terminal_id] = [item]
+
+                if non_terminal_id not in predicted:
+                    predicted.add( non_terminal_id )
+
+                    for prediction in predictions[non_terminal_id]:
+                        add( position_offset + prediction )
+
+                if nullable[non_terminal_id]:
+                    add( item + 1 )
+
+        return bool( items )
+
+    def feed(self, token):
+        """
+            Feeds the next sentence `token` as a terminal string. Return False when no sentence
+            starts with the tokens fed so far, i.e., all next tokens will also be rejected.
+        """
+        self.tokens.append( token )
+        terminal_id = self.token_ids.get( token )
+
+        seed_items = []
+
+        if terminal_id is not None:
+            seed_items = [item + 1 for item in self.scanning[-1].get( terminal_id, () )]
+
+        return self._process_set( seed_items )
+
+    def is_accepted(self):
+        """
+            Return True when the tokens fed so far are a sentence of the grammar language.
+        """
+        return self.initial_id is not None and 0 in self.completed[-1].get( self.initial_id, () )
+
+    def recognize(self, sentence):
+        """
+            Return True when the given `sentence` belongs to the grammar language. See
+            `split_sentence()` for the accepted `sentence` formats.
+        """
+        self.reset()
+
+        for token in split_sentence( sentence ):
+
+            if not self.feed( token ):
+                return False
+
+        return self.is_accepted()
+
+    def parse(self, sentence):
+        """
+            Return the Shared Packed Parse Forest root SymbolNode of the given `sentence`, or None
+            when it does not belong to the grammar language. See `forest()`.
+        """
+
+        if self.recognize( sentence ):
+            return self.forest()
+
+        return None
+
+    def forest(self):
+        """
+            Return the Shared Packed Parse Forest root SymbolNode for the tokens fed so far, or
+            None if they are not a sentence of the grammar language.
+
+            The forest is built from the item sets by exploring the nodes with an explicit stack,
+            starting from the root, therefore, long sentences do not hit the recursion limit.
+        """
+
+        if not self.is_accepted():
+            return None
+
+        tokens = self.tokens
+        rules = self.rules
+        next_codes = self.next_codes
+        dotted_rules_count = self.dotted_rules_count
+        items_sets = self.items_sets
+        completed = self.completed
+        nullable = self.nullable
+
+        nodes = {}
+        stack = []
+
+        def get_node(key):
+            node = nodes.get( key )
+
+            if node is None:
+                kind, value, start, end = key
+
+                if kind == 'T':
+                    node = SymbolNode( self.terminals[value], start, end )
+
+                elif kind == 'E':
+                    node = SymbolNode( epsilon_terminal, start, end )
+
+                elif kind == 'N':
+                    node = SymbolNode( self.non_terminals[value], start, end )
+                    stack.append( key )
+
+                else:
+                    rule_id = self.dotted_rules[value]
+                    node = IntermediateNode( rules[rule_id][0], rules[rule_id][1], self.dotted_positions[value], start, end )
+                    stack.append( key )
+
+                nodes[key] = node
+
+            return node
+
+        def add_families(node, dotted_rule_id, start, end):
+            """
+                Adds to the `node` all the ways the symbols before the dot of `dotted_rule_id` derive
+                the tokens from `start` to `end`, by finding where the symbol before the dot starts.
+            """
+            dot = self.dotted_positions[dotted_rule_id]
+            rule = rules[self.dotted_rules[dotted_rule_id]][1]
+
+            if dot == 0:
+                node.families.append( PackedNode( rule, end, None, get_node( ( 'E', None, end, end ) ) ) )
+                return
+
+            previous_rule_id = dotted_rule_id - 1
+            code = next_codes[previous_rule_id]
+
+            if code >= 0:
+                splits = ( end - 1, ) if end > start and tokens[end - 1] == str( self.terminals[code] ) else ()
+
+            else:
+                origins = completed[end].get( -1 - code, () )
+                splits = [split for split in origins if split >= start]
+
+                if nullable[-1 - code] and end not in origins:
+                    splits.append( end )
+
+                splits.sort()
+
+            for split in splits:
+
+                if dot > 1:
+                    previous_item = start * dotted_rules_count + previous_rule_id
+
+                    if previous_item not in items_sets[split]:
+                        continue
+
+                    left = get_node( ( 'I', previous_rule_id, start, split ) )
+
+                elif split != start:
+                    continue
+
+                else:
+                    left = None
+
+                if code >= 0:
+                    right = get_node( ( 'T', code, split, end ) )
+
+                else:
+                    right = get_node( ( 'N', -1 - code, split, end ) )
+
+                node.families.append( PackedNode( rule, split, left, right ) )
+
+        root = get_node( ( 'N', self.initial_id, 0, len( tokens ) ) )
+
+        while stack:
+            key = stack.pop()
+            kind, value, start, end = key
+            node = nodes[key]
+
+            if kind == 'I':
+                add_families( node, value, start, end )
+                continue
+
+            # A non terminal node gets one family for each of its completed rules
+            origin_item = start * dotted_rules_count
+
+            for prediction in self.predictions[value]:
+                dotted_rule_id = prediction + len( rules[self.dotted_rules[prediction]][1] )
+
+                if origin_item + dotted_rule_id in items_sets[end]:
+                    add_families( node, dotted_rule_id, start, end )
+
+        return root
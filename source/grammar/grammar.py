@@ -40,13 +40,26 @@ from .symbols import Terminal
 from .symbols import NonTerminal
 from .symbols import epsilon_terminal
 from .symbols import HISTORY_KEY_LINE
-from .symbols import NO_GRAMMAR_CHANGES
 
 from .production import Production
 from .production import epsilon_production
 from .production import end_of_string_terminal
 
+from .intermediate_grammar import HistoryPolicy
+from .intermediate_grammar import GrammarChanges
+from .intermediate_grammar import GrammarVersion
 from .intermediate_grammar import IntermediateGrammar
+from .history_sink import HistorySink
+from .language_class import LanguageClass
+from .budget import enforce_budget
+from .productions_trie import ProductionsTrie
+from .ll1_analyzer import LL1Analyzer
+from .ll1_table import LL1Table
+from .cyk import CYKRecognizer
+from .earley import EarleyParser
+from .sentences_enumerator import SentencesEnumerator
+from .language_counter import LanguageCounter
+from .sentence_sampler import SentenceSampler
 from .tree_transformer import ChomskyGrammarTreeTransformer
 
 # level 2 - Add and remove productions
@@ -95,34 +108,80 @@ class ChomskyGrammar():
                  Q0  -> a Q1 | b Q2
                  Q1  -> b    | b Q0
                  Q2  -> a    | a Q0
+
+            Printing requires the concrete productions, therefore, if this grammar is on its compact
+            epsilon free form, a copy of it is expanded by `expand_optional_symbols()` and printed,
+            then, printing this grammar does not change it.
+        """
+
+        if self.optional_symbols:
+            grammar = self.copy()
+            grammar.expand_optional_symbols()
+            return grammar.compact_str()
+
+        return self.compact_str()
+
+    def compact_str(self):
+        """
+            Returns the same representation as `__str__()`, but without expanding the optional
+            symbols created by `convert_to_epsilon_free( lazy=True )`, which are displayed as `[A]`.
+        """
+        return self._productions_str( self.productions, self.initial_symbol, self.optional_symbols )
+
+    @classmethod
+    def _productions_str(cls, productions_keys, initial_symbol, optional_symbols):
+        """
+            Returns the representation of `compact_str()` for the given `productions_keys`, a
+            dictionary with the productions of each start symbol, as the ones saved by the
+            operations history.
         """
         grammar_lines = []
-        biggest = self._get_table_biggest_elements()
+        biggest = cls._get_table_biggest_elements( productions_keys )
+
+        def production_to_string(production):
+
+            if optional_symbols:
+                symbols_str = []
+
+                for symbol in production:
+
+                    if type( symbol ) is NonTerminal and symbol in optional_symbols:
+                        symbols_str.append( "[%s]" % symbol )
+
+                    else:
+                        symbols_str.append( str( symbol ) )
+
+                return " ".join( symbols_str )
+
+            return str( production )
 
         def create_grammar_line(start_symbol, productions):
             productions_string = []
 
             for production in productions:
-                productions_string.append( str( production ) )
+                productions_string.append( production_to_string( production ) )
 
             # log( 1, "productions:        %s", productions )
             # log( 1, "productions_string: %s", productions_string )
 
+            # Sort them first, then, the productions equal when ignoring the case do not depend on
+            # their insertion order, which is not kept by the operations history
             return " {:>{biggest}} -> {}".format( str( start_symbol ),
-                    " | ".join( sort_alphabetically_and_by_length( productions_string ) ), biggest=biggest )
+                    " | ".join( sort_alphabetically_and_by_length( sorted( productions_string ) ) ), biggest=biggest )
 
-        if self.initial_symbol in self.productions:
-            grammar_lines.append( create_grammar_line( self.initial_symbol, self.productions[self.initial_symbol] ) )
+        if initial_symbol in productions_keys:
+            grammar_lines.append( create_grammar_line( initial_symbol, productions_keys[initial_symbol] ) )
 
-        for non_terminal in sort_alphabetically_and_by_length( set( self.productions ) - {self.initial_symbol} ):
-            grammar_lines.append( create_grammar_line( non_terminal, self.productions[non_terminal] ) )
+        for non_terminal in sort_alphabetically_and_by_length( set( productions_keys ) - {initial_symbol} ):
+            grammar_lines.append( create_grammar_line( non_terminal, productions_keys[non_terminal] ) )
 
         return "\n".join( grammar_lines )
 
-    def _get_table_biggest_elements(self):
+    @staticmethod
+    def _get_table_biggest_elements(productions_keys):
         biggest_label_length = 0
 
-        for production in self.productions:
+        for production in productions_keys:
             production_length = len( str( production ) )
 
             if production_length > biggest_label_length:
@@ -154,24 +213,191 @@ class ChomskyGrammar():
         ## Saves all grammars operations history
         self.operations_history = []
 
+        ## The productions changed since the last `version`, see `snapshot()`
+        self.history_changes = GrammarChanges()
+
+        ## The last `GrammarVersion` created by `snapshot()`, or restored by `restore()`
+        self.version = None
+
+        ## How much of the operations history is recorded, see `HistoryPolicy`
+        self._history_policy = HistoryPolicy.FULL
+
+        ## The `HistorySink` writing the operations history entries while they are created, which
+        ## only keeps the last ones on `operations_history`, or None to keep all of them
+        self.history_sink = None
+
+        ## Whether the last `_save_history()` call was skipped by the `history_policy`, then,
+        ## `_save_data()` does not add its data to another operation history entry
+        self.is_history_skipped = False
+
         ## Saves the last step count used to factoring a grammar by the `factor_it()` method
         self.last_factoring_step = 0
 
+        ## The non terminal's which can be omitted from any production while this grammar is on its
+        ## compact epsilon free form, see `convert_to_epsilon_free( lazy=True )`
+        self.optional_symbols = set()
+
+        ## The `GrammarBudget` limiting the transformations which can blow up this grammar size, or
+        ## None for unlimited
+        self.budget = None
+
+        ## The last `GrammarBudgetExceeded` error which aborted a transformation, if any
+        self.last_budget_error = None
+
+        ## The names of the budgeted transformations currently running, one inside another
+        self.budget_operations = []
+
+        ## The `CancellationToken` stopping this grammar operations when cancelled, or None
+        self.cancellation_token = None
+
+        ## A function called as `progress_callback( operation_name, progress )` by the long running
+        ## operations on each iteration of their main loops, with a dictionary describing their
+        ## progress, see `_report_progress()`, or None
+        self.progress_callback = None
+
+        ## The count of productions this grammar has, kept up to date by `add_production()`, etc
+        self.productions_count = 0
+
+        ## The count of symbols on all this grammar productions together
+        self.symbols_count = 0
+
+        ## For each `new_symbol()` base name, style and starting counter, the last counter up to
+        ## which all the new symbols names are already used, forgotten for the base names of the
+        ## start symbols removed by `remove_start_non_terminal()`
+        self.new_symbols_counters = {}
+
         # https://stackoverflow.com/questions/13119066/documenting-a-non-existing-member-with-doxygen
         if None:
             ## initial_symbol the initial symbol of this grammar
             self.initial_symbol = None
 
+            ## history_policy how much of the operations history this grammar records
+            self.history_policy = None
+
+    @property
+    def history_policy(self):
+        """
+            Returns how much of the operations history this grammar records, see `HistoryPolicy`.
+        """
+        return self._history_policy
+
+    @history_policy.setter
+    def history_policy(self, value):
+        """
+            Set how much of the operations history this grammar records. With `HistoryPolicy.NONE`,
+            the productions changes are not tracked, then, if the history is enabled again later,
+            its next entry saves all the grammar productions.
+        """
+
+        if value not in HistoryPolicy.ALL:
+            raise RuntimeError( "Invalid history policy `%s`, it must be one of %s!" % ( value, HistoryPolicy.ALL ) )
+
+        if value == HistoryPolicy.NONE:
+            self.history_changes = GrammarChanges()
+
+        self._history_policy = value
+
+    @property
+    def is_saving_history(self):
+        """
+            Returns whether the operations history is recorded, then, whether its extra text must
+            be created to be passed to `_save_data()`.
+        """
+        return self._history_policy != HistoryPolicy.NONE
+
+    def snapshot(self):
+        """
+            Return a `GrammarVersion` with the current state of this grammar, which can be restored
+            later by `restore()`, as each operations history entry does.
+
+            The version only takes the productions changed since the last version, without copying
+            the grammar productions, unless the `history_policy` is `HistoryPolicy.NONE`, as the
+            changes are not recorded, or the productions were replaced all at once.
+        """
+        version = self.version
+
+        if version is None or not version.is_current( self ):
+            self.version = GrammarVersion( self, version )
+
+        return self.version
+
+    def restore(self, version):
+        """
+            Replace this grammar productions, initial symbol and optional symbols by the ones of
+            the given `version`, created by `snapshot()` of this or any other grammar. The next
+            versions are created from it, then, the older versions are kept unchanged.
+        """
+        productions = DynamicIterationDict()
+
+        for start_symbol, start_productions in version.productions().items():
+            productions[start_symbol] = DynamicIterationDict( start_productions.keys(), is_set=True )
+
+        self._restore_productions( productions, version.initial_symbol, set( version.optional_symbols ) )
+        self.history_changes = GrammarChanges( self.history_policy == HistoryPolicy.NONE )
+        self.version = version
+
+    def _check_cancelled(self):
+        """
+            Raises `Cancelled` if this grammar `cancellation_token` was cancelled, called on the
+            operations loops iterations boundaries. While a budgeted transformation is running, it
+            also raises `GrammarBudgetExceeded` when its time is over, as these loops can run for a
+            long time without adding any production.
+        """
+
+        if self.cancellation_token is not None:
+            self.cancellation_token.check()
+
+        if self.budget_operations:
+            self.budget.check_deadline( self.budget_operations[-1] )
+
+    def _report_progress(self, operation_name, **progress):
+        """
+            Calls the `progress_callback`, if any, with the `progress` of the `operation_name`, as
+            the fixed point sweep number, plus the current `productions_count`.
+        """
+        progress_callback = self.progress_callback
+
+        if progress_callback is not None:
+            progress['productions_count'] = self.productions_count
+            progress_callback( operation_name, progress )
+
     def _save_history(self, operation_name, operation_stage=IntermediateGrammar.MIDDLE):
-        intermediateGrammar = IntermediateGrammar( self, operation_name, operation_stage )
+        history_policy = self._history_policy
+        self.is_history_skipped = history_policy == HistoryPolicy.NONE \
+                or history_policy == HistoryPolicy.SUMMARY and operation_stage == IntermediateGrammar.MIDDLE
 
-        if len( self.operations_history ) and intermediateGrammar == self.operations_history[-1]:
+        if self.is_history_skipped:
             return
 
-        self.operations_history.append( IntermediateGrammar( self, operation_name, operation_stage ) )
+        operations_history = self.operations_history
+
+        if operations_history:
+            last_operation = operations_history[-1]
+            last_stage = last_operation.stage.value
+
+            if operation_stage == IntermediateGrammar.MIDDLE or last_stage == IntermediateGrammar.MIDDLE or operation_stage == last_stage:
+
+                if self.history_changes.is_snapshot_required:
+                    last_version = last_operation.version
+                    is_unchanged = self._productions_str( last_version.productions(),
+                            last_version.initial_symbol, last_version.optional_symbols ) == self.compact_str()
+
+                else:
+                    is_unchanged = last_operation.is_unchanged( self )
+
+                if is_unchanged:
+                    return
+
+        operations_history.append( IntermediateGrammar( self, operation_name, operation_stage ) )
+
+        if self.history_sink is not None:
+            self.history_sink.receive( self )
 
     def _save_data(self, text_data, *arguments):
 
+        if self.is_history_skipped or not self.operations_history:
+            return
+
         if arguments:
 
             for argument in arguments:
@@ -183,34 +409,26 @@ class ChomskyGrammar():
     def get_operation_history(self):
         """
             Return a string with all operations' history for this grammar.
+
+            If the grammar has a `history_sink`, only the entries still kept on the
+            `operations_history` are returned.
         """
-        counter = 0
-        history_list = []
+        history_sink = HistorySink()
         operations_history = self.operations_history
 
-        for index, operation in enumerate( self.operations_history ):
-            stage = operation.stage.value
-
-            if stage == IntermediateGrammar.BEGINNING:
-
-                if len( history_list ):
-                    extra_text = operation.extra_text
-
-                    if extra_text:
-                        # https://stackoverflow.com/questions/8785554/how-do-i-insert-a-list-at-the-front-of-another-list
-                        operations_history[index+1].extra_text[0:0] = extra_text
+        for operation in operations_history:
+            history_sink.write( operation, self._productions_str, len( operations_history ) == 1 )
 
-                    continue
-
-            if stage == IntermediateGrammar.END or len( operations_history ) == 1:
+        return history_sink.text()
 
-                if not operation.extra_text:
-                    operation.extra_text.append( NO_GRAMMAR_CHANGES )
-
-            counter += 1
-            history_list.append( "# %s. %s" % ( counter, operation ) )
+    def finish_history(self):
+        """
+            Writes the last operations history entry to the `history_sink`, after the last operation
+            was performed, as the entries are only written when the next one is created.
+        """
 
-        return "\n\n".join( history_list )
+        if self.history_sink is not None:
+            self.history_sink.receive( self, True )
 
     @property
     def initial_symbol(self):
@@ -328,11 +546,27 @@ class ChomskyGrammar():
 
         production.lock()
 
+        history_changes = self.history_changes
+
         if start_symbol not in self.productions:
             self.productions[start_symbol] = DynamicIterationDict( is_set=True )
 
+            if not history_changes.is_snapshot_required:
+                history_changes.add_start_symbol( start_symbol )
+
         log( 62, "   %s -> %s", start_symbol, production )
-        self.productions[start_symbol].add( production )
+        productions = self.productions[start_symbol]
+
+        if production not in productions:
+            productions.add( production )
+            self.productions_count += 1
+            self.symbols_count += len( production )
+
+            if not history_changes.is_snapshot_required:
+                history_changes.add_production( start_symbol, production )
+
+            if self.budget_operations:
+                self.budget.check( self, self.budget_operations[-1] )
 
     def has_production(self, start_symbol, production):
         """
@@ -462,6 +696,7 @@ class ChomskyGrammar():
         """
         old_counter = -1
         current_counter = 0
+        sweep_count = 0
 
         productions_keys = self.productions
         non_terminal_epsilon = DynamicIterationDict()
@@ -473,6 +708,9 @@ class ChomskyGrammar():
 
         while current_counter != old_counter:
             old_counter = current_counter
+            self._check_cancelled()
+            sweep_count += 1
+            self._report_progress( "Non terminal's deriving epsilon", sweep=sweep_count, changes_count=current_counter )
 
             for start_symbol in productions_keys:
                 productions = productions_keys[start_symbol]
@@ -500,27 +738,47 @@ class ChomskyGrammar():
         # log( 1, "non_terminal_epsilon: %s", non_terminal_epsilon )
         return non_terminal_epsilon
 
-    def convert_to_epsilon_free(self):
+    @enforce_budget
+    def convert_to_epsilon_free(self, lazy=False):
         """
             Convert the current grammar to a epsilon free grammar.
+
+            If `lazy` is True, the productions combinations are not created. Instead, the non
+            terminal's deriving epsilon are marked as optional symbols on `optional_symbols`, and
+            they will only be expanded by `expand_optional_symbols()` when some operation requires
+            the concrete productions.
         """
         # log( 1, "self: \n%s", self )
         self._save_history( "Converting to Epsilon Free", IntermediateGrammar.BEGINNING )
 
+        if not lazy:
+            self.expand_optional_symbols()
+
         initial_symbol = self.initial_symbol
         productions_keys = self.productions
         non_terminal_epsilon = self.non_terminal_epsilon()
 
-        for start_symbol in productions_keys:
-            productions = productions_keys[start_symbol]
+        vanishing_symbols = self._vanishing_symbols( non_terminal_epsilon )
 
-            for production in productions(1):
+        if lazy:
+            self._mark_optional_symbols( non_terminal_epsilon, vanishing_symbols )
+
+        else:
+
+            for start_symbol in productions_keys:
+                productions = productions_keys[start_symbol]
+
+                for production in productions(1):
 
-                for combination in production.combinations( non_terminal_epsilon ):
-                    # log( 1, "combination: %s", combination )
-                    self.add_production( start_symbol, combination )
+                    for combination in production.combinations( non_terminal_epsilon ):
+                        # log( 1, "combination: %s", combination )
+                        self.add_production( start_symbol, combination )
 
-            self.remove_production( start_symbol, epsilon_production )
+                self.remove_production( start_symbol, epsilon_production, False )
+
+            # Only remove the vanishing symbols after all combinations were created, otherwise, the
+            # productions using them would be removed before being combined
+            self._remove_vanishing_symbols( vanishing_symbols )
 
         if initial_symbol in non_terminal_epsilon:
 
@@ -532,8 +790,148 @@ class ChomskyGrammar():
             self.add_production( self.initial_symbol, epsilon_production )
 
         self._save_history( "Converting to Epsilon Free", IntermediateGrammar.END )
-        self._save_data( "Non Terminal's Deriving Epsilon: %s", "; ".join( "%s -> &" % ( key )
-               for key, element in non_terminal_epsilon.items() ) )
+
+        if self.is_saving_history:
+            self._save_data( "Non Terminal's Deriving Epsilon: %s", "; ".join( "%s -> &" % ( key )
+                   for key, element in non_terminal_epsilon.items() ) )
+
+    def _vanishing_symbols(self, non_terminal_epsilon):
+        """
+            Return a set within the non terminal's from `non_terminal_epsilon` which only derive
+            epsilon, i.e., all their productions are epsilon or only use other vanishing symbols.
+        """
+        productions_keys = self.productions
+        vanishing_symbols = set()
+
+        old_counter = -1
+        current_counter = 0
+        sweep_count = 0
+
+        while old_counter != current_counter:
+            old_counter = current_counter
+            self._check_cancelled()
+            sweep_count += 1
+            self._report_progress( "Vanishing symbols", sweep=sweep_count, changes_count=current_counter )
+
+            for start_symbol in non_terminal_epsilon:
+
+                if start_symbol in vanishing_symbols:
+                    continue
+
+                all_productions_vanish = True
+
+                for production in productions_keys[start_symbol]:
+
+                    for symbol in production:
+
+                        if len( symbol ) and symbol not in vanishing_symbols:
+                            all_productions_vanish = False
+                            break
+
+                    if not all_productions_vanish:
+                        break
+
+                if all_productions_vanish:
+                    vanishing_symbols.add( start_symbol )
+                    current_counter += 1
+
+        return vanishing_symbols
+
+    def _remove_vanishing_symbols(self, vanishing_symbols):
+        """
+            Removes the `vanishing_symbols` and all productions using them.
+
+            The initial symbol is not removed, only its productions, because its epsilon production
+            is added back by `convert_to_epsilon_free()`. Removing it would cascade into replacing
+            the initial symbol by the empty language grammar `S -> S`.
+        """
+        productions_keys = self.productions
+
+        if not vanishing_symbols:
+            return
+
+        for start_symbol in productions_keys:
+            productions = productions_keys[start_symbol]
+
+            for production in productions(1):
+
+                if start_symbol in vanishing_symbols or not vanishing_symbols.isdisjoint( production.non_terminals() ):
+                    self.remove_production( start_symbol, production, False )
+
+        for start_symbol in productions_keys(1):
+
+            if start_symbol in vanishing_symbols and start_symbol != self.initial_symbol:
+                self.remove_start_non_terminal( start_symbol, False )
+
+    def _mark_optional_symbols(self, non_terminal_epsilon, vanishing_symbols):
+        """
+            Removes the epsilon productions and marks the `non_terminal_epsilon` as optional
+            symbols, instead of creating all productions combinations.
+
+            The `vanishing_symbols`, which only derive epsilon, cannot be kept as optional symbols
+            because they would not have any productions left. Therefore, they are directly removed
+            from the productions using them, which is also what would happen after expanding them.
+        """
+        productions_keys = self.productions
+
+        for start_symbol in productions_keys:
+
+            if start_symbol not in vanishing_symbols:
+                self.remove_production( start_symbol, epsilon_production, False )
+
+        if vanishing_symbols:
+
+            for start_symbol in productions_keys:
+                productions = productions_keys[start_symbol]
+
+                if start_symbol in vanishing_symbols:
+                    continue
+
+                for production in productions(1):
+                    symbols = production.non_terminals()
+
+                    if vanishing_symbols.isdisjoint( symbols ):
+                        continue
+
+                    new_production = Production( [symbol.new() for symbol in production
+                            if symbol not in vanishing_symbols], lock=True )
+
+                    self.remove_production( start_symbol, production, False )
+
+                    if new_production:
+                        self.add_production( start_symbol, new_production )
+
+            self._remove_vanishing_symbols( vanishing_symbols )
+
+        for start_symbol in non_terminal_epsilon:
+
+            if start_symbol not in vanishing_symbols:
+                self.optional_symbols.add( start_symbol )
+
+    def expand_optional_symbols(self):
+        """
+            Converts this grammar from its compact epsilon free form, created by
+            `convert_to_epsilon_free( lazy=True )`, to the concrete productions form, by creating
+            all combinations of the optional symbols on each production.
+        """
+        optional_symbols = self.optional_symbols
+
+        if not optional_symbols:
+            return
+
+        productions_keys = self.productions
+        self.optional_symbols = set()
+
+        for start_symbol in productions_keys:
+            productions = productions_keys[start_symbol]
+
+            for production in productions(1):
+
+                for combination in production.combinations( optional_symbols ):
+
+                    # The empty combination is not part of the compact production
+                    if combination:
+                        self.add_production( start_symbol, combination )
 
     def remove_production(self, start_symbol, production, recursive=True):
         """
@@ -545,7 +943,14 @@ class ChomskyGrammar():
         """
         log( 62, "%s -> %s", start_symbol, production )
         productions = self.productions[start_symbol]
-        productions.discard( production )
+
+        if production in productions:
+            productions.discard( production )
+            self.productions_count -= 1
+            self.symbols_count -= len( production )
+
+            if not self.history_changes.is_snapshot_required:
+                self.history_changes.remove_production( start_symbol, production )
 
         if recursive and not productions:
             self.remove_start_non_terminal( start_symbol )
@@ -580,7 +985,30 @@ class ChomskyGrammar():
                             self.remove_production( start_symbol, production )
                             break
 
+            # Removing the productions can leave some start symbol without productions, which
+            # removes it, and it can be the `start_non_terminal` itself, as on `A -> B`, `B -> A a`
+            if start_non_terminal not in productions_keys:
+                return
+
+        history_changes = self.history_changes
+
+        for production in productions_keys[start_non_terminal]:
+            self.productions_count -= 1
+            self.symbols_count -= len( production )
+
+            if not history_changes.is_snapshot_required:
+                history_changes.remove_production( start_non_terminal, production )
+
+        if not history_changes.is_snapshot_required:
+            history_changes.remove_start_symbol( start_non_terminal )
+
         del productions_keys[start_non_terminal]
+        removed_name = str( start_non_terminal )
+
+        # Only the new symbols with the same base name can reuse the removed name
+        for counter_key in [counter_key for counter_key in self.new_symbols_counters if removed_name.startswith( counter_key[0] )]:
+            del self.new_symbols_counters[counter_key]
+
         self.clean_initial_symbol( start_non_terminal )
 
     def clean_initial_symbol(self, start_symbol):
@@ -622,6 +1050,49 @@ class ChomskyGrammar():
         for production in secondGrammarProductions:
             self.add_production( non_terminal_destine, production )
 
+    def copy(self):
+        """
+            Return a new grammar with the same productions, initial symbol, history policy and
+            cancellation token as this one, but with an empty operations history.
+        """
+        grammar = ChomskyGrammar()
+        grammar.history_policy = self.history_policy
+        grammar.cancellation_token = self.cancellation_token
+        grammar.progress_callback = self.progress_callback
+        grammar._restore_productions( self._copy_productions(), self.initial_symbol, set( self.optional_symbols ) )
+        return grammar
+
+    def _copy_productions(self):
+        """
+            Return a copy of this grammar productions, which can be later restored by
+            `_restore_productions()`.
+        """
+        productions = DynamicIterationDict()
+
+        for start_symbol in self.productions:
+            productions[start_symbol] = DynamicIterationDict( self.productions[start_symbol].keys(), is_set=True )
+
+        return productions
+
+    def _restore_productions(self, productions, initial_symbol, optional_symbols):
+        """
+            Replace this grammar productions by the ones saved by `_copy_productions()`.
+        """
+        self.productions = productions
+        self._initial_symbol = initial_symbol
+        self.optional_symbols = optional_symbols
+        self.new_symbols_counters.clear()
+        self.history_changes = GrammarChanges()
+
+        self.productions_count = 0
+        self.symbols_count = 0
+
+        for start_symbol in productions:
+
+            for production in productions[start_symbol]:
+                self.productions_count += 1
+                self.symbols_count += len( production )
+
     def new_symbol(self, new_symbol='S', use_digits=False):
         """
             Given a `new_symbol` initial name, search for a new symbol name until find one in the
@@ -629,6 +1100,9 @@ class ChomskyGrammar():
 
             If `use_digits` is passed as True, then use numbers to represent the new symbols instead
             of single quotes `'`.
+
+            The names found already used are remembered on `new_symbols_counters`, then, the next
+            search for the same name starts after them, instead of checking all names again.
         """
         new_symbol = str( new_symbol )
 
@@ -637,9 +1111,9 @@ class ChomskyGrammar():
 
         clean_symbol = new_symbol
         productions_keys = self.productions
+        current_counter = 0
 
         if use_digits:
-            current_counter = 0
             search_result = re.findall( r'\d+', new_symbol )
 
             if search_result:
@@ -649,23 +1123,32 @@ class ChomskyGrammar():
                 if search_result:
                     clean_symbol = search_result[-1]
 
-            def push_next_symbol():
-                nonlocal current_counter
-                current_counter += 1
+            def get_suffix(counter):
+                return str( counter )
 
         else:
-            current_counter = ""
 
-            def push_next_symbol():
-                nonlocal current_counter
-                current_counter += "'"
+            def get_suffix(counter):
+                return "'" * counter
 
-        while True:
-            push_next_symbol()
-            new_symbol = NonTerminal( clean_symbol + str( current_counter ), lock=True )
+        counter_key = ( clean_symbol, use_digits, current_counter )
+        current_counter = self.new_symbols_counters.get( counter_key, current_counter ) + 1
+        new_symbol = NonTerminal( clean_symbol + get_suffix( current_counter ), lock=True )
+
+        # The first name after the counter is usually free, otherwise, the following names are
+        # probed against the start symbols names, without creating a symbol for each one of them
+        if new_symbol in productions_keys:
+            used_names = { str( start_symbol ) for start_symbol in productions_keys }
+            current_counter += 1
+
+            while clean_symbol + get_suffix( current_counter ) in used_names:
+                current_counter += 1
+
+            new_symbol = NonTerminal( clean_symbol + get_suffix( current_counter ), lock=True )
 
-            if new_symbol not in productions_keys:
-                return Production( symbols=[new_symbol.new()], lock=True )
+        # The caller may not use the returned name, then, it is checked again next time
+        self.new_symbols_counters[counter_key] = current_counter - 1
+        return Production( symbols=[new_symbol.new()], lock=True )
 
     def left_recursion(self):
         """
@@ -673,6 +1156,8 @@ class ChomskyGrammar():
             grammar recursive non terminal and `recursion_type` the type of the recursion which
             can be 'direct' or 'indirect'.
         """
+        self.expand_optional_symbols()
+
         left_recursion = set()
         productions_keys = self.productions
         first_non_terminals = self.first_non_terminals()
@@ -709,51 +1194,170 @@ class ChomskyGrammar():
         """
         return bool( self.left_recursion() )
 
-    def eliminate_left_recursion(self):
+    @staticmethod
+    def strongly_connected_components(vertices, successors):
         """
-            Eliminates direct or indirect left recursion from this grammar.
+            Return a list with the strongly connected components of the graph where each vertex of
+            `vertices` points to the vertices of its `successors[vertex]` list.
 
-            The indirect recursion elimination order is defined by the `initial_symbol_as_first()`
-            function. See that function documentation for the sorting order.
+            Uses Tarjan's algorithm, without recursion, which finishes the components after the
+            components they point to.
         """
-        self._save_history( "Eliminating Left Recursion", IntermediateGrammar.BEGINNING )
+        indexes = {}
+        lowest_links = {}
+        stack = []
+        stacked = set()
+        components = []
 
-        if self.has_left_recursion():
-            self.convert_to_proper()
-            log( 32, "self: \n%s", self )
+        for root_vertex in vertices:
 
-        else:
-            return
+            if root_vertex in indexes:
+                continue
 
-        productions_keys = self.productions
-        first_non_terminals = self.first_non_terminals()
+            pending = [( root_vertex, 0 )]
 
-        production_keys_list = self.initial_symbol_as_first()
-        non_terminals_count = len( production_keys_list )
-        eliminated_direct_recursions = DynamicIterationDict( is_set=True )
+            while pending:
+                vertex, next_index = pending.pop()
 
-        def _flush_left_recursion_history(is_forced=False):
+                if next_index == 0:
+                    indexes[vertex] = lowest_links[vertex] = len( indexes )
+                    stack.append( vertex )
+                    stacked.add( vertex )
 
-            if indirect_recursions or is_forced:
+                vertex_successors = successors[vertex]
 
-                if not is_forced:
-                    self._save_history( "Eliminate direct left recursion" )
+                while next_index < len( vertex_successors ):
+                    successor = vertex_successors[next_index]
+                    next_index += 1
 
-                for history in eliminated_direct_recursions.keys():
-                    self._save_data( "%s", history )
+                    if successor not in indexes:
+                        pending.append( ( vertex, next_index ) )
+                        pending.append( ( successor, 0 ) )
+                        break
 
-                eliminated_direct_recursions.clear()
+                    if successor in stacked:
+                        lowest_links[vertex] = min( lowest_links[vertex], indexes[successor] )
 
-        for maximum_index in range( 0, non_terminals_count ):
-            indirect_recursions = DynamicIterationDict()
+                else:
 
-            outter_start_symbol = production_keys_list[maximum_index]
-            outter_productions = productions_keys[outter_start_symbol]
-            log( 32, "1. outter_start_symbol: %s", outter_start_symbol )
-            log( 32, "1. outter_productions: %s", outter_productions )
+                    if lowest_links[vertex] == indexes[vertex]:
+                        component = []
 
-            for index in range( 0, maximum_index ):
-                inner_start_symbol = production_keys_list[index]
+                        while True:
+                            stacked_vertex = stack.pop()
+                            stacked.discard( stacked_vertex )
+                            component.append( stacked_vertex )
+
+                            if stacked_vertex == vertex:
+                                break
+
+                        components.append( component )
+
+                    if pending:
+                        parent_vertex = pending[-1][0]
+                        lowest_links[parent_vertex] = min( lowest_links[parent_vertex], lowest_links[vertex] )
+
+        return components
+
+    def left_corner_order(self):
+        """
+            Return a list with the start symbols ordered for `eliminate_left_recursion()`, grouped by
+            the strongly connected components of the left corner graph, where `A` points to `B` when
+            some production of `A` starts with `B`.
+
+            The components come after the components of their left corners, therefore, only the
+            symbols of the same component can be left recursive. Inside a component, the symbols
+            with less productions come first, as the first symbols productions are copied into the
+            following symbols productions starting with them.
+        """
+        self.expand_optional_symbols()
+        productions_keys = self.productions
+        start_symbols = self.initial_symbol_as_first()
+
+        start_symbols_keys = { start_symbol: start_symbol for start_symbol in start_symbols }
+        left_corners = {}
+
+        for start_symbol in start_symbols:
+            left_corners[start_symbol] = []
+
+            for production in sort_alphabetically_and_by_length( productions_keys[start_symbol] ):
+                first_symbol = production[0]
+
+                if type( first_symbol ) is NonTerminal and first_symbol in start_symbols_keys:
+                    first_symbol = start_symbols_keys[first_symbol]
+
+                    if first_symbol not in left_corners[start_symbol]:
+                        left_corners[start_symbol].append( first_symbol )
+
+        order = []
+
+        for component in self.strongly_connected_components( start_symbols, left_corners ):
+            component = sort_alphabetically_and_by_length( component )
+            component.sort( key=lambda symbol: len( productions_keys[symbol] ) )
+            order.extend( component )
+
+        return order
+
+    @enforce_budget
+    def eliminate_left_recursion(self, order=None, epsilon_free=False):
+        """
+            Eliminates direct or indirect left recursion from this grammar.
+
+            The indirect recursion elimination order is defined by the `initial_symbol_as_first()`
+            function. See that function documentation for the sorting order. If an `order` list of
+            non terminal's is given, its symbols are used first on that order, see
+            `left_corner_order()`.
+
+            The direct recursion `A -> A α | β` is replaced by `A -> β A'` and `A' -> α A' | &`,
+            or, if `epsilon_free` is True, by `A -> β A' | β` and `A' -> α A' | α`, which does
+            not need `convert_to_epsilon_free()` to remove the new epsilon productions.
+        """
+        self._save_history( "Eliminating Left Recursion", IntermediateGrammar.BEGINNING )
+
+        if self.has_left_recursion():
+            self.convert_to_proper()
+            log( 32, "self: \n%s", self )
+
+        else:
+            return
+
+        productions_keys = self.productions
+        first_non_terminals = self.first_non_terminals()
+
+        production_keys_list = self.initial_symbol_as_first()
+
+        if order:
+            ordered_symbols = [start_symbol for start_symbol in order if start_symbol in productions_keys]
+            production_keys_list = ordered_symbols + [start_symbol for start_symbol in production_keys_list if start_symbol not in ordered_symbols]
+
+        non_terminals_count = len( production_keys_list )
+        eliminated_direct_recursions = DynamicIterationDict( is_set=True )
+        is_saving_history = self.is_saving_history
+
+        def _flush_left_recursion_history(is_forced=False):
+
+            if indirect_recursions or is_forced:
+
+                if not is_forced:
+                    self._save_history( "Eliminate direct left recursion" )
+
+                for history in eliminated_direct_recursions.keys():
+                    self._save_data( "%s", history )
+
+                eliminated_direct_recursions.clear()
+
+        for maximum_index in range( 0, non_terminals_count ):
+            self._check_cancelled()
+            self._report_progress( "Eliminating left recursion", non_terminal=maximum_index + 1, non_terminals_count=non_terminals_count )
+            indirect_recursions = DynamicIterationDict()
+
+            outter_start_symbol = production_keys_list[maximum_index]
+            outter_productions = productions_keys[outter_start_symbol]
+            log( 32, "1. outter_start_symbol: %s", outter_start_symbol )
+            log( 32, "1. outter_productions: %s", outter_productions )
+
+            for index in range( 0, maximum_index ):
+                inner_start_symbol = production_keys_list[index]
                 inner_productions = productions_keys[inner_start_symbol]
 
                 log( 32, "1.2 inner_start_symbol: %s", inner_start_symbol )
@@ -778,8 +1382,10 @@ class ChomskyGrammar():
                                     new_production = outter_production.replace( 0, inner_production )
 
                                     self.add_production( outter_start_symbol, new_production )
-                                    indirect_recursions[outter_start_symbol].append( "(%s >> %s => %s)" % (
-                                            inner_production, outter_production, new_production ) )
+
+                                    if is_saving_history:
+                                        indirect_recursions[outter_start_symbol].append( "(%s >> %s => %s)" % (
+                                                inner_production, outter_production, new_production ) )
 
                         if remove_outter_production:
                             self.remove_production( outter_start_symbol, outter_production, False )
@@ -814,6 +1420,10 @@ class ChomskyGrammar():
                     if outter_production in direct_recursions:
                         new_production = outter_production.new()
                         new_production.remove_non_terminal( 0 )
+
+                        if epsilon_free:
+                            self.add_production( new_outter_start_symbol, new_production.new() )
+
                         new_production.add( new_outter_start_symbol[0].new() )
                         self.add_production( new_outter_start_symbol, new_production )
 
@@ -823,11 +1433,16 @@ class ChomskyGrammar():
                         direct_replacements.append( new_production )
                         self.add_production( outter_start_symbol, new_production )
 
+                        # The production `A -> β` is kept in place of `A' -> &`
+                        if epsilon_free:
+                            continue
+
                     self.remove_production( outter_start_symbol, outter_production, False )
 
-                self.add_production( new_outter_start_symbol, epsilon_production.new() )
+                if not epsilon_free:
+                    self.add_production( new_outter_start_symbol, epsilon_production.new() )
 
-            if new_outter_start_symbol in productions_keys:
+            if is_saving_history and new_outter_start_symbol in productions_keys:
                 eliminated_direct_recursions.append( "Direct recursion eliminated: %s -> %s @ %s -> %s" % (
                         direct_recursions_list, direct_replacements,
                         new_outter_start_symbol, productions_keys[new_outter_start_symbol] ) )
@@ -846,20 +1461,21 @@ class ChomskyGrammar():
             If the list contains duplicated entries, it means this grammar is non factored, i.e.,
             non deterministic.
         """
+        self.expand_optional_symbols()
+
         factors = []
         first_terminals = self.first_terminals()
         productions_keys = self.productions
 
         for start_symbol in productions_keys:
             productions = productions_keys[start_symbol]
-            biggest_common_factors = {}
+            biggest_common_factors = ProductionsTrie( productions ).biggest_common_factors()
 
             for production in productions:
                 first_symbol = production[0]
 
                 if len( first_symbol ):
-                    common_production = self.get_biggest_factor_serie( first_symbol, production, productions, biggest_common_factors )
-                    factors.append( ( start_symbol, common_production ) )
+                    factors.append( ( start_symbol, biggest_common_factors[first_symbol] ) )
 
                     if type( first_symbol ) is NonTerminal:
                         first_terminals_from = self.first_terminals_from( production, first_terminals )
@@ -872,57 +1488,6 @@ class ChomskyGrammar():
 
         return factors
 
-    def get_biggest_factor_serie(self, first_symbol, production, productions, biggest_common_factors):
-        """
-            Determines and return the biggest production with common direct factors in a given `production`.
-        """
-        if first_symbol not in biggest_common_factors: biggest_common_factors[first_symbol] =  []
-        biggest_common_factor = biggest_common_factors[first_symbol]
-
-        if not biggest_common_factor:
-            biggest_common_factor.append( first_symbol )
-
-            for other_production in productions:
-                other_first_symbol = other_production[0]
-
-                # Initialize the first symbol or skip the other unrelated production
-                if production != other_production and first_symbol == other_first_symbol:
-
-                    if len( biggest_common_factor ) > 1:
-                        maximum_index = min( len( biggest_common_factor ), len( other_production ) )
-
-                        for index in range( 1, maximum_index ):
-
-                            if biggest_common_factor[index] != other_production[index]:
-                                del biggest_common_factor[index:]
-                                break
-
-                    else:
-                        maximum_index = min( len( production ), len( other_production ) )
-
-                        for index in range( 1, maximum_index ):
-                            current_element = production[index]
-
-                            if current_element != other_production[index]:
-                                break
-
-                            else:
-                                # log( 1, "append: %s", current_element )
-                                biggest_common_factor.append( current_element )
-
-                    # There is nothing else to do, as we are on the minimum acceptable length
-                    if len( biggest_common_factor ) == 1:
-                        break
-
-            # log( 1, "production: %s", production )
-            # log( 1, "productions: %s", productions )
-            # log( 1, "biggest_common_factor: %s", biggest_common_factor )
-
-            biggest_common_factor = Production( [item.new() for item in biggest_common_factor], lock=True )
-            biggest_common_factors[first_symbol] = biggest_common_factor
-
-        return biggest_common_factor
-
     def has_duplicated_factors(self):
         """
             Call `factors()` and check whether there are duplicated entries in the factors list.
@@ -947,9 +1512,28 @@ class ChomskyGrammar():
     def is_factored(self):
         """
             Determines whether this grammar is factored, i.e., deterministic or nondeterministic.
+
+            It is not factored when it has left recursion or two alternatives of some non terminal
+            can start with the same terminal, i.e., FIRST/FIRST conflicts. See `ll1_analyzer()`.
+        """
+        return not self.has_left_recursion() and not self.ll1_analyzer().has_first_first_conflicts()
+
+    def ll1_analyzer(self):
+        """
+            Return a LL1Analyzer with this grammar FIRST, FOLLOW and FIRST+ sets and all its LL(1)
+            conflicts, including the FIRST/FOLLOW conflicts from the alternatives deriving epsilon.
         """
-        return not self.has_left_recursion() and not self.has_duplicated_factors()
+        return LL1Analyzer( self )
 
+    def build_ll1_table(self):
+        """
+            Return the LL1Table of this grammar, which can recognize its sentences with
+            `LL1Table.recognize()`. If this grammar is not LL(1), a RuntimeError is raised with all
+            its conflicts.
+        """
+        return LL1Table( self.ll1_analyzer() )
+
+    @enforce_budget( aborted_result=False )
     def factor_it(self, maximum_steps=5):
         """
             Try to factor the this grammar in the `maximum_steps` given. Return True is the
@@ -965,6 +1549,8 @@ class ChomskyGrammar():
             self.eliminate_left_recursion()
 
         while True:
+            self._check_cancelled()
+            self._report_progress( "Factoring", step=last_factoring_step + 1, maximum_steps=maximum_steps )
             last_factoring_step += 1
             non_deterministic_factors_dictionary, has_direct_factors, is_factored = self.get_duplicated_factors()
 
@@ -977,6 +1563,8 @@ class ChomskyGrammar():
             while True:
 
                 if has_direct_factors:
+                    self._check_cancelled()
+                    self._report_progress( "Factoring", step=last_factoring_step + 1, maximum_steps=maximum_steps )
                     self.eliminate_direct_factors( non_deterministic_factors_dictionary )
                     last_factoring_step += 1
                     non_deterministic_factors_dictionary, has_direct_factors, is_factored = self.get_duplicated_factors()
@@ -1057,6 +1645,7 @@ class ChomskyGrammar():
 
         return False
 
+    @enforce_budget
     def eliminate_indirect_factors(self, non_deterministic_factors_dictionary):
         """
             Try to convert indirect factors on this grammar to direct factors.
@@ -1065,10 +1654,12 @@ class ChomskyGrammar():
             keep calling this function until no indirect factors are remaining.
         """
         self._save_history( "Eliminating Indirect Factors", IntermediateGrammar.BEGINNING )
+        self.expand_optional_symbols()
         old_counter = -1
 
         productions_keys = self.productions
         _save_data_factors_list = DynamicIterationDict()
+        is_saving_history = self.is_saving_history
 
         for start_symbol in productions_keys:
             productions = productions_keys[start_symbol]
@@ -1089,23 +1680,28 @@ class ChomskyGrammar():
                         remove_production = True
                         new_production = production.replace( 0, first_symbol_production )
                         self.add_production( start_symbol, new_production )
-                        replaced_productions.append( str( new_production ) )
+
+                        if is_saving_history:
+                            replaced_productions.append( str( new_production ) )
 
                     if remove_production:
                         self.remove_production( start_symbol, production )
 
-                    _save_data_factors_list.append( "%s: %s => %s" % (
-                            start_symbol, production, " | ".join( replaced_productions ) ) )
+                    if is_saving_history:
+                        _save_data_factors_list.append( "%s: %s => %s" % (
+                                start_symbol, production, " | ".join( replaced_productions ) ) )
 
         self._save_history( "Eliminating Indirect Factors", IntermediateGrammar.END )
         self._save_data( "Indirect factors eliminated: %s", _save_data_factors_list.keys() )
         log( 16, "exiting: \n%s", self )
 
+    @enforce_budget
     def eliminate_direct_factors(self, non_deterministic_factors_dictionary):
         """
             Converts all direct factors on this grammar to deterministic factors.
         """
         self._save_history( "Eliminating Direct Factors", IntermediateGrammar.BEGINNING )
+        self.expand_optional_symbols()
         has_eliminated_any_factor = False
         productions_keys = self.productions
         non_deterministic_factors_eliminated = DynamicIterationDict()
@@ -1119,7 +1715,14 @@ class ChomskyGrammar():
                 start_symbol_non_deterministic_factors = non_deterministic_factors_dictionary[start_symbol]
 
                 log( 16, "non_deterministic_factors: %s", start_symbol_non_deterministic_factors )
-                productions.not_iterate_over_new_items( len( start_symbol_non_deterministic_factors ) )
+
+                # The trie only holds the productions existing before the new factors are added,
+                # therefore, the new productions `factor S1` are not factored again on this step
+                productions_trie = ProductionsTrie( productions )
+
+                # Opens the new items window until the next iteration over the productions, then,
+                # the new productions take the slots of the removed ones, keeping their ordering
+                productions.not_iterate_over_new_items( 1 )
 
                 while True:
 
@@ -1130,45 +1733,33 @@ class ChomskyGrammar():
                     else:
                         break
 
-                    direct_factors_count = 0
-                    new_factor_start_symbol = self.new_symbol( start_symbol, True )
-                    direct_factors_productions = {}
+                    direct_factors_productions = productions_trie.group( non_deterministic_factor[0] )
                     log( 16, "non_deterministic_factor: %s", non_deterministic_factor )
-                    log( 16, "new_factor_start_symbol: %s", new_factor_start_symbol )
-
-                    for production in productions:
-
-                            if production[0] == non_deterministic_factor[0]:
-                                direct_factors_count += 1
-                                direct_factors_productions[production] = non_deterministic_factor
-
-                    direct_factors_productions = direct_factors_productions
                     log( 16, "direct_factors_productions: %s", direct_factors_productions )
 
-                    if direct_factors_count > 1:
+                    if len( direct_factors_productions ) > 1:
+                        new_factor_start_symbol = self.new_symbol( start_symbol, True )
+                        log( 16, "new_factor_start_symbol: %s", new_factor_start_symbol )
+
                         if start_symbol not in non_deterministic_factors_eliminated: non_deterministic_factors_eliminated[start_symbol] = []
                         non_deterministic_factors_eliminated[start_symbol].append( non_deterministic_factor )
                         has_eliminated_any_factor = True
-                        has_added_first_production = False
-
-                        for production in productions(1):
 
-                            if production in direct_factors_productions:
-                                start_production_factors = direct_factors_productions[production]
+                        # We see to add it first because if it was the last production, then the
+                        # start symbol will be removed by `remove_production()`
+                        new_start_production = non_deterministic_factor.new()
+                        new_start_production.add( new_factor_start_symbol[0].new() )
+                        self.add_production( start_symbol, new_start_production )
 
-                                # We see to add it first because if it was the last production, then
-                                # the start symbol will be removed by `remove_production()`
-                                if not has_added_first_production:
-                                    has_added_first_production = True
-                                    new_start_production = start_production_factors.new()
-                                    new_start_production.add( new_factor_start_symbol[0].new() )
-                                    self.add_production( start_symbol, new_start_production )
+                        for production in direct_factors_productions:
+                            new_factor_production = production.new()
+                            new_factor_production.remove_everything_before( len( non_deterministic_factor ) )
 
-                                new_factor_production = production.new()
-                                new_factor_production.remove_everything_before( len( start_production_factors ) )
+                            self.add_production( new_factor_start_symbol, new_factor_production )
+                            self.remove_production( start_symbol, production )
 
-                                self.add_production( new_factor_start_symbol, new_factor_production )
-                                self.remove_production( start_symbol, production )
+                        # All productions starting with this symbol were factored
+                        del productions_trie.groups[non_deterministic_factor[0]]
 
         self._save_history( "Eliminating Direct Factors", IntermediateGrammar.END )
 
@@ -1177,6 +1768,135 @@ class ChomskyGrammar():
 
         log( 16, "exiting: \n%s", self )
 
+    @enforce_budget
+    def merge_equivalent_non_terminals(self):
+        """
+            Merges the non terminal's with the same productions, after renaming the equivalent non
+            terminal's, as the new symbols `S1`, `S'`, etc, created by factoring and left recursion
+            elimination often end up with. Return a dictionary with the merged non terminal's and the
+            non terminal they were merged into.
+
+            The equivalent non terminal's are found by partition refinement, as on the DFA
+            minimization. All non terminal's start on the same block, then, each block is split
+            accordingly with the signatures of its non terminal's productions, where each non
+            terminal symbol is replaced by its block, until no block is split.
+
+            Each block is merged into the grammar initial symbol, if it is on the block, otherwise,
+            into its first symbol sorted by `sort_alphabetically_and_by_length()`.
+        """
+        self._save_history( "Merging Equivalent Non Terminals", IntermediateGrammar.BEGINNING )
+        self.expand_optional_symbols()
+
+        productions_keys = self.productions
+        start_symbols = self.initial_symbol_as_first()
+
+        # The terminals and the productions signatures are interned as integers, then, comparing
+        # the non terminal's signatures does not compare their symbols again
+        terminal_ids = {}
+        signature_ids = {}
+
+        terminal_codes = {}
+        non_terminals_productions = {}
+
+        for start_symbol in start_symbols:
+            productions = []
+
+            for production in productions_keys[start_symbol]:
+                codes = []
+
+                for symbol in production:
+
+                    if type( symbol ) is NonTerminal:
+                        codes.append( symbol )
+
+                    else:
+                        codes.append( terminal_ids.setdefault( str( symbol ), len( terminal_ids ) ) )
+
+                productions.append( codes )
+
+            non_terminals_productions[start_symbol] = productions
+
+        blocks = { start_symbol: 0 for start_symbol in start_symbols }
+        blocks_count = 1
+
+        while True:
+            new_blocks = {}
+            block_ids = {}
+
+            for start_symbol in start_symbols:
+                signature = frozenset( signature_ids.setdefault( tuple(
+                        -1 - blocks[code] if type( code ) is NonTerminal else code for code in codes ), len( signature_ids ) )
+                        for codes in non_terminals_productions[start_symbol] )
+
+                new_blocks[start_symbol] = block_ids.setdefault( ( blocks[start_symbol], signature ), len( block_ids ) )
+
+            blocks = new_blocks
+
+            if len( block_ids ) == blocks_count:
+                break
+
+            blocks_count = len( block_ids )
+
+        representatives = {}
+        merged_non_terminals = {}
+
+        # The initial symbol is the first, then, it is always its block representative
+        for start_symbol in [start_symbols[0]] + sort_alphabetically_and_by_length( start_symbols[1:] ):
+            block = blocks[start_symbol]
+
+            if block in representatives:
+                merged_non_terminals[start_symbol] = representatives[block]
+
+            else:
+                representatives[block] = start_symbol
+
+        if merged_non_terminals:
+            empty_start_symbols = []
+
+            for start_symbol in start_symbols:
+
+                if start_symbol in merged_non_terminals:
+                    continue
+
+                for production in productions_keys[start_symbol](1):
+
+                    if any( symbol in merged_non_terminals for symbol in production if type( symbol ) is NonTerminal ):
+                        new_production = Production( [merged_non_terminals[symbol][0].new()
+                                if type( symbol ) is NonTerminal and symbol in merged_non_terminals else symbol.new()
+                                for symbol in production], lock=True )
+
+                        # The simple production `S -> S1` becomes `S -> S`, which derives nothing new
+                        if new_production != start_symbol:
+                            self.add_production( start_symbol, new_production )
+
+                        self.remove_production( start_symbol, production, False )
+
+                if not productions_keys[start_symbol]:
+                    empty_start_symbols.append( start_symbol )
+
+            for start_symbol in merged_non_terminals:
+                self.remove_start_non_terminal( start_symbol, False )
+
+            # Dropping `S -> S` can leave a start symbol without productions, as on `A -> C`, `C -> C`,
+            # which is removed only now, because it also removes the productions using it
+            for start_symbol in empty_start_symbols:
+
+                if start_symbol in productions_keys:
+                    self.remove_start_non_terminal( start_symbol )
+
+        self._save_history( "Merging Equivalent Non Terminals", IntermediateGrammar.END )
+
+        if merged_non_terminals and self.is_saving_history:
+            merged_symbols = {}
+
+            for start_symbol, representative in merged_non_terminals.items():
+                merged_symbols.setdefault( representative, [] ).append( str( start_symbol ) )
+
+            self._save_data( "Merged non terminals: %s", "; ".join( "%s <- %s" % ( representative, ", ".join( symbols ) )
+                    for representative, symbols in merged_symbols.items() ) )
+
+        return merged_non_terminals
+
     def fertile(self):
         """
             Return a set with the fertile non terminal's start symbols.
@@ -1184,9 +1904,11 @@ class ChomskyGrammar():
         # log( 1, "self: \n%s", self )
         fertile = set()
         productions_keys = self.productions
+        optional_symbols = self.optional_symbols
 
         old_counter = -1
         current_counter = 0
+        sweep_count = 0
 
         # Create the initial fertile Non Terminal's sets
         for start_symbol in productions_keys:
@@ -1198,28 +1920,38 @@ class ChomskyGrammar():
 
         while old_counter != current_counter:
             old_counter = current_counter
+            self._check_cancelled()
+            sweep_count += 1
+            self._report_progress( "Fertile symbols", sweep=sweep_count, changes_count=current_counter )
 
             for start_symbol in productions_keys:
                 productions = productions_keys[start_symbol]
 
                 for production in productions:
                     all_fertile = True
+                    all_omitted = True
 
                     for symbol in production:
 
                         if type( symbol ) is Terminal:
+                            all_omitted = False
                             continue
 
                         if type( symbol ) is NonTerminal:
 
                             if symbol in fertile:
+                                all_omitted = False
+                                continue
+
+                            # On the compact epsilon free form, optional symbols can be omitted
+                            elif symbol in optional_symbols:
                                 continue
 
                             else:
                                 all_fertile = False
                                 break
 
-                    if all_fertile and start_symbol not in fertile:
+                    if all_fertile and not all_omitted and start_symbol not in fertile:
                         current_counter += 1
                         fertile.add( start_symbol )
 
@@ -1233,12 +1965,15 @@ class ChomskyGrammar():
         fertile = self.fertile()
         infertile = DynamicIterationDict()
         productions_keys = self.productions
+        optional_symbols = self.optional_symbols
+        is_saving_history = self.is_saving_history
 
         for start_symbol in productions_keys(1):
             productions = productions_keys[start_symbol]
 
             for production in productions(1):
                 all_fertile = True
+                infertile_optional = []
 
                 for symbol in production:
 
@@ -1247,14 +1982,29 @@ class ChomskyGrammar():
                         if symbol in fertile:
                             continue
 
+                        elif symbol in optional_symbols:
+                            infertile_optional.append( symbol )
+
                         else:
                             all_fertile = False
                             break
 
-                if not all_fertile:
-                    infertile.append( "%s -> %s" % ( start_symbol, production ) )
+                if not all_fertile or infertile_optional:
+
+                    if is_saving_history:
+                        infertile.append( "%s -> %s" % ( start_symbol, production ) )
+
                     self.remove_production( start_symbol, production, False )
 
+                    # On the compact epsilon free form, only the combinations without the infertile
+                    # optional symbols are fertile, then they can be directly removed
+                    if all_fertile:
+                        new_production = Production( [symbol.new() for symbol in production
+                                if symbol not in infertile_optional], lock=True )
+
+                        if new_production:
+                            self.add_production( start_symbol, new_production )
+
                     if not productions:
                         self.remove_start_non_terminal( start_symbol, False )
 
@@ -1292,6 +2042,7 @@ class ChomskyGrammar():
         reachable = self.reachable()
         unreachable = DynamicIterationDict()
         productions_keys = self.productions
+        is_saving_history = self.is_saving_history
 
         for start_symbol in productions_keys(1):
             productions = productions_keys[start_symbol]
@@ -1299,7 +2050,10 @@ class ChomskyGrammar():
             # log( 1, "2. productions: %s", productions )
 
             if start_symbol not in reachable:
-                unreachable.append( "%s -> %s" % ( start_symbol, productions.keys() ) )
+
+                if is_saving_history:
+                    unreachable.append( "%s -> %s" % ( start_symbol, productions.keys() ) )
+
                 self.remove_start_non_terminal( start_symbol )
                 continue
 
@@ -1317,7 +2071,10 @@ class ChomskyGrammar():
                         break
 
                 if not all_reachable:
-                    unreachable.append( "%s -> %s" % ( start_symbol, production ) )
+
+                    if is_saving_history:
+                        unreachable.append( "%s -> %s" % ( start_symbol, production ) )
+
                     self.remove_production( start_symbol, production, False )
 
                     if not productions:
@@ -1347,6 +2104,7 @@ class ChomskyGrammar():
         self.convert_to_epsilon_free()
         old_counter = -1
         current_counter = 0
+        sweep_count = 0
 
         productions_keys = self.productions
         simple_non_terminals = {}
@@ -1357,6 +2115,9 @@ class ChomskyGrammar():
 
         while old_counter != current_counter:
             old_counter = current_counter
+            self._check_cancelled()
+            sweep_count += 1
+            self._report_progress( "Simple non terminal's", sweep=sweep_count, changes_count=current_counter )
 
             for start_symbol in productions_keys:
                 productions = productions_keys[start_symbol]
@@ -1379,6 +2140,7 @@ class ChomskyGrammar():
             Determines whether this grammar has direct cycle of simple non terminals `A +=> A` on
             any of its start non terminal's symbols.
         """
+        self.expand_optional_symbols()
         productions_keys = self.productions
 
         for non_terminal_to_check in productions_keys:
@@ -1405,6 +2167,7 @@ class ChomskyGrammar():
             # log( 1, "recursive_terminals: %s", recursive_terminals )
             return False
 
+    @enforce_budget
     def eliminate_simple_non_terminals(self):
         """
             Eliminates all unreachable terminal's and non terminal symbols with their productions.
@@ -1428,10 +2191,11 @@ class ChomskyGrammar():
 
         self._save_history( "Eliminating Simple Productions", IntermediateGrammar.END )
 
-        if sum( len( value ) for value in simple_non_terminals.values() ) != len( simple_non_terminals ):
+        if self.is_saving_history and sum( len( value ) for value in simple_non_terminals.values() ) != len( simple_non_terminals ):
             self._save_data( "Simple Non Terminals: %s", "; ".join( "%s -> %s" % ( key, element.keys() )
                    for key, element in simple_non_terminals.items() ) )
 
+    @enforce_budget
     def convert_to_proper(self):
         """
             1. Call `convert_to_epsilon_free()` because it can create cycles
@@ -1449,6 +2213,350 @@ class ChomskyGrammar():
         self.eliminate_unuseful()
         self._save_history( "Converting to Proper", IntermediateGrammar.END )
 
+    def has_simple_productions(self):
+        """
+            Return True if this grammar has any production as `A -> B`, i.e., only one non terminal.
+        """
+        productions_keys = self.productions
+
+        for start_symbol in productions_keys:
+
+            for production in productions_keys[start_symbol]:
+
+                if len( production ) == 1 and type( production[0] ) is NonTerminal:
+                    return True
+
+        return False
+
+    @enforce_budget
+    def convert_to_cnf(self):
+        """
+            Converts this grammar to the Chomsky Normal Form, where all productions are as `A -> B C`
+            or `A -> a`, and only the initial symbol can have the production `S -> &`, as long as it
+            does not appear on the right side of any production.
+
+            1. Call `convert_to_proper()` and eliminate the remaining simple productions
+            2. Replace the terminals on productions with more than one symbol by new non terminals
+            3. Break the productions with more than two symbols into productions with two symbols
+        """
+        self._save_history( "Converting to Chomsky Normal Form", IntermediateGrammar.BEGINNING )
+        self.convert_to_proper()
+
+        # The empty language grammar `S -> S` has nothing else to convert
+        if self._is_empty():
+            self._save_history( "Converting to Chomsky Normal Form", IntermediateGrammar.END )
+            return
+
+        if self.has_simple_productions():
+            self.eliminate_simple_non_terminals()
+            self.eliminate_unuseful()
+
+        productions_keys = self.productions
+        terminals_non_terminals = {}
+        binarized_non_terminals = {}
+
+        def get_binarized_non_terminal(start_symbol, symbols):
+            symbols = tuple( symbols )
+
+            if symbols not in binarized_non_terminals:
+                new_non_terminal = self.new_symbol( start_symbol, True )
+                binarized_non_terminals[symbols] = new_non_terminal
+
+                if len( symbols ) > 2:
+                    tail_non_terminal = get_binarized_non_terminal( start_symbol, symbols[1:] )
+                    self.add_production( new_non_terminal, Production( [symbols[0].new(), tail_non_terminal[0].new()], lock=True ) )
+
+                else:
+                    self.add_production( new_non_terminal, Production( [symbol.new() for symbol in symbols], lock=True ) )
+
+            return binarized_non_terminals[symbols]
+
+        for start_symbol in productions_keys(1):
+            productions = productions_keys[start_symbol]
+
+            for production in productions(1):
+
+                if len( production ) < 2:
+                    continue
+
+                symbols = []
+
+                for symbol in production:
+
+                    if type( symbol ) is Terminal:
+                        symbols.append( self._terminal_non_terminal( symbol, terminals_non_terminals )[0] )
+
+                    else:
+                        symbols.append( symbol )
+
+                if len( symbols ) > 2:
+                    tail_non_terminal = get_binarized_non_terminal( start_symbol, symbols[1:] )
+                    symbols = [symbols[0], tail_non_terminal[0]]
+
+                new_production = Production( [symbol.new() for symbol in symbols], lock=True )
+
+                if new_production != production:
+                    self.add_production( start_symbol, new_production )
+                    self.remove_production( start_symbol, production )
+
+        self._save_history( "Converting to Chomsky Normal Form", IntermediateGrammar.END )
+
+        if self.is_saving_history:
+            self._save_data( "Terminals replaced: %s", "; ".join( "%s -> %s" % ( non_terminal, terminal )
+                    for terminal, non_terminal in terminals_non_terminals.items() ) )
+
+            self._save_data( "Productions broken: %s", "; ".join( "%s -> %s" % ( non_terminal, " ".join( str( symbol ) for symbol in symbols ) )
+                    for symbols, non_terminal in binarized_non_terminals.items() ) )
+
+    def _terminal_non_terminal(self, terminal, terminals_non_terminals):
+        """
+            Return the new non terminal `T1`, `T2`, etc, with the only production `T -> terminal`,
+            creating it when `terminal` is not yet on the `terminals_non_terminals` dictionary.
+        """
+
+        if terminal not in terminals_non_terminals:
+            new_non_terminal = self.new_symbol( "T", True )
+            self.add_production( new_non_terminal, Production( [terminal.new()], lock=True ) )
+            terminals_non_terminals[terminal] = new_non_terminal
+
+        return terminals_non_terminals[terminal]
+
+    @enforce_budget
+    def convert_to_gnf(self):
+        """
+            Converts this grammar to the Greibach Normal Form, where all productions are as
+            `A -> a B C ...`, i.e., a terminal followed by zero or more non terminal's, and only the
+            initial symbol can have the production `S -> &`, as long as it does not appear on the
+            right side of any production.
+
+            1. Call `convert_to_proper()`, eliminate the remaining simple productions and merge
+               the equivalent non terminal's with `merge_equivalent_non_terminals()`
+            2. Call `eliminate_left_recursion()` with the `left_corner_order()`, on its epsilon
+               free form, as the nullable `A'` would blow up the grammar when removed later
+            3. Replace the productions starting with a non terminal by its productions, starting
+               from the non terminal's whose productions already start with terminals
+            4. Replace the terminals after the first symbol by new non terminals
+
+            The conversion can blow up the grammar size exponentially, even for grammars with a few
+            non terminals, then, use a `budget` to limit its size or time. Return a list of tuples
+            (step name, productions count, symbols count) with the grammar size after each step,
+            which is also saved on the operations history, or None when the budget was exceeded.
+        """
+        self._save_history( "Converting to Greibach Normal Form", IntermediateGrammar.BEGINNING )
+        statistics = []
+
+        def save_statistics(step_name):
+            statistics.append( ( step_name, self.productions_count, self.symbols_count ) )
+
+        save_statistics( "Original grammar" )
+        self.convert_to_proper()
+
+        if self.has_simple_productions():
+            self.eliminate_simple_non_terminals()
+            self.eliminate_unuseful()
+
+        save_statistics( "Proper grammar" )
+
+        # The proper grammar conversion often copies the same productions to several non
+        # terminal's, which would be substituted on each other, multiplying the grammar size
+        if self.merge_equivalent_non_terminals():
+            save_statistics( "Equivalent non terminals merged" )
+
+        # The empty language grammar `S -> S` has nothing else to convert
+        if self._is_empty():
+            self._save_history( "Converting to Greibach Normal Form", IntermediateGrammar.END )
+            return statistics
+
+        if self.has_left_recursion():
+            self.eliminate_left_recursion( self.left_corner_order(), epsilon_free=True )
+            save_statistics( "Left recursion eliminated" )
+
+        productions_keys = self.productions
+        substituted_non_terminals = []
+
+        # Without left recursion, the left corner graph has no cycles, then, the left corners of
+        # each symbol come before it, and their productions already start with terminals
+        for start_symbol in self.left_corner_order():
+            productions = productions_keys[start_symbol]
+            is_substituted = False
+
+            for production in productions(1):
+                self._check_cancelled()
+                first_symbol = production[0]
+
+                if type( first_symbol ) is not NonTerminal:
+                    continue
+
+                for first_production in productions_keys[first_symbol]:
+                    new_production = production.replace( 0, first_production )
+                    self.add_production( start_symbol, new_production )
+
+                self.remove_production( start_symbol, production, False )
+                is_substituted = True
+
+            if is_substituted:
+                substituted_non_terminals.append( str( start_symbol ) )
+                save_statistics( "Substituted %s" % start_symbol )
+
+        terminals_non_terminals = {}
+
+        for start_symbol in productions_keys(1):
+            productions = productions_keys[start_symbol]
+
+            for production in productions(1):
+                self._check_cancelled()
+
+                if not any( type( symbol ) is Terminal for symbol in production[1:] ):
+                    continue
+
+                symbols = [production[0]]
+
+                for symbol in production[1:]:
+
+                    if type( symbol ) is Terminal:
+                        symbols.append( self._terminal_non_terminal( symbol, terminals_non_terminals )[0] )
+
+                    else:
+                        symbols.append( symbol )
+
+                self.add_production( start_symbol, Production( [symbol.new() for symbol in symbols], lock=True ) )
+                self.remove_production( start_symbol, production, False )
+
+        if terminals_non_terminals:
+            save_statistics( "Terminals replaced" )
+
+        self.eliminate_unuseful()
+        save_statistics( "Unuseful symbols eliminated" )
+
+        self._save_history( "Converting to Greibach Normal Form", IntermediateGrammar.END )
+
+        if self.is_saving_history:
+            self._save_data( "Substituted non terminals: %s", ", ".join( substituted_non_terminals ) )
+
+            self._save_data( "Terminals replaced: %s", "; ".join( "%s -> %s" % ( non_terminal, terminal )
+                    for terminal, non_terminal in terminals_non_terminals.items() ) )
+
+            self._save_data( "Productions per step: %s", "; ".join( "%s: %s productions, %s symbols" % step for step in statistics ) )
+        return statistics
+
+    def is_gnf(self):
+        """
+            Return True if this grammar is on the Greibach Normal Form. See `convert_to_gnf()`.
+
+            The empty language grammar `S -> S` is considered on the Greibach Normal Form.
+        """
+        productions_keys = self.productions
+        initial_symbol = self.initial_symbol
+
+        if self._is_empty():
+            return True
+
+        for start_symbol in productions_keys:
+
+            for production in productions_keys[start_symbol]:
+
+                if production == epsilon_production:
+
+                    if start_symbol != initial_symbol:
+                        return False
+
+                elif type( production[0] ) is not Terminal or not all( type( symbol ) is NonTerminal for symbol in production[1:] ):
+                    return False
+
+                elif initial_symbol in production and self.has_production( initial_symbol, epsilon_production ):
+                    return False
+
+        return True
+
+    def build_cyk_recognizer(self, use_numpy=None):
+        """
+            Return a CYKRecognizer for a copy of this grammar converted to the Chomsky Normal Form,
+            which can recognize sentences of any context free grammar, not only LL(1) ones.
+
+            If `use_numpy` is None, NumPy is used when it is installed.
+        """
+        grammar = self.copy()
+        grammar.convert_to_cnf()
+        return CYKRecognizer( grammar, use_numpy )
+
+    def build_earley_parser(self):
+        """
+            Return an EarleyParser working directly on this grammar productions, which can
+            recognize sentences of any context free grammar and build their parse forests, without
+            converting this grammar to some normal form.
+        """
+        return EarleyParser( self )
+
+    def sentences(self, max_length=None):
+        """
+            Return a generator with this grammar language sentences on order of length, with up to
+            `max_length` terminals each, see `SentencesEnumerator.sentences()`.
+
+            If `max_length` is None, the language must be finite, see `is_finite()`, and all its
+            sentences are generated, otherwise, a RuntimeError is raised.
+        """
+        sentences_enumerator = SentencesEnumerator( self )
+
+        if max_length is None:
+            max_length = sentences_enumerator.longest_length()
+
+            if max_length is None:
+                raise RuntimeError( "The grammar language is infinite, a maximum sentence length is required!" )
+
+        return sentences_enumerator.sentences( max_length )
+
+    def build_language_counter(self, modulus=None):
+        """
+            Return a LanguageCounter for a copy of this grammar converted to the Chomsky Normal Form,
+            which counts its derivations by length without enumerating them, and without changing
+            this grammar as `is_finite()` does. The derivations counted are the ones of the Chomsky
+            Normal Form grammar, which can be less than this grammar ones.
+
+            If `modulus` is not None, the counts are computed modulo it.
+        """
+        grammar = self.copy()
+        grammar.convert_to_cnf()
+        return LanguageCounter( grammar, modulus )
+
+    def build_sentence_sampler(self, seed=None):
+        """
+            Return a SentenceSampler drawing random sentences of an exact length from a copy of
+            this grammar converted to the Chomsky Normal Form, see `build_language_counter()`.
+
+            The sampler caches the counts it computes, then, keep it to draw more samples.
+        """
+        return SentenceSampler( self.build_language_counter(), seed )
+
+    def is_cnf(self):
+        """
+            Return True if this grammar is on the Chomsky Normal Form. See `convert_to_cnf()`.
+
+            The empty language grammar `S -> S` is considered on the Chomsky Normal Form.
+        """
+        productions_keys = self.productions
+        initial_symbol = self.initial_symbol
+
+        if self._is_empty():
+            return True
+
+        for start_symbol in productions_keys:
+
+            for production in productions_keys[start_symbol]:
+                symbols_types = [type( symbol ) for symbol in production]
+
+                if production == epsilon_production:
+
+                    if start_symbol != initial_symbol:
+                        return False
+
+                elif symbols_types != [Terminal] and symbols_types != [NonTerminal, NonTerminal]:
+                    return False
+
+                elif initial_symbol in production and self.has_production( initial_symbol, epsilon_production ):
+                    return False
+
+        return True
+
     def is_empty(self):
         """
             Return `True` if this grammar language is empty, i.e., generates no sentences.
@@ -1493,6 +2601,106 @@ class ChomskyGrammar():
 
         return False
 
+    def classify_language(self):
+        """
+            Return the `LanguageClass` of this grammar language, without changing this grammar, as
+            `is_empty()`, `is_finite()` and `is_infinite()` do.
+
+            The language is empty when the initial symbol is not fertile. Otherwise, it is infinite
+            when a strongly connected component of the useful non terminal's graph has an edge `A`
+            to `B` from a production of `A` whose other symbols can derive some terminal, as then,
+            `A` derives sentences as long as wanted.
+        """
+        fertile = self.fertile()
+
+        if self.initial_symbol not in fertile:
+            return LanguageClass.EMPTY
+
+        productions_keys = self.productions
+        optional_symbols = self.optional_symbols
+        start_symbols_keys = { start_symbol: start_symbol for start_symbol in productions_keys }
+
+        # The symbols of each useful production, without the epsilon and the omitted optional
+        # symbols, on the compact epsilon free form
+        useful_productions = {}
+        reachable = DynamicIterationDict( [self.initial_symbol] )
+
+        for start_symbol in reachable:
+            self._check_cancelled()
+            symbol_productions = useful_productions[start_symbol] = []
+
+            for production in productions_keys[start_symbol]:
+                symbols = []
+
+                for symbol in production:
+
+                    if type( symbol ) is Terminal:
+
+                        if symbol != epsilon_terminal:
+                            symbols.append( symbol )
+
+                    elif symbol in fertile:
+                        symbols.append( start_symbols_keys[symbol] )
+
+                    elif symbol not in optional_symbols:
+                        break
+
+                else:
+                    symbol_productions.append( symbols )
+
+                    for symbol in symbols:
+
+                        if type( symbol ) is not Terminal:
+                            reachable.add( symbol )
+
+        # The non terminal's which can derive some terminal
+        non_empty = set()
+        old_counter = -1
+
+        while old_counter != len( non_empty ):
+            old_counter = len( non_empty )
+            self._check_cancelled()
+
+            for start_symbol, symbol_productions in useful_productions.items():
+
+                if start_symbol not in non_empty and any( type( symbol ) is Terminal or symbol in non_empty
+                        for symbols in symbol_productions for symbol in symbols ):
+                    non_empty.add( start_symbol )
+
+        successors = {}
+        growing_edges = []
+
+        for start_symbol, symbol_productions in useful_productions.items():
+            symbol_successors = successors[start_symbol] = []
+
+            for symbols in symbol_productions:
+                non_empty_count = sum( 1 for symbol in symbols if type( symbol ) is Terminal or symbol in non_empty )
+
+                for symbol in symbols:
+
+                    if type( symbol ) is Terminal:
+                        continue
+
+                    symbol_successors.append( symbol )
+
+                    if non_empty_count > ( 1 if symbol in non_empty else 0 ):
+                        growing_edges.append( ( start_symbol, symbol ) )
+
+        self._check_cancelled()
+        components = {}
+
+        for index, component in enumerate( self.strongly_connected_components( list( successors ), successors ) ):
+
+            for symbol in component:
+                components[symbol] = index
+
+        for start_symbol, symbol in growing_edges:
+
+            if components[start_symbol] == components[symbol]:
+                return LanguageClass.INFINITE
+
+        return LanguageClass.FINITE
+
     def first_non_terminals(self):
         """
             Calculates the start production symbols non terminal's FIRST set.
@@ -1502,6 +2710,7 @@ class ChomskyGrammar():
 
         old_counter = -1
         current_counter = 0
+        sweep_count = 0
 
         # Create the initial FIRST Non Terminal's sets
         for symbol in productions_keys:
@@ -1509,6 +2718,9 @@ class ChomskyGrammar():
 
         while old_counter != current_counter:
             old_counter = current_counter
+            self._check_cancelled()
+            sweep_count += 1
+            self._report_progress( "FIRST non terminal's", sweep=sweep_count, changes_count=current_counter )
 
             for start_symbol in productions_keys:
                 productions = productions_keys[start_symbol]
@@ -1542,7 +2754,7 @@ class ChomskyGrammar():
                 following_first.update( first_non_terminals[symbol] )
 
                 # log( 1, "symbol: %s, production: %-6s, first: %s", symbol, production, first[symbol] )
-                if self.has_production( symbol, epsilon_production ):
+                if self.has_production( symbol, epsilon_production ) or symbol in self.optional_symbols:
                     continue
 
                 else:
@@ -1567,6 +2779,7 @@ class ChomskyGrammar():
 
         old_counter = -1
         current_counter = 0
+        sweep_count = 0
 
         # Create the initial FIRST's sets
         for symbol in productions_keys:
@@ -1574,6 +2787,9 @@ class ChomskyGrammar():
 
         while old_counter != current_counter:
             old_counter = current_counter
+            self._check_cancelled()
+            sweep_count += 1
+            self._report_progress( "FIRST terminals", sweep=sweep_count, changes_count=current_counter )
 
             for start_symbol in productions_keys:
                 productions = productions_keys[start_symbol]
@@ -1587,18 +2803,26 @@ class ChomskyGrammar():
 
         return first_terminals
 
-    def first_terminals_from(self, production, first_terminals, following_first=None):
+    def first_terminals_from(self, production, first_terminals, following_first=None, can_vanish=False):
         """
             Given a `production` and a `first_terminals` set, get their Non Terminal's FIRST symbols set.
 
             If `following_first` set is provided, then it contents will be updated with the first
             terminal's, otherwise a new set will be created, populated and returned.
+
+            If `can_vanish` is True, the `production` is the remaining part of another production,
+            then when all its symbols are optional symbols, it can derive epsilon.
         """
         # log( 1, "%s", production )
+        optional_symbols = self.optional_symbols
 
         if following_first is None:
             following_first = set()
 
+        # On the compact epsilon free form, the production combinations omitting all its optional
+        # symbols are only part of it when it is the remaining part of another production
+        can_derive_epsilon = can_vanish
+
         # If there is a production X → Y1Y2..Yk then add first(Y1Y2..Yk) to first(X)
         for symbol in production:
             symbol_type = type( symbol )
@@ -1608,13 +2832,14 @@ class ChomskyGrammar():
                 first_terminals_set = first_terminals[symbol]
                 Production.copy_productions_except_epsilon( first_terminals_set, following_first )
 
-                # If First(Y1) First(Y2)..First(Yk) all contain ε, then add ε to First(Y1Y2..Yk) as well
+                # If First(Y1) First(Y2)..First(Yk) all contain ε, then add ε to First(Y1Y2..Yk) as
+                # well, which also happens when the other symbols are optional and omitted, as the
+                # nullable initial symbol, which keeps its `S -> &`, when it is optional
                 if epsilon_terminal in first_terminals_set:
+                    can_derive_epsilon = True
 
-                    if production.is_last( symbol ):
-                        following_first.add( epsilon_terminal )
-
-                else:
+                # On the compact epsilon free form, optional symbols can be omitted
+                elif symbol not in optional_symbols:
                     break
 
             # If X is a terminal then First(X) is just X!
@@ -1626,6 +2851,11 @@ class ChomskyGrammar():
             else:
                 raise RuntimeError( "Expecting a Terminal or NonTerminal symbol. Got: %s! (%s) \n%s" % ( type( symbol ), symbol, self ) )
 
+        else:
+
+            if can_derive_epsilon:
+                following_first.add( epsilon_terminal )
+
         return following_first
 
     def follow_terminals(self, first_terminals=None):
@@ -1640,6 +2870,7 @@ class ChomskyGrammar():
 
         old_counter = -1
         current_counter = 0
+        sweep_count = 0
 
         if first_terminals is None:
             first_terminals = self.first_terminals()
@@ -1653,6 +2884,9 @@ class ChomskyGrammar():
 
         while old_counter != current_counter:
             old_counter = current_counter
+            self._check_cancelled()
+            sweep_count += 1
+            self._report_progress( "FOLLOW terminals", sweep=sweep_count, changes_count=current_counter )
 
             for start_symbol in productions_keys:
                 productions = productions_keys[start_symbol]
@@ -1669,7 +2903,7 @@ class ChomskyGrammar():
 
                             if next_symbol:
                                 following_symbols = production.following_symbols()
-                                following_first = self.first_terminals_from( following_symbols, first_terminals )
+                                following_first = self.first_terminals_from( following_symbols, first_terminals, can_vanish=True )
                                 # log( 1, "4. following_symbols: %s, following_first: %s", following_symbols, following_first )
 
                                 # If there is a production A → aBb, (where a can be a whole string),
@@ -0,0 +1,259 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Licensing
+#
+# Chomsky Grammar History Sink
+# Copyright (C) 2018 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import json
+import tempfile
+
+from debug_tools import getLogger
+
+from .symbols import NO_GRAMMAR_CHANGES
+from .intermediate_grammar import IntermediateGrammar
+
+log = getLogger( 127, __name__ )
+
+
+class HistorySink(object):
+    """
+        Receives the operations history entries of a grammar, on order, and writes them as
+        `ChomskyGrammar.get_operation_history()` displays them: the beginning of an operation is
+        only displayed when it is the first entry, otherwise, its extra text is moved to the next
+        entry, and the end entries without extra text say there were no changes.
+
+        While a grammar has a `history_sink`, each entry is written as soon as the next one is
+        created, as until then, `_save_data()` can still add text to it. Then, only the last
+        `ring_size` entries are kept on the grammar `operations_history`.
+
+        This sink keeps the text of the entries written on memory, as used by
+        `ChomskyGrammar.get_operation_history()`, while the `FileHistorySink` streams them to a file.
+    """
+
+    def __init__(self, ring_size=None):
+        """
+            `ring_size` how many entries the grammar keeps on its `operations_history` after they
+            were written, or None to keep all of them.
+        """
+        ## How many entries the grammar keeps on its `operations_history`, or None for all of them
+        self.ring_size = ring_size
+
+        ## How many entries from the start of the grammar `operations_history` were already written
+        self.written_count = 0
+
+        ## How many entries were received
+        self.received_count = 0
+
+        ## How many entries were displayed, i.e., the number of the last entry written
+        self.counter = 0
+
+        ## The extra text of the beginning entries not displayed, to be added to the next entry
+        self.carried_text = []
+
+        ## The version of the last entry received, and a dictionary with its productions, which
+        ## the next entry changes are applied to, see `GrammarVersion.productions()`
+        self.last_version = None
+        self.productions = None
+
+        ## After how many received entries the version of the current entry saves all its
+        ## productions, then, the older versions can be freed after their entries leave the ring
+        self.checkpoint_interval = ring_size
+
+        ## The list of the text of each entry written
+        self.entries = []
+
+    def write(self, operation, productions_to_string, is_only_entry=False):
+        """
+            Renders the grammar string of the `operation` entry, calling `productions_to_string(
+            productions, initial_symbol, optional_symbols )`, and writes it if it is displayed.
+            The `is_only_entry` tells whether the history has only this entry.
+        """
+        version = operation.version
+        self.productions = version.productions( self.last_version, self.productions )
+        self.last_version = version
+        self.received_count += 1
+
+        if operation.grammar is None:
+            operation.grammar = productions_to_string( self.productions, version.initial_symbol, version.optional_symbols )
+
+        if self.checkpoint_interval and not self.received_count % self.checkpoint_interval and version.snapshot is None:
+            version.snapshot = { start_symbol: dict( start_productions ) for start_symbol, start_productions in self.productions.items() }
+            version.parent = None
+
+        stage = operation.stage.value
+        extra_text = self.carried_text + operation.extra_text
+
+        if stage == IntermediateGrammar.BEGINNING and self.counter:
+            self.carried_text = extra_text
+            return
+
+        self.carried_text = []
+
+        if ( stage == IntermediateGrammar.END or is_only_entry ) and not extra_text:
+            extra_text = [NO_GRAMMAR_CHANGES]
+
+        self.counter += 1
+        self._write_entry( operation, extra_text )
+
+    def receive(self, grammar, is_finished=False):
+        """
+            Writes the entries of the `grammar` operations history which were not written yet,
+            except the last one, unless `is_finished`, then, removes the oldest entries written
+            beyond the `ring_size`.
+        """
+        operations_history = grammar.operations_history
+        finished_count = len( operations_history ) if is_finished else len( operations_history ) - 1
+
+        for index in range( self.written_count, finished_count ):
+            self.write( operations_history[index], grammar._productions_str,
+                    is_finished and not self.received_count and len( operations_history ) == 1 )
+
+        self.written_count = max( self.written_count, finished_count )
+
+        if self.ring_size is not None:
+            removed_count = min( len( operations_history ) - self.ring_size, self.written_count )
+
+            if removed_count > 0:
+                del operations_history[:removed_count]
+                self.written_count -= removed_count
+
+    def _write_entry(self, operation, extra_text):
+        """
+            Writes the `operation` entry, displayed with the number `self.counter` and the
+            `extra_text` list.
+        """
+        self.entries.append( "# %s. %s" % ( self.counter, operation.to_string( extra_text ) ) )
+
+    def text(self):
+        """
+            Return a string with all entries written.
+        """
+        return "\n\n".join( self.entries )
+
+    def close(self):
+        """
+            Releases the resources used by this sink.
+        """
+
+
+class FileHistorySink(HistorySink):
+    """
+        Streams the entries written to a file or pipe, with the same text `# N. name` as
+        `ChomskyGrammar.get_operation_history()`, or as JSON lines, one JSON object per entry.
+
+        When writing to a file path, the file offset of each entry is saved, then, the entries can
+        be read back page by page, see `read_entries()`, without loading the whole file.
+    """
+
+    def __init__(self, file=None, json_lines=False, ring_size=100):
+        """
+            `file` a file path, a text file object as `sys.stdout`, or None to create a temporary
+                file, which is deleted by `close()`
+            `json_lines` whether to write each entry as a JSON object on its own line
+            `ring_size` see `HistorySink`
+        """
+        super().__init__( ring_size )
+
+        ## Whether the entries are written as JSON lines, instead of text
+        self.json_lines = json_lines
+
+        ## Whether the file is a temporary file, to be deleted by `close()`
+        self.is_temporary = file is None
+
+        ## The path of the file written, or None when writing to a file object
+        self.file_path = None
+
+        if file is None:
+            file_descriptor, file = tempfile.mkstemp( suffix=".jsonl" if json_lines else ".txt", prefix="grammar_history_" )
+            os.close( file_descriptor )
+
+        if isinstance( file, str ):
+            self.file_path = file
+            file = open( file, 'w', encoding='utf-8', newline='\n' )
+
+        ## The file object the entries are written to
+        self.file = file
+
+        ## The list with the byte offset of each entry on the file, plus the file size at the end
+        self.offsets = [0]
+
+    def _write_entry(self, operation, extra_text):
+        """
+            Writes the `operation` entry to the file, instead of keeping it on memory.
+        """
+
+        if self.json_lines:
+            text = json.dumps( { "counter": self.counter, "name": operation.name, "stage": str( operation.stage ).lstrip( ", " ),
+                    "timestamp": operation.timestamp, "extra_text": extra_text, "grammar": operation.grammar } ) + "\n"
+
+        else:
+            text = "%s# %s. %s" % ( "\n\n" if self.counter > 1 else "", self.counter, operation.to_string( extra_text ) )
+
+        self.file.write( text )
+        self.offsets.append( self.offsets[-1] + len( text.encode( 'utf-8' ) ) )
+
+    def __len__(self):
+        """
+            Return how many entries were written.
+        """
+        return len( self.offsets ) - 1
+
+    def text(self):
+        """
+            Return a string with all entries written, read back from the file.
+        """
+        return ( "\n" if self.json_lines else "\n\n" ).join( self.read_entries( 0, len( self ) ) )
+
+    def read_entries(self, start_index, count):
+        """
+            Return a list with the text of up to `count` entries written, starting on the entry
+            `start_index`, where the first entry is 0.
+        """
+
+        if self.file_path is None:
+            raise RuntimeError( "Only the entries written to a file path can be read back!" )
+
+        self.file.flush()
+        offsets = self.offsets
+        end_index = min( start_index + count, len( self ) )
+        entries = []
+
+        with open( self.file_path, 'rb' ) as file:
+            file.seek( offsets[start_index] )
+
+            for index in range( start_index, end_index ):
+                entries.append( file.read( offsets[index + 1] - offsets[index] ).decode( 'utf-8' ).strip( "\n" ) )
+
+        return entries
+
+    def close(self):
+        """
+            Closes the file written, deleting it if it is a temporary file.
+        """
+
+        if self.file_path is not None:
+            self.file.close()
+
+            if self.is_temporary and os.path.exists( self.file_path ):
+                os.remove( self.file_path )
+
+        else:
+            self.file.flush()
@@ -68,9 +68,222 @@ class Stage(object):
         return ""
 
 
+class HistoryPolicy(object):
+    """
+        The levels of detail a grammar can record on its operations history, see
+        `ChomskyGrammar.history_policy`.
+    """
+
+    ## Do not record any history, neither create its extra text
+    NONE = 0
+
+    ## Only record the beginning and end of each operation, without its intermediate steps
+    SUMMARY = 1
+
+    ## Record all the operations steps, each one saving only the productions changed since the
+    ## previous one
+    FULL = 2
+
+    ## Record all the operations steps, each one also saving all the grammar productions, then,
+    ## any entry can be rendered without replaying the previous ones
+    FULL_WITH_SNAPSHOTS = 3
+
+    ## All the valid policies
+    ALL = ( NONE, SUMMARY, FULL, FULL_WITH_SNAPSHOTS )
+
+
+class GrammarChanges(object):
+    """
+        Records the start symbols and productions added and removed from a grammar since its last
+        version, see `GrammarVersion`. Adding something removed, or removing something added,
+        cancels both, then, it only has the differences between the last version and the next one.
+    """
+
+    def __init__(self, is_snapshot_required=True):
+        """
+            If `is_snapshot_required`, the next version saves all the grammar productions, instead of
+            its changes, as for the first version.
+        """
+        ## Whether the next version must save all the grammar productions, as after the grammar
+        ## productions were replaced all at once, or while the changes are not recorded
+        self.is_snapshot_required = is_snapshot_required
+
+        ## A dictionary with the tuples (start symbol, production) added as True and removed as False
+        self.productions = {}
+
+        ## A dictionary with the start symbols added as True and removed as False
+        self.start_symbols = {}
+
+    def __len__(self):
+        """
+            Return how many productions and start symbols were changed.
+        """
+        return len( self.productions ) + len( self.start_symbols )
+
+    @staticmethod
+    def _change(changes, key, is_added):
+        """
+            Records `key` as added or removed on the `changes` dictionary, cancelling its opposite.
+        """
+
+        if changes.get( key, is_added ) is is_added:
+            changes[key] = is_added
+
+        else:
+            del changes[key]
+
+    def add_production(self, start_symbol, production):
+        self._change( self.productions, ( start_symbol, production ), True )
+
+    def remove_production(self, start_symbol, production):
+        self._change( self.productions, ( start_symbol, production ), False )
+
+    def add_start_symbol(self, start_symbol):
+        self._change( self.start_symbols, start_symbol, True )
+
+    def remove_start_symbol(self, start_symbol):
+        self._change( self.start_symbols, start_symbol, False )
+
+    def apply(self, productions):
+        """
+            Applies these changes to the `productions` dictionary, with a dictionary of productions
+            for each start symbol, as the ones of the previous version.
+        """
+
+        for start_symbol, is_added in self.start_symbols.items():
+
+            if is_added:
+                productions.setdefault( start_symbol, {} )
+
+        for ( start_symbol, production ), is_added in self.productions.items():
+
+            if is_added:
+                productions.setdefault( start_symbol, {} )[production] = None
+
+            else:
+                productions[start_symbol].pop( production, None )
+
+        for start_symbol, is_added in self.start_symbols.items():
+
+            if not is_added:
+                del productions[start_symbol]
+
+
+class GrammarVersion(object):
+    """
+        An immutable version of a grammar productions, which can be restored later by
+        `ChomskyGrammar.restore()`, see `ChomskyGrammar.snapshot()`.
+
+        Each version only keeps the changes since its parent version, then, creating it does not
+        copy the grammar productions. All versions together make a tree, as a grammar can restore
+        any older version and continue changing from it. The productions of a version are rebuilt
+        by applying the changes of its ancestors, starting from the nearest one saving all the
+        grammar productions, as the first version.
+    """
+
+    def __init__(self, grammar, parent):
+        """
+            Creates a version with the current state of the given `grammar`, taking the changes it
+            recorded since its `parent` version.
+        """
+        ## The version the `changes` are relative to, or None for the first version
+        self.parent = parent
+
+        ## The changes on the grammar productions since the `parent` version
+        self.changes = grammar.history_changes
+        grammar.history_changes = GrammarChanges( grammar.history_policy == HistoryPolicy.NONE )
+
+        ## If the changes required a snapshot, or the grammar history policy is
+        ## `HistoryPolicy.FULL_WITH_SNAPSHOTS`, a dictionary with all the grammar productions for
+        ## each start symbol, otherwise None
+        self.snapshot = None
+
+        if self.changes.is_snapshot_required or grammar.history_policy == HistoryPolicy.FULL_WITH_SNAPSHOTS:
+            productions_keys = grammar.productions
+            self.snapshot = { start_symbol: dict.fromkeys( productions_keys[start_symbol] ) for start_symbol in productions_keys }
+
+        ## The grammar initial symbol
+        self.initial_symbol = grammar.initial_symbol
+
+        ## The grammar optional symbols, which are displayed as `[A]`
+        self.optional_symbols = frozenset( grammar.optional_symbols )
+
+    def productions(self, base_version=None, base_productions=None):
+        """
+            Return a dictionary with a dictionary of productions for each start symbol of this
+            version.
+
+            If `base_version` is an ancestor of this version, its `base_productions` dictionary is
+            changed to this version productions, instead of building them from the nearest
+            ancestor saving all the grammar productions.
+        """
+        versions = []
+        version = self
+
+        while version is not base_version and version.snapshot is None:
+            versions.append( version )
+            version = version.parent
+
+        if base_version is not None and version is base_version:
+            productions = base_productions
+
+        else:
+            productions = { start_symbol: dict( start_productions ) for start_symbol, start_productions in version.snapshot.items() }
+
+        for version in reversed( versions ):
+            version.changes.apply( productions )
+
+        return productions
+
+    def is_current(self, grammar):
+        """
+            Return True when this is the last version of the `grammar`, and it did not change since.
+        """
+        changes = grammar.history_changes
+
+        return grammar.version is self \
+                and not changes.is_snapshot_required \
+                and not len( changes ) \
+                and self.initial_symbol == grammar.initial_symbol \
+                and self.optional_symbols == grammar.optional_symbols
+
+    def diff(self, other_version):
+        """
+            Return a `GrammarChanges` with the start symbols and productions added and removed
+            from this version to the `other_version`.
+        """
+        changes = GrammarChanges( False )
+        productions = self.productions()
+        other_productions = other_version.productions()
+
+        for start_symbol in productions.keys() - other_productions.keys():
+            changes.remove_start_symbol( start_symbol )
+
+        for start_symbol in other_productions.keys() - productions.keys():
+            changes.add_start_symbol( start_symbol )
+
+        for start_symbol, start_productions in productions.items():
+            other_start_productions = other_productions.get( start_symbol, {} )
+
+            for production in start_productions.keys() - other_start_productions.keys():
+                changes.remove_production( start_symbol, production )
+
+        for start_symbol, other_start_productions in other_productions.items():
+            start_productions = productions.get( start_symbol, {} )
+
+            for production in other_start_productions.keys() - start_productions.keys():
+                changes.add_production( start_symbol, production )
+
+        return changes
+
+
 class IntermediateGrammar(object):
     """
         Represents a grammar operation history entry, to be parsed later.
+
+        Instead of the grammar string, each entry only saves the grammar version, see
+        `GrammarVersion`, and the grammar string is only created when the history is displayed, by
+        applying the changes of all the entries, see `HistorySink`.
     """
 
     ## A constant for the beginning of the time
@@ -84,13 +297,17 @@ class IntermediateGrammar(object):
 
     def __init__(self, grammar, name, stage):
         """
-            Creates a full history entry for the current state of the given `grammar`.
+            Creates a history entry for the current version of the given `grammar`.
         """
         ## The precise time when this history entry was created, useful to merge history for different grammars
         self.timestamp = time.time()
 
-        ## The string representation of the grammar saved
-        self.grammar = str( grammar )
+        ## The grammar version saved, which can be restored by `ChomskyGrammar.restore()`
+        self.version = grammar.snapshot()
+
+        ## The string representation of the grammar saved, without expanding its optional symbols,
+        ## only created by `HistorySink.write()`
+        self.grammar = None
 
         ## The name of the operation which originates the current grammar history entry
         self.name = name
@@ -101,37 +318,35 @@ class IntermediateGrammar(object):
         ## Additional information to be displayed
         self.extra_text = []
 
+    def is_unchanged(self, grammar):
+        """
+            Return True when the `grammar` did not change since this history entry was created.
+        """
+        return self.version.is_current( grammar )
+
     def __str__(self):
         """
             Return the full history representation of the saved grammar.
         """
+        return self.to_string( self.extra_text )
 
+    def to_string(self, extra_text):
+        """
+            Return the full history representation of the saved grammar, with the given
+            `extra_text` list instead of this entry one.
+        """
 
-        if self.extra_text:
+        if extra_text:
 
-            if len( self.extra_text ) == 1 \
-                    and self.extra_text[0] == NO_GRAMMAR_CHANGES \
+            if len( extra_text ) == 1 \
+                    and extra_text[0] == NO_GRAMMAR_CHANGES \
                     and self.stage.value != IntermediateGrammar.BEGINNING:
 
                 return wrap_text( """%s%s\n#    %s
-                    """ % ( self.name, self.stage, "\n#    ".join( self.extra_text ) ) )
+                    """ % ( self.name, self.stage, "\n#    ".join( extra_text ) ) )
 
             return wrap_text( """%s%s\n#    %s\n%s
-                """ % ( self.name, self.stage, "\n#    ".join( self.extra_text ), self.grammar ) )
+                """ % ( self.name, self.stage, "\n#    ".join( extra_text ), self.grammar ) )
 
         return wrap_text( """%s%s\n%s
             """ % ( self.name, self.stage, self.grammar ) )
-
-    def __eq__(self, other):
-        """
-            Determines whether this grammar history entry is equal or not to another one given.
-        """
-
-        if isinstance(self, other.__class__):
-
-            if ( self.stage.value == self.MIDDLE or other.stage.value == self.MIDDLE or self.stage == other.stage ) \
-                    and str( self.grammar ) == str( other.grammar ):
-                return True
-
-        return False
-
@@ -0,0 +1,40 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Licensing
+#
+# Chomsky Grammar Language Class
+# Copyright (C) 2018 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+class LanguageClass(object):
+    """
+        The classes of a grammar language size, see `ChomskyGrammar.classify_language()`.
+    """
+
+    ## The language has no sentences
+    EMPTY = "Empty"
+
+    ## The language has a finite set of sentences
+    FINITE = "Finite"
+
+    ## The language has an infinite set of sentences
+    INFINITE = "Infinite"
+
+    ## All the language classes
+    ALL = ( EMPTY, FINITE, INFINITE )
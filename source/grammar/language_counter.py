@@ -0,0 +1,221 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Licensing
+#
+# Chomsky Grammar Language Counter
+# Copyright (C) 2018 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from debug_tools import getLogger
+
+from .symbols import Terminal
+from .production import epsilon_production
+
+log = getLogger( 127, __name__ )
+
+
+class LanguageCounter(object):
+    """
+        Counts the derivations of each sentence length of a grammar on the Chomsky Normal Form,
+        with dynamic programming, i.e., without enumerating any sentence or derivation.
+
+        The derivations of the non terminal `A` with `n` terminals are the sum of its productions
+        `A -> a` when `n == 1`, plus for each production `A -> B C`, the sum of the derivations of
+        `B` with `k` terminals times the derivations of `C` with `n - k` terminals. The counts of
+        each length are computed once and reused by all longer lengths.
+
+        On an unambiguous grammar, each sentence has exactly one derivation, then, the derivations
+        count is also the sentences count. When the Chomsky Normal Form grammar is ambiguous, the
+        derivations count is bigger than the sentences count. But the derivations are the ones of
+        the Chomsky Normal Form grammar, not of the grammar it was converted from, as removing the
+        simple and epsilon productions merges their derivations. For example, `S -> A | B`,
+        `A -> a`, `B -> a` and `S -> A A`, `A -> a | &` are ambiguous, but their Chomsky Normal
+        Form grammars are not.
+    """
+
+    def __init__(self, grammar, modulus=None):
+        """
+            Builds the counter for the given `grammar`, which must be on the Chomsky Normal Form, see
+            `ChomskyGrammar.convert_to_cnf()`.
+
+            If a `modulus` is given, all counts are computed modulo it, which keeps the numbers small
+            when only their remainders are required, instead of using Python big integers.
+        """
+
+        if not grammar.is_cnf():
+            raise RuntimeError( "The grammar must be on the Chomsky Normal Form! See `convert_to_cnf()`.\n%s" % grammar )
+
+        productions_keys = grammar.productions
+
+        ## The list of start symbols Productions, with the grammar initial symbol as first, whose
+        ## index is their non terminal id
+        self.non_terminals = grammar.initial_symbol_as_first()
+
+        ## A dictionary with the non terminal id for each start symbol
+        self.non_terminal_ids = { start_symbol: index for index, start_symbol in enumerate( self.non_terminals ) }
+
+        ## The non terminal id of the grammar initial symbol
+        self.initial_id = self.non_terminal_ids[grammar.initial_symbol]
+
+        ## The modulus of all counts, or None for the exact counts
+        self.modulus = modulus
+
+        ## The set of the terminal strings of the grammar
+        self.terminals = set()
+
+        ## The list of binary productions `A -> B C` as tuples of non terminal ids (A, B, C)
+        self.binary_rules = []
+
+        ## For each non terminal id, a sorted list with the terminal strings of its productions `A -> a`
+        self.terminal_rules = [[] for _ in self.non_terminals]
+
+        ## For each non terminal id, a list with its derivations count for each length
+        self.counts = [[0, 0] for _ in self.non_terminals]
+
+        for start_symbol in productions_keys:
+            start_id = self.non_terminal_ids[start_symbol]
+
+            for production in productions_keys[start_symbol]:
+
+                if len( production ) == 2:
+                    self.binary_rules.append( ( start_id, self.non_terminal_ids[production[0]], self.non_terminal_ids[production[1]] ) )
+
+                elif type( production[0] ) is Terminal and len( production[0] ):
+                    self.terminals.add( str( production[0] ) )
+                    self.terminal_rules[start_id].append( str( production[0] ) )
+                    self.counts[start_id][1] += 1
+
+        for terminal_rules in self.terminal_rules:
+            terminal_rules.sort()
+
+        self.binary_rules.sort()
+
+        if grammar.has_production( grammar.initial_symbol, epsilon_production ):
+            self.counts[self.initial_id][0] = 1
+
+        if modulus:
+
+            for counts in self.counts:
+                counts[1] %= modulus
+
+    def _extend(self, max_length):
+        """
+            Computes the derivations counts of all non terminal's up to `max_length` terminals.
+        """
+        counts = self.counts
+        modulus = self.modulus
+        binary_rules = self.binary_rules
+
+        for length in range( len( counts[0] ), max_length + 1 ):
+            new_counts = [0] * len( counts )
+
+            for start_id, left_id, right_id in binary_rules:
+                left_counts = counts[left_id]
+                right_counts = counts[right_id]
+                total = 0
+
+                for left_length in range( 1, length ):
+                    left_count = left_counts[left_length]
+
+                    if left_count:
+                        total += left_count * right_counts[length - left_length]
+
+                new_counts[start_id] += total
+
+            for non_terminal_id, non_terminal_counts in enumerate( counts ):
+                non_terminal_counts.append( new_counts[non_terminal_id] % modulus if modulus else new_counts[non_terminal_id] )
+
+    def derivations(self, length, start_symbol=None):
+        """
+            Return how many derivations the `start_symbol` has with `length` terminals. If the
+            `start_symbol` is None, the grammar initial symbol is used.
+        """
+        self._extend( length )
+        non_terminal_id = self.initial_id if start_symbol is None else self.non_terminal_ids[start_symbol]
+        return self.counts[non_terminal_id][length]
+
+    def derivations_by_length(self, max_length):
+        """
+            Return a list with how many derivations the grammar initial symbol has for each length
+            from 0 up to `max_length`, i.e., the grammar language growth curve.
+        """
+        self._extend( max_length )
+        return self.counts[self.initial_id][:max_length + 1]
+
+    def longest_length(self):
+        """
+            Return the length of the longest sentence of a finite language, or None if the language
+            is infinite. On the Chomsky Normal Form, all symbols are useful, then, the language is
+            infinite when some non terminal derives itself.
+        """
+        longest = [1 if counts[1] else 0 for counts in self.counts]
+
+        for _ in range( len( self.non_terminals ) + 1 ):
+            is_changed = False
+
+            for start_id, left_id, right_id in self.binary_rules:
+                length = longest[left_id] + longest[right_id]
+
+                if length > longest[start_id]:
+                    longest[start_id] = length
+                    is_changed = True
+
+            if not is_changed:
+                return longest[self.initial_id]
+
+        return None
+
+    def language_size(self):
+        """
+            Return how many derivations a finite language has in total, which is its sentences count
+            when the grammar is unambiguous, or None if the language is infinite.
+        """
+        longest_length = self.longest_length()
+
+        if longest_length is None:
+            return None
+
+        total = sum( self.derivations_by_length( longest_length ) )
+        return total % self.modulus if self.modulus else total
+
+    def ambiguous_length(self, max_length, sentences_counts=None):
+        """
+            Return the first length up to `max_length` whose derivations count exceeds its sentences
+            count, proving the Chomsky Normal Form grammar is ambiguous, therefore, also the grammar
+            it was converted from, or None if no such length was found. None does not prove the
+            original grammar is unambiguous, as its simple and epsilon productions ambiguity is
+            not counted, see `LanguageCounter`.
+
+            If `sentences_counts` is None, the count of all possible strings with the grammar
+            terminals is used as the sentences count of each length, which is a cheap signal, but it
+            only catches the grammars with lots of derivations. Otherwise, it must be a list with the
+            actual sentences count of each length, as counted by `SentencesEnumerator.sentences()`.
+        """
+
+        if self.modulus:
+            raise RuntimeError( "The ambiguity signal requires the exact counts, without a modulus." )
+
+        terminals_count = len( self.terminals )
+
+        for length, derivations in enumerate( self.derivations_by_length( max_length ) ):
+            sentences_count = terminals_count ** length if sentences_counts is None else sentences_counts[length]
+
+            if derivations > sentences_count:
+                return length
+
+        return None
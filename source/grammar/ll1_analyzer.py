@@ -0,0 +1,320 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Licensing
+#
+# Chomsky Grammar LL(1) Analyzer
+# Copyright (C) 2018 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from debug_tools import getLogger
+from debug_tools.utilities import sort_alphabetically_and_by_length
+
+from .symbols import Terminal
+from .symbols import NonTerminal
+from .production import end_of_string_terminal
+
+log = getLogger( 127, __name__ )
+
+
+class LL1Conflict(object):
+    """
+        A LL(1) conflict, i.e., more than one alternative of the `non_terminal` can be chosen when
+        the next input symbol is the `terminal`.
+    """
+
+    ## Two alternatives can start with the same terminal
+    FIRST_FIRST = "FIRST/FIRST"
+
+    ## One alternative can start with the terminal, while another one can derive epsilon and the
+    ## terminal can follow the non terminal
+    FIRST_FOLLOW = "FIRST/FOLLOW"
+
+    def __init__(self, non_terminal, terminal, alternatives, kind):
+        ## The start symbol Production of the non terminal with the conflicting alternatives
+        self.non_terminal = non_terminal
+
+        ## The lookahead Terminal which selects more than one alternative
+        self.terminal = terminal
+
+        ## The list of conflicting alternatives Productions
+        self.alternatives = alternatives
+
+        ## Either `FIRST_FIRST` or `FIRST_FOLLOW`
+        self.kind = kind
+
+    def __str__(self):
+        return "%s conflict on %s with `%s`: %s -> %s" % ( self.kind, self.non_terminal, self.terminal,
+                self.non_terminal, " | ".join( str( alternative ) for alternative in self.alternatives ) )
+
+
+class LL1Analyzer(object):
+    """
+        Computes the FIRST, FOLLOW and FIRST+ sets of a ChomskyGrammar using integer bitsets indexed
+        by the terminal's ids, and reports all its LL(1) conflicts.
+
+        The FIRST+ set of an alternative `A -> α` is FIRST(α) when α cannot derive epsilon,
+        otherwise it is FIRST(α) plus FOLLOW(A). The grammar is LL(1) when the FIRST+ sets of the
+        alternatives of each non terminal are disjoint.
+    """
+
+    def __init__(self, grammar):
+        """
+            Analyzes the given `grammar`. If it is on its compact epsilon free form, its optional
+            symbols are expanded first.
+        """
+        grammar.expand_optional_symbols()
+        productions_keys = grammar.productions
+
+        ## The grammar initial symbol
+        self.initial_symbol = grammar.initial_symbol
+
+        ## The list of start symbols Productions, with the grammar initial symbol as first, whose
+        ## index is their non terminal id
+        self.non_terminals = [start_symbol for start_symbol in grammar.initial_symbol_as_first() if start_symbol in productions_keys]
+
+        ## A dictionary with the non terminal id for each start symbol
+        self.non_terminal_ids = { start_symbol: index for index, start_symbol in enumerate( self.non_terminals ) }
+
+        ## The list of Terminal's, with the end of string terminal as last, whose index is their terminal id
+        self.terminals = self._collect_terminals( grammar )
+
+        ## A dictionary with the terminal id for each Terminal
+        self.terminal_ids = { terminal: index for index, terminal in enumerate( self.terminals ) }
+
+        ## The terminal id of the end of string terminal `$`
+        self.end_of_string_id = len( self.terminals ) - 1
+
+        ## For each non terminal id, a list of its alternatives Productions
+        self.alternatives = []
+
+        ## For each non terminal id, a list of its alternatives encoded as tuples of integers, where
+        ## terminals are their terminal id and non terminals are `-1 - non_terminal_id`
+        self.encoded_alternatives = []
+
+        for start_symbol in self.non_terminals:
+            alternatives = sort_alphabetically_and_by_length( productions_keys[start_symbol] )
+
+            self.alternatives.append( alternatives )
+            self.encoded_alternatives.append( [self._encode( production ) for production in alternatives] )
+
+        ## For each non terminal id, the bitset of the terminals which can start it
+        self.first = [0] * len( self.non_terminals )
+
+        ## For each non terminal id, whether it can derive epsilon
+        self.nullable = [False] * len( self.non_terminals )
+
+        ## For each non terminal id, the bitset of the terminals which can follow it
+        self.follow = [0] * len( self.non_terminals )
+
+        ## For each non terminal id, a list with the FIRST+ bitset of each of its alternatives
+        self.first_plus = []
+
+        ## All LL(1) conflicts found, sorted by non terminal and terminal
+        self.conflicts = []
+
+        self._calculate_first()
+        self._calculate_follow()
+        self._calculate_conflicts()
+
+    def _collect_terminals(self, grammar):
+        terminals = set()
+        productions_keys = grammar.productions
+
+        for start_symbol in productions_keys:
+
+            for production in productions_keys[start_symbol]:
+
+                for symbol in production:
+
+                    if type( symbol ) is Terminal and len( symbol ):
+                        terminals.add( symbol )
+
+        terminals = sort_alphabetically_and_by_length( terminals )
+        terminals.append( end_of_string_terminal )
+        return terminals
+
+    def _encode(self, production):
+        encoded = []
+        terminal_ids = self.terminal_ids
+        non_terminal_ids = self.non_terminal_ids
+
+        for symbol in production:
+
+            if type( symbol ) is NonTerminal:
+                encoded.append( -1 - non_terminal_ids[symbol] )
+
+            # The epsilon terminal `&` has no symbols
+            elif len( symbol ):
+                encoded.append( terminal_ids[symbol] )
+
+        return tuple( encoded )
+
+    def sequence_first(self, encoded_symbols):
+        """
+            Return a tuple (bitset, nullable) with FIRST of the `encoded_symbols` and whether they
+            can all derive epsilon.
+        """
+        bits = 0
+        first = self.first
+        nullable = self.nullable
+
+        for code in encoded_symbols:
+
+            if code >= 0:
+                return bits | ( 1 << code ), False
+
+            non_terminal_id = -1 - code
+            bits |= first[non_terminal_id]
+
+            if not nullable[non_terminal_id]:
+                return bits, False
+
+        return bits, True
+
+    def _calculate_first(self):
+        first = self.first
+        nullable = self.nullable
+        encoded_alternatives = self.encoded_alternatives
+        is_changed = True
+
+        while is_changed:
+            is_changed = False
+
+            for non_terminal_id, alternatives in enumerate( encoded_alternatives ):
+
+                for encoded in alternatives:
+                    bits, is_nullable = self.sequence_first( encoded )
+                    new_bits = first[non_terminal_id] | bits
+
+                    if new_bits != first[non_terminal_id]:
+                        first[non_terminal_id] = new_bits
+                        is_changed = True
+
+                    if is_nullable and not nullable[non_terminal_id]:
+                        nullable[non_terminal_id] = True
+                        is_changed = True
+
+    def _calculate_follow(self):
+        first = self.first
+        follow = self.follow
+        nullable = self.nullable
+        encoded_alternatives = self.encoded_alternatives
+        is_changed = True
+
+        # First put $ (the end of input marker) in Follow(S) (S is the start symbol)
+        if self.initial_symbol in self.non_terminal_ids:
+            follow[self.non_terminal_ids[self.initial_symbol]] = 1 << self.end_of_string_id
+
+        while is_changed:
+            is_changed = False
+
+            for non_terminal_id, alternatives in enumerate( encoded_alternatives ):
+
+                for encoded in alternatives:
+                    trailer = follow[non_terminal_id]
+
+                    # Walk the alternative backwards, keeping what can follow the current symbol
+                    for code in reversed( encoded ):
+
+                        if code >= 0:
+                            trailer = 1 << code
+                            continue
+
+                        symbol_id = -1 - code
+                        new_bits = follow[symbol_id] | trailer
+
+                        if new_bits != follow[symbol_id]:
+                            follow[symbol_id] = new_bits
+                            is_changed = True
+
+                        if nullable[symbol_id]:
+                            trailer |= first[symbol_id]
+
+                        else:
+                            trailer = first[symbol_id]
+
+    def _calculate_conflicts(self):
+        follow = self.follow
+
+        for non_terminal_id, alternatives in enumerate( self.encoded_alternatives ):
+            seen = 0
+            conflicting = 0
+            first_bits = []
+            first_plus = []
+
+            for encoded in alternatives:
+                bits, is_nullable = self.sequence_first( encoded )
+                first_bits.append( bits )
+
+                if is_nullable:
+                    bits |= follow[non_terminal_id]
+
+                first_plus.append( bits )
+                conflicting |= seen & bits
+                seen |= bits
+
+            self.first_plus.append( first_plus )
+
+            for terminal_id in self.bitset_ids( conflicting ):
+                terminal_bit = 1 << terminal_id
+                indexes = [index for index, bits in enumerate( first_plus ) if bits & terminal_bit]
+                first_count = sum( 1 for index in indexes if first_bits[index] & terminal_bit )
+
+                self.conflicts.append( LL1Conflict(
+                        self.non_terminals[non_terminal_id],
+                        self.terminals[terminal_id],
+                        [self.alternatives[non_terminal_id][index] for index in indexes],
+                        LL1Conflict.FIRST_FIRST if first_count > 1 else LL1Conflict.FIRST_FOLLOW ) )
+
+    @staticmethod
+    def bitset_ids(bits):
+        """
+            Return a list with the ids of the bits set on the `bits` integer.
+        """
+        ids = []
+
+        while bits:
+            lowest_bit = bits & -bits
+            ids.append( lowest_bit.bit_length() - 1 )
+            bits ^= lowest_bit
+
+        return ids
+
+    def bitset_terminals(self, bits):
+        """
+            Return a set with the Terminal's of the given `bits` integer.
+        """
+        return { self.terminals[terminal_id] for terminal_id in self.bitset_ids( bits ) }
+
+    def is_ll1(self):
+        """
+            Return True when this grammar has no LL(1) conflicts.
+        """
+        return not self.conflicts
+
+    def has_first_first_conflicts(self):
+        """
+            Return True when two alternatives of some non terminal can start with the same terminal.
+        """
+
+        for conflict in self.conflicts:
+
+            if conflict.kind == LL1Conflict.FIRST_FIRST:
+                return True
+
+        return False
@@ -0,0 +1,174 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Licensing
+#
+# Chomsky Grammar LL(1) Parsing Table
+# Copyright (C) 2018 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import array
+
+from debug_tools import getLogger
+
+from .symbols import split_sentence
+
+log = getLogger( 127, __name__ )
+
+
+class LL1Table(object):
+    """
+        The LL(1) predictive parsing table of a grammar, stored as a dense array indexed by
+        `non_terminal_id * terminals_count + terminal_id`, where each cell holds the rule id to
+        expand or -1 for a syntax error.
+
+        The table is built from a LL1Analyzer and it is immutable, therefore, it can be reused to
+        recognize as many sentences as required.
+    """
+
+    def __init__(self, ll1_analyzer):
+        """
+            Builds the table from the given `ll1_analyzer` FIRST+ sets. If the grammar has LL(1)
+            conflicts, a RuntimeError is raised, as there would be more than one rule per cell.
+        """
+
+        if ll1_analyzer.conflicts:
+            raise RuntimeError( "The grammar is not LL(1), it has the following conflict(s):\n%s" % (
+                    "\n".join( str( conflict ) for conflict in ll1_analyzer.conflicts ) ) )
+
+        terminals_count = len( ll1_analyzer.terminals )
+
+        ## The list of Terminal's, whose index is their terminal id
+        self.terminals = ll1_analyzer.terminals
+
+        ## The list of start symbols Productions, whose index is their non terminal id
+        self.non_terminals = ll1_analyzer.non_terminals
+
+        ## The count of table columns
+        self.terminals_count = terminals_count
+
+        ## The terminal id of the end of string terminal `$`
+        self.end_of_string_id = ll1_analyzer.end_of_string_id
+
+        ## A dictionary with the terminal id for each terminal string, used to convert the input
+        ## tokens. The end of string terminal is not a valid input token.
+        self.token_ids = { str( terminal ): terminal_id for terminal_id, terminal in enumerate( ll1_analyzer.terminals )
+                if terminal_id != self.end_of_string_id }
+
+        ## The list of rules as tuples (start symbol, production), whose index is their rule id
+        self.rules = []
+
+        ## For each rule id, the rule symbols on reverse order, ready to be pushed on the parser stack.
+        ## Terminals are their terminal id and non terminals are `-1 - table row offset`
+        self.stack_codes = []
+
+        ## The dense parsing table with the rule id for each non terminal and lookahead terminal
+        self.table = array.array( 'i', [-1] * ( len( ll1_analyzer.non_terminals ) * terminals_count ) )
+
+        for non_terminal_id, start_symbol in enumerate( ll1_analyzer.non_terminals ):
+            row_offset = non_terminal_id * terminals_count
+
+            for index, production in enumerate( ll1_analyzer.alternatives[non_terminal_id] ):
+                rule_id = len( self.rules )
+                encoded = ll1_analyzer.encoded_alternatives[non_terminal_id][index]
+
+                self.rules.append( ( start_symbol, production ) )
+                self.stack_codes.append( tuple( code if code >= 0 else -1 - ( -1 - code ) * terminals_count
+                        for code in reversed( encoded ) ) )
+
+                for terminal_id in ll1_analyzer.bitset_ids( ll1_analyzer.first_plus[non_terminal_id][index] ):
+                    self.table[row_offset + terminal_id] = rule_id
+
+        ## The stack code of the grammar initial symbol, or None if it has no productions
+        self.initial_code = None
+
+        if ll1_analyzer.initial_symbol in ll1_analyzer.non_terminal_ids:
+            self.initial_code = -1 - ll1_analyzer.non_terminal_ids[ll1_analyzer.initial_symbol] * terminals_count
+
+    def __str__(self):
+        """
+            Return the table cells as lines formatted as `S, a: S -> a S b`.
+        """
+        lines = []
+        table = self.table
+        terminals_count = self.terminals_count
+
+        for non_terminal_id, start_symbol in enumerate( self.non_terminals ):
+
+            for terminal_id, terminal in enumerate( self.terminals ):
+                rule_id = table[non_terminal_id * terminals_count + terminal_id]
+
+                if rule_id > -1:
+                    lines.append( "%s, %s: %s -> %s" % ( start_symbol, terminal, start_symbol, self.rules[rule_id][1] ) )
+
+        return "\n".join( lines )
+
+    def tokenize(self, sentence):
+        """
+            Return a list with the terminal ids of the given `sentence`, see `split_sentence()`. The
+            end of string terminal id is appended to the end. Unknown terminals get the id -1.
+        """
+
+        token_ids = self.token_ids
+        token_codes = [token_ids.get( token, -1 ) for token in split_sentence( sentence )]
+
+        token_codes.append( self.end_of_string_id )
+        return token_codes
+
+    def recognize(self, sentence):
+        """
+            Return True when the given `sentence` belongs to the grammar language. See `tokenize()`
+            for the accepted `sentence` formats.
+
+            It is an iterative predictive parser with an explicit stack, i.e., it takes linear time
+            on the sentence length and does not use recursion.
+        """
+        token_codes = self.tokenize( sentence )
+
+        if self.initial_code is None or -1 in token_codes:
+            return False
+
+        table = self.table
+        stack_codes = self.stack_codes
+
+        position = 0
+        lookahead = token_codes[0]
+
+        stack = [self.initial_code]
+        stack_pop = stack.pop
+        stack_extend = stack.extend
+
+        while stack:
+            code = stack_pop()
+
+            if code >= 0:
+
+                if code != lookahead:
+                    return False
+
+                position += 1
+                lookahead = token_codes[position]
+
+            else:
+                rule_id = table[-1 - code + lookahead]
+
+                if rule_id < 0:
+                    return False
+
+                stack_extend( stack_codes[rule_id] )
+
+        return lookahead == self.end_of_string_id
@@ -169,15 +169,22 @@ class Production(LockableType):
         non_terminals = self.non_terminals( position=True )
         non_terminals_count = len( non_terminals )
 
-        for permutation_size in range( 0, non_terminals_count ):
-            n_items_permutation = list( itertools.permutations( non_terminals, permutation_size ) )
-            # log( 1, "permutation_size: %s, n_items_permutation: %s", permutation_size, n_items_permutation )
+        # Only the non terminal's deriving epsilon can be removed, then, only their subsets need to
+        # be kept, instead of all the permutations of all non terminal's
+        optional_non_terminals = [non_terminal for non_terminal in non_terminals if non_terminal[0] in non_terminal_epsilon]
+        optional_count = len( optional_non_terminals )
 
-            for permutation in n_items_permutation:
+        for combination_size in range( 0, optional_count + 1 ):
+
+            # Keeping all non terminal's is the production itself, which is not a combination
+            if combination_size == non_terminals_count:
+                break
+
+            for combination in itertools.combinations( optional_non_terminals, combination_size ):
                 new_production = self.new()
 
                 try:
-                    new_production.filter_non_terminals( non_terminal_epsilon, permutation )
+                    new_production.filter_non_terminals( non_terminal_epsilon, combination )
 
                 except RuntimeError as error:
 
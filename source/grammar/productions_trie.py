@@ -0,0 +1,129 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Licensing
+#
+# Chomsky Grammar Productions Trie
+# Copyright (C) 2018 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from debug_tools import getLogger
+
+from .production import Production
+
+log = getLogger( 127, __name__ )
+
+
+class ProductionsTrieNode(object):
+    """
+        A node of the `ProductionsTrie`, representing all productions which start with the symbols
+        on the path from the trie root until this node.
+    """
+    __slots__ = ( 'count', 'ends', 'children' )
+
+    def __init__(self):
+        ## How many productions pass through this node
+        self.count = 0
+
+        ## How many productions end on this node
+        self.ends = 0
+
+        ## A dictionary with the next symbol of the productions and their respective nodes
+        self.children = {}
+
+
+class ProductionsTrie(object):
+    """
+        A prefix tree with the productions of one non terminal, keyed by their symbols.
+
+        It allows to find the biggest common factor of all productions which start with a given
+        symbol by walking down the trie once, instead of comparing each production against all
+        others, i.e., the work is linear on the total productions length.
+
+        The epsilon production has no first symbol, therefore, it is not added to the trie.
+    """
+
+    def __init__(self, productions):
+        """
+            Insert all the given `productions` on this trie, keeping their iteration order.
+        """
+        ## The root node of this trie, which children are indexed by the productions first symbol
+        self.root = ProductionsTrieNode()
+
+        ## A dictionary with the productions grouped by their first symbol, on their insertion order
+        self.groups = {}
+
+        for production in productions:
+            self.insert( production )
+
+    def insert(self, production):
+        """
+            Insert the given `production` on this trie.
+        """
+        first_symbol = production[0]
+
+        if not len( first_symbol ):
+            return
+
+        node = self.root
+        groups = self.groups
+
+        for symbol in production:
+            children = node.children
+
+            if symbol in children:
+                node = children[symbol]
+
+            else:
+                node = children[symbol] = ProductionsTrieNode()
+
+            node.count += 1
+
+        node.ends += 1
+
+        if first_symbol not in groups: groups[first_symbol] = []
+        groups[first_symbol].append( production )
+
+    def group(self, first_symbol):
+        """
+            Return a list with all productions starting with the given `first_symbol`.
+        """
+        return self.groups.get( first_symbol, [] )
+
+    def biggest_common_factor(self, first_symbol):
+        """
+            Return a Production with the biggest common prefix of all productions starting with the
+            given `first_symbol`, or just the `first_symbol` when there is only one production
+            starting with it.
+        """
+        node = self.root.children[first_symbol]
+        common_factor = [first_symbol]
+
+        if node.count > 1:
+
+            # A production ending here or the productions branching stops the common prefix
+            while not node.ends and len( node.children ) == 1:
+                symbol, node = next( iter( node.children.items() ) )
+                common_factor.append( symbol )
+
+        return Production( [symbol.new() for symbol in common_factor], lock=True )
+
+    def biggest_common_factors(self):
+        """
+            Return a dictionary with the biggest common factor for each productions first symbol.
+        """
+        return { first_symbol: self.biggest_common_factor( first_symbol ) for first_symbol in self.groups }
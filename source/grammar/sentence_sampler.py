@@ -0,0 +1,216 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Licensing
+#
+# Chomsky Grammar Sentence Sampler
+# Copyright (C) 2018 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import random
+import bisect
+import multiprocessing
+
+from debug_tools import getLogger
+
+log = getLogger( 127, __name__ )
+
+
+class SentenceSampler(object):
+    """
+        Draws random sentences with an exact length, uniformly among all the derivations with that
+        length, using the derivations counts of a LanguageCounter.
+
+        Each sample descends from the initial symbol: for the non terminal `A` with `n` terminals,
+        its production `A -> a` or its production `A -> B C` with `k` terminals on `B` is chosen
+        with probability proportional to how many derivations it has, then, the same is done for
+        `B` with `k` terminals and `C` with `n - k` terminals. The cumulative counts of each non
+        terminal and length are computed once and cached, then, each choice is a binary search.
+
+        On an unambiguous grammar, each sentence has exactly one derivation, therefore, the samples
+        are uniformly distributed among the sentences, and not biased toward short recursions.
+    """
+
+    def __init__(self, language_counter, seed=None):
+        """
+            Creates a sampler for the grammar of the given `language_counter`, whose counts must be
+            exact, i.e., without a modulus.
+
+            The `seed` is used to create the random numbers generator, then, the same seed draws the
+            same samples.
+        """
+
+        if language_counter.modulus:
+            raise RuntimeError( "The sentence sampler requires the exact counts, without a modulus." )
+
+        ## The LanguageCounter with the derivations counts of the grammar, which is not sent to
+        ## the worker processes, see `__getstate__()`
+        self.language_counter = language_counter
+
+        ## For each non terminal id, a list with its derivations count for each length
+        self.counts = language_counter.counts
+
+        ## The non terminal id of the grammar initial symbol
+        self.initial_id = language_counter.initial_id
+
+        ## For each non terminal id, a sorted list with the terminal strings of its productions `A -> a`
+        self.terminal_rules = language_counter.terminal_rules
+
+        ## For each non terminal id, a list with the non terminal ids (B, C) of its productions `A -> B C`
+        self.binary_rules = [[] for _ in self.counts]
+
+        for start_id, left_id, right_id in language_counter.binary_rules:
+            self.binary_rules[start_id].append( ( left_id, right_id ) )
+
+        ## A dictionary with a tuple of (cumulative counts, choices) for each non terminal id and length
+        self.choices = {}
+
+        ## The random numbers generator used by `sample()`
+        self.random = random.Random( seed )
+
+    def __getstate__(self):
+        """
+            Only send the counts already computed to the worker processes, as the grammar symbols on
+            the LanguageCounter cannot be pickled.
+        """
+        state = self.__dict__.copy()
+        state['language_counter'] = None
+        state['choices'] = {}
+        return state
+
+    def _choices(self, non_terminal_id, length):
+        """
+            Return the cumulative counts and the choices of the `non_terminal_id` with `length`
+            terminals, where each choice is a terminal string or a tuple (B, C, k).
+        """
+        key = ( non_terminal_id, length )
+
+        if key in self.choices:
+            return self.choices[key]
+
+        counts = self.counts
+        cumulative_counts = []
+        choices = []
+        total = 0
+
+        if length == 1:
+
+            for terminal in self.terminal_rules[non_terminal_id]:
+                total += 1
+                cumulative_counts.append( total )
+                choices.append( terminal )
+
+        else:
+
+            for left_id, right_id in self.binary_rules[non_terminal_id]:
+                left_counts = counts[left_id]
+                right_counts = counts[right_id]
+
+                for left_length in range( 1, length ):
+                    count = left_counts[left_length] * right_counts[length - left_length]
+
+                    if count:
+                        total += count
+                        cumulative_counts.append( total )
+                        choices.append( ( left_id, right_id, left_length ) )
+
+        self.choices[key] = cumulative_counts, choices
+        return cumulative_counts, choices
+
+    def sample(self, length):
+        """
+            Return a random sentence with `length` terminals separated by spaces, where the empty
+            sentence is `&`. If the grammar has no sentence with this length, a RuntimeError is raised.
+        """
+
+        if self.language_counter:
+            self.language_counter.derivations( length )
+
+        if length >= len( self.counts[self.initial_id] ) or not self.counts[self.initial_id][length]:
+            raise RuntimeError( "The grammar has no sentences with %s terminals!" % length )
+
+        if length == 0:
+            return "&"
+
+        randrange = self.random.randrange
+        terminals = []
+        pending = [( self.initial_id, length )]
+
+        # Expand the leftmost pending non terminal first, then, the terminals are found on order
+        while pending:
+            non_terminal_id, symbol_length = pending.pop()
+            cumulative_counts, choices = self._choices( non_terminal_id, symbol_length )
+            choice = choices[bisect.bisect_right( cumulative_counts, randrange( cumulative_counts[-1] ) )]
+
+            if symbol_length == 1:
+                terminals.append( choice )
+
+            else:
+                left_id, right_id, left_length = choice
+                pending.append( ( right_id, symbol_length - left_length ) )
+                pending.append( ( left_id, left_length ) )
+
+        return " ".join( terminals )
+
+    def samples(self, length, count, processes=1):
+        """
+            Generates `count` random sentences with `length` terminals, see `sample()`.
+
+            If `processes` is bigger than 1, the samples are drawn in parallel by that many worker
+            processes, each one with its own seed drawn from this sampler random numbers generator,
+            then, the samples are still the same for the same seed and number of processes.
+        """
+
+        if self.language_counter:
+            self.language_counter.derivations( length )
+
+        if processes <= 1 or count < 2 * processes:
+
+            for _ in range( count ):
+                yield self.sample( length )
+
+            return
+
+        chunks_count = processes * 4
+        chunks = [( length, count // chunks_count + ( 1 if index < count % chunks_count else 0 ), self.random.getrandbits( 64 ) )
+                for index in range( chunks_count )]
+
+        with multiprocessing.Pool( processes, _initialize_worker, ( self, ) ) as pool:
+
+            for chunk_samples in pool.imap( _sample_chunk, chunks ):
+                yield from chunk_samples
+
+
+## The SentenceSampler received by this worker process
+_worker_sampler = None
+
+
+def _initialize_worker(sampler):
+    """
+        Saves the sampler sent to this worker process by `SentenceSampler.samples()`.
+    """
+    global _worker_sampler
+    _worker_sampler = sampler
+
+
+def _sample_chunk(chunk):
+    """
+        Return a list with the samples of the given `chunk`, a tuple (length, count, seed).
+    """
+    length, count, seed = chunk
+    _worker_sampler.random.seed( seed )
+    return [_worker_sampler.sample( length ) for _ in range( count )]
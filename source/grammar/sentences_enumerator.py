@@ -0,0 +1,363 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Licensing
+#
+# Chomsky Grammar Sentences Enumerator
+# Copyright (C) 2018 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from debug_tools import getLogger
+from debug_tools.utilities import sort_alphabetically_and_by_length
+
+from .symbols import Terminal
+
+log = getLogger( 127, __name__ )
+
+
+class SentencesEnumerator(object):
+    """
+        Enumerates the sentences of a grammar on order of length.
+
+        Before enumerating, the lengths each non terminal can derive are computed as integer
+        bitsets, whose lowest bit is the non terminal minimum length. They are used to only split
+        the sentence length between the productions symbols in ways that can derive something,
+        therefore, no derivation is started without producing a sentence.
+
+        Any context free grammar can be enumerated, including the ones with cycles as `A -> B`,
+        `B -> A` and epsilon productions, as each length is done after no more sentences are found.
+    """
+
+    def __init__(self, grammar):
+        """
+            Encodes the given `grammar` productions as integers. If it is on its compact epsilon
+            free form, its optional symbols are expanded first.
+        """
+        grammar.expand_optional_symbols()
+        productions_keys = grammar.productions
+
+        ## The grammar `CancellationToken`, checked on each pass over the non terminal's, or None
+        self.cancellation_token = grammar.cancellation_token
+
+        ## The list of start symbols Productions, with the grammar initial symbol as first, whose
+        ## index is their non terminal id
+        self.non_terminals = [start_symbol for start_symbol in grammar.initial_symbol_as_first() if start_symbol in productions_keys]
+
+        ## A dictionary with the non terminal id for each start symbol
+        self.non_terminal_ids = { start_symbol: index for index, start_symbol in enumerate( self.non_terminals ) }
+
+        ## The non terminal id of the grammar initial symbol, or None if it has no productions
+        self.initial_id = self.non_terminal_ids.get( grammar.initial_symbol )
+
+        ## The list of terminal strings sorted alphabetically, whose index is their terminal id,
+        ## then, the sentences with the same length are generated on alphabetical order
+        self.terminals = sorted( { str( symbol ) for start_symbol in self.non_terminals
+                for production in productions_keys[start_symbol] for symbol in production if type( symbol ) is Terminal and len( symbol ) } )
+
+        ## For each non terminal id, a list with its productions encoded as tuples of integers, where
+        ## terminals are their terminal id and non terminals are `-1 - non_terminal_id`
+        self.rules = []
+
+        terminal_ids = { terminal: index for index, terminal in enumerate( self.terminals ) }
+
+        for start_symbol in self.non_terminals:
+            rules = []
+
+            for production in sort_alphabetically_and_by_length( productions_keys[start_symbol] ):
+                codes = []
+
+                for symbol in production:
+
+                    if not len( symbol ):
+                        continue
+
+                    if type( symbol ) is Terminal:
+                        codes.append( terminal_ids[str( symbol )] )
+
+                    elif symbol in self.non_terminal_ids:
+                        codes.append( -1 - self.non_terminal_ids[symbol] )
+
+                    else:
+                        codes = None
+                        break
+
+                if codes is not None:
+                    rules.append( tuple( codes ) )
+
+            self.rules.append( rules )
+
+    def _check_cancelled(self):
+        """
+            Raises `Cancelled` if the grammar `cancellation_token` was cancelled.
+        """
+
+        if self.cancellation_token is not None:
+            self.cancellation_token.check()
+
+    def fertile_non_terminals(self):
+        """
+            Return the set of the non terminal's ids which derive some sentence.
+        """
+        fertile = set()
+        is_changed = True
+
+        while is_changed:
+            is_changed = False
+            self._check_cancelled()
+
+            for non_terminal_id, rules in enumerate( self.rules ):
+
+                if non_terminal_id not in fertile and any( all( code >= 0 or -1 - code in fertile for code in rule ) for rule in rules ):
+                    fertile.add( non_terminal_id )
+                    is_changed = True
+
+        return fertile
+
+    def reachable_non_terminals(self):
+        """
+            Return the list of the non terminal's ids reachable from the initial symbol, only
+            following the productions whose non terminal's are all fertile, i.e., the ones used by
+            some derivation of a sentence.
+        """
+        fertile = self.fertile_non_terminals()
+
+        if self.initial_id not in fertile:
+            return []
+
+        reachable = [self.initial_id]
+        reachable_set = { self.initial_id }
+
+        for non_terminal_id in reachable:
+
+            for rule in self.rules[non_terminal_id]:
+
+                if any( code < 0 and -1 - code not in fertile for code in rule ):
+                    continue
+
+                for code in rule:
+
+                    if code < 0 and -1 - code not in reachable_set:
+                        reachable_set.add( -1 - code )
+                        reachable.append( -1 - code )
+
+        return reachable
+
+    def longest_length(self):
+        """
+            Return the length of the longest sentence of a finite language, or None if the language
+            is infinite, i.e., some reachable non terminal can derive arbitrarily long sentences.
+        """
+        reachable = self.reachable_non_terminals()
+        longest = [-1] * len( self.non_terminals )
+
+        # On a finite language, the longest derivation trees have no non terminal repeated on their
+        # paths, then, the longest lengths stop changing after one pass per non terminal
+        for _ in range( len( reachable ) + 1 ):
+            is_changed = False
+
+            for non_terminal_id in reachable:
+
+                for rule in self.rules[non_terminal_id]:
+                    length = 0
+
+                    for code in rule:
+
+                        if code >= 0:
+                            length += 1
+
+                        elif longest[-1 - code] < 0:
+                            break
+
+                        else:
+                            length += longest[-1 - code]
+
+                    else:
+
+                        if length > longest[non_terminal_id]:
+                            longest[non_terminal_id] = length
+                            is_changed = True
+
+            if not is_changed:
+
+                if self.initial_id is None or longest[self.initial_id] < 0:
+                    return 0
+
+                return longest[self.initial_id]
+
+        return None
+
+    def derivable_lengths(self, max_length):
+        """
+            Return for each non terminal id, an integer bitset with the lengths up to `max_length`
+            of the sentences it can derive.
+        """
+        lengths_mask = ( 1 << ( max_length + 1 ) ) - 1
+        lengths = [0] * len( self.non_terminals )
+
+        is_changed = True
+
+        while is_changed:
+            is_changed = False
+            self._check_cancelled()
+
+            for non_terminal_id, rules in enumerate( self.rules ):
+                non_terminal_lengths = lengths[non_terminal_id]
+
+                for rule in rules:
+                    non_terminal_lengths |= self._sequence_lengths( rule, 0, lengths, lengths_mask )
+
+                if non_terminal_lengths != lengths[non_terminal_id]:
+                    lengths[non_terminal_id] = non_terminal_lengths
+                    is_changed = True
+
+        return lengths
+
+    @staticmethod
+    def _sequence_lengths(rule, start_index, lengths, lengths_mask):
+        """
+            Return the bitset of the lengths the symbols of `rule` starting on `start_index` can
+            derive, i.e., the sum of each symbol lengths bitsets.
+        """
+        sequence_lengths = 1
+
+        for code in rule[start_index:]:
+            symbol_lengths = 2 if code >= 0 else lengths[-1 - code]
+            new_lengths = 0
+            length = 0
+
+            while symbol_lengths:
+
+                if symbol_lengths & 1:
+                    new_lengths |= sequence_lengths << length
+
+                symbol_lengths >>= 1
+                length += 1
+
+            sequence_lengths = new_lengths & lengths_mask
+
+            if not sequence_lengths:
+                break
+
+        return sequence_lengths
+
+    def sentences(self, max_length):
+        """
+            Generates all sentences with up to `max_length` terminals on order of length, as strings
+            with their terminals separated by spaces, where the empty sentence is `&`.
+
+            The sentences are built one length at a time: for each non terminal, a set of tuples of
+            terminal ids with its sentences of the current length is built by concatenating the
+            sets of shorter lengths, accordingly with its productions. As the sets deduplicate the
+            sentences, ambiguous grammars do not multiply the work, and each sentence takes the same
+            memory. The initial symbol sentences of each length are generated as soon as they are
+            built.
+        """
+
+        if self.initial_id is None:
+            return
+
+        rules = self.rules
+        terminals = self.terminals
+
+        lengths = self.derivable_lengths( max_length )
+        lengths_mask = ( 1 << ( max_length + 1 ) ) - 1
+
+        # For each rule, the lengths bitset of its symbols starting on each position
+        suffixes_lengths = {}
+
+        for non_terminal_rules in rules:
+
+            for rule in non_terminal_rules:
+                suffixes_lengths[rule] = [self._sequence_lengths( rule, index, lengths, lengths_mask ) for index in range( len( rule ) + 1 )]
+
+        # For each non terminal id, a list with the set of its sentences of each length
+        sentences_sets = [[] for _ in self.non_terminals]
+
+        def sequence_sentences(rule, index, length):
+            """
+                Return a list with the sentences the `rule` symbols starting on `index` derive with
+                `length` terminals.
+            """
+
+            if index == len( rule ):
+                return [()]
+
+            code = rule[index]
+            remaining_lengths = suffixes_lengths[rule][index + 1]
+            sentences = []
+
+            if code >= 0:
+
+                if length and remaining_lengths >> ( length - 1 ) & 1:
+
+                    for tail in sequence_sentences( rule, index + 1, length - 1 ):
+                        sentences.append( ( code, ) + tail )
+
+                return sentences
+
+            symbol_lengths = lengths[-1 - code]
+            symbol_sentences_sets = sentences_sets[-1 - code]
+
+            for symbol_length in range( length + 1 ):
+
+                if symbol_lengths >> symbol_length & 1 and remaining_lengths >> ( length - symbol_length ) & 1:
+                    heads = symbol_sentences_sets[symbol_length]
+
+                    if heads:
+                        tails = sequence_sentences( rule, index + 1, length - symbol_length )
+                        sentences.extend( head + tail for head in heads for tail in tails )
+
+            return sentences
+
+        for length in range( max_length + 1 ):
+            changed_ids = None
+
+            for non_terminal_sentences_sets in sentences_sets:
+                non_terminal_sentences_sets.append( set() )
+
+            # A non terminal can use the sentences with the same length of other non terminal's, as
+            # on the production `A -> B`, then, repeat until no set changes, only evaluating again
+            # the productions using the changed non terminal's
+            while changed_ids is None or changed_ids:
+                new_changed_ids = set()
+
+                for non_terminal_id, non_terminal_rules in enumerate( rules ):
+                    self._check_cancelled()
+
+                    if not lengths[non_terminal_id] >> length & 1:
+                        continue
+
+                    sentences_set = sentences_sets[non_terminal_id][length]
+                    sentences_count = len( sentences_set )
+
+                    for rule in non_terminal_rules:
+
+                        if not suffixes_lengths[rule][0] >> length & 1:
+                            continue
+
+                        if changed_ids is not None and all( code >= 0 or -1 - code not in changed_ids for code in rule ):
+                            continue
+
+                        sentences_set.update( sequence_sentences( rule, 0, length ) )
+
+                    if len( sentences_set ) != sentences_count:
+                        new_changed_ids.add( non_terminal_id )
+
+                changed_ids = new_changed_ids
+
+            for sentence in sorted( sentences_sets[self.initial_id][length] ):
+                yield " ".join( terminals[terminal_id] for terminal_id in sentence ) if sentence else "&"
@@ -165,3 +165,20 @@ class NonTerminal(ChomskyGrammarSymbol):
         if not len( self ):
             raise RuntimeError( "Invalid symbol creation! Symbol with no length: `%s`" % self.str )
 
+
+
+def split_sentence(sentence):
+    """
+        Return a list with the terminals of the given `sentence`, which can be a string with the
+        terminals separated by white spaces or a list of terminal strings.
+
+        The epsilon symbol `&` alone represents the empty sentence.
+    """
+
+    if isinstance( sentence, str ):
+        sentence = sentence.split()
+
+    if len( sentence ) == 1 and sentence[0] == str( epsilon_terminal ):
+        return []
+
+    return sentence
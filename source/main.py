@@ -41,6 +41,7 @@ from PyQt5.QtWidgets import QWidget
 from PyQt5.QtWidgets import QFrame
 from PyQt5.QtWidgets import QPlainTextEdit
 from PyQt5.QtWidgets import QPushButton
+from PyQt5.QtWidgets import QCheckBox
 from PyQt5.QtWidgets import QSizePolicy
 from PyQt5.QtWidgets import QGridLayout
 from PyQt5.QtWidgets import QHBoxLayout
@@ -48,15 +49,12 @@ from PyQt5.QtWidgets import QVBoxLayout
 from PyQt5.QtWidgets import QFileDialog
 
 from grammar.grammar import ChomskyGrammar
-from grammar.symbols import HISTORY_KEY_LINE
+from grammar.history_sink import FileHistorySink
+from grammar.cancellation import CancellationToken
 
 from debug_tools.utilities import wrap_text
-from debug_tools.utilities import sort_correctly
-from debug_tools.utilities import convert_to_text_lines
 from debug_tools.utilities import getCleanSpaces
 from debug_tools.utilities import get_relative_path
-from debug_tools.utilities import dictionary_to_string
-from debug_tools.utilities import get_duplicated_elements
 
 from user_interface.string_input_dialog import StringInputDialog
 from user_interface.string_output_dialog import StringOutputDialog
@@ -67,7 +65,10 @@ from user_interface.utilities import ignore_exceptions
 from user_interface.utilities import get_screen_center
 from user_interface.utilities import setTextWithoutCleaningHistory
 
+from user_interface import grammar_operations
+from user_interface.process_backend import WorkerPool
 from user_interface.run_function_async import run_function_async
+from user_interface.live_analysis_panel import LiveAnalysisPanel
 from debug_tools import getLogger
 
 # Enable debug messages: ( bitwise )
@@ -128,6 +129,10 @@ class ProgramWindow(QtWidgets.QMainWindow):
 
     def __init__(self):
         QtWidgets.QMainWindow.__init__( self )
+
+        ## The `WorkerPool` running the grammar operations, or None to run them on threads
+        self.workerPool = None
+
         self.setup_main_window()
         self.setup_main_excpetion_handler()
 
@@ -194,6 +199,8 @@ class ProgramWindow(QtWidgets.QMainWindow):
         self.isGrammarFactored        = QPushButton( "Is Factored" )
         self.tryToFactorGrammar       = QPushButton( "Try to Factor it" )
         self.grammarHasLeftRecursion  = QPushButton( "Has Left Recursion" )
+        self.recognizeSentences       = QPushButton( "Recognize Sentences" )
+        self.generateSentences        = QPushButton( "Generate Sentences" )
         self.isGrammarEmpty           = QPushButton( "Is Empty" )
         self.isGrammarFinite          = QPushButton( "Is Finite" )
         self.isGrammarInfinite        = QPushButton( "Is Infinite" )
@@ -201,6 +208,11 @@ class ProgramWindow(QtWidgets.QMainWindow):
         self.openGrammar              = QPushButton( "Open File" )
         self.saveGrammar              = QPushButton( "Save File" )
         self.grammarBeautifing        = QPushButton( "Beautify" )
+        self.useWorkerProcesses       = QCheckBox( "Use Worker Processes" )
+        self.useLiveAnalysis          = QCheckBox( "Live Analysis" )
+
+        self.liveAnalysisPanel = LiveAnalysisPanel( self, self.settings, self.getMainFontOptions() )
+        self.grammarTextEditWidget.textChanged.connect( self.handleGrammarTextChanged )
 
         self.undoGrammarButton.clicked.connect( self.handleUndoGrammarTextEdit )
         self.redoGrammarButton.clicked.connect( self.handleRedoGrammarTextEdit )
@@ -208,6 +220,8 @@ class ProgramWindow(QtWidgets.QMainWindow):
         self.isGrammarFactored.clicked.connect( self.handleIsGrammarFactored )
         self.tryToFactorGrammar.clicked.connect( self.handleTryToFactorGrammar )
         self.grammarHasLeftRecursion.clicked.connect( self.handleGrammarHasLeftRecursion )
+        self.recognizeSentences.clicked.connect( self.handleRecognizeSentences )
+        self.generateSentences.clicked.connect( self.handleGenerateSentences )
         self.convertToProperGrammar.clicked.connect( self.handleConvertToProperGrammar )
         self.isGrammarEmpty.clicked.connect( self.handleIsGrammarEmpty )
         self.isGrammarFinite.clicked.connect( self.handleIsGrammarFinite )
@@ -216,6 +230,11 @@ class ProgramWindow(QtWidgets.QMainWindow):
         self.openGrammar.clicked.connect( self.handleOpenGrammar )
         self.saveGrammar.clicked.connect( self.handleSaveGrammar )
         self.grammarBeautifing.clicked.connect( self.handleGrammarBeautifing)
+        self.useWorkerProcesses.toggled.connect( self.handleUseWorkerProcesses )
+        self.useWorkerProcesses.setChecked( self.settings.value( "useWorkerProcesses", False, type=bool ) )
+        self.useLiveAnalysis.toggled.connect( self.handleUseLiveAnalysis )
+        self.useLiveAnalysis.setChecked( self.settings.value( "useLiveAnalysis", False, type=bool ) )
+        self.handleUseLiveAnalysis( self.useLiveAnalysis.isChecked() )
 
         # The distances between the QPushButton in QGridLayout
         # https://stackoverflow.com/questions/13578187/the-distances-between-the-qpushbutton-in-qgridlayout
@@ -228,15 +247,20 @@ class ProgramWindow(QtWidgets.QMainWindow):
         self.grammarVerticalGridLayout.addWidget( self.isGrammarFactored,        5, 0)
         self.grammarVerticalGridLayout.addWidget( self.tryToFactorGrammar,       6, 0)
         self.grammarVerticalGridLayout.addWidget( self.grammarHasLeftRecursion,  7, 0)
-        self.grammarVerticalGridLayout.addWidget( self.get_vertical_separator(), 8, 0)
-        self.grammarVerticalGridLayout.addWidget( self.isGrammarEmpty,           9, 0)
-        self.grammarVerticalGridLayout.addWidget( self.isGrammarFinite,          10, 0)
-        self.grammarVerticalGridLayout.addWidget( self.isGrammarInfinite,        11, 0)
-        self.grammarVerticalGridLayout.addWidget( self.isGrammarEmptyOrInFinite, 12, 0)
-        self.grammarVerticalGridLayout.addWidget( self.get_vertical_separator(), 13, 0)
-        self.grammarVerticalGridLayout.addWidget( self.openGrammar,              14, 0)
-        self.grammarVerticalGridLayout.addWidget( self.saveGrammar,              15, 0)
-        # self.grammarVerticalGridLayout.addWidget( self.grammarBeautifing,        16, 0)
+        self.grammarVerticalGridLayout.addWidget( self.recognizeSentences,       8, 0)
+        self.grammarVerticalGridLayout.addWidget( self.generateSentences,        9, 0)
+        self.grammarVerticalGridLayout.addWidget( self.get_vertical_separator(), 10, 0)
+        self.grammarVerticalGridLayout.addWidget( self.isGrammarEmpty,           11, 0)
+        self.grammarVerticalGridLayout.addWidget( self.isGrammarFinite,          12, 0)
+        self.grammarVerticalGridLayout.addWidget( self.isGrammarInfinite,        13, 0)
+        self.grammarVerticalGridLayout.addWidget( self.isGrammarEmptyOrInFinite, 14, 0)
+        self.grammarVerticalGridLayout.addWidget( self.get_vertical_separator(), 15, 0)
+        self.grammarVerticalGridLayout.addWidget( self.openGrammar,              16, 0)
+        self.grammarVerticalGridLayout.addWidget( self.saveGrammar,              17, 0)
+        # self.grammarVerticalGridLayout.addWidget( self.grammarBeautifing,        18, 0)
+        self.grammarVerticalGridLayout.addWidget( self.get_vertical_separator(), 18, 0)
+        self.grammarVerticalGridLayout.addWidget( self.useWorkerProcesses,       19, 0)
+        self.grammarVerticalGridLayout.addWidget( self.useLiveAnalysis,          20, 0)
         self.grammarVerticalGridLayout.setSpacing( 0 )
         self.grammarVerticalGridLayout.setAlignment(Qt.AlignTop)
 
@@ -278,6 +302,7 @@ class ProgramWindow(QtWidgets.QMainWindow):
         # https://stackoverflow.com/questions/50176661/qwidgetsetlayout-attempting-to-set-qlayout-on-programwindow-which-alre
         main_vertical_layout = QVBoxLayout( self.centralwidget )
         main_vertical_layout.addLayout( self.grammarInnerLayout )
+        main_vertical_layout.addWidget( self.liveAnalysisPanel )
 
     def keyPressEvent(self, event):
         """
@@ -295,6 +320,12 @@ class ProgramWindow(QtWidgets.QMainWindow):
         self.settings.setValue( "mainWindowScreenGeometry", self.saveGeometry() )
         self.settings.setValue( "mainWindowScreenState", self.saveState() )
         self.settings.setValue( "mainWindowGrammarTextEditWidget", self.grammarTextEditWidget.toPlainText() )
+
+        self.liveAnalysisPanel.close()
+
+        if self.workerPool is not None:
+            self.workerPool.close()
+
         super().closeEvent( event )
 
     def handleUndoGrammarTextEdit(self):
@@ -347,6 +378,16 @@ class ProgramWindow(QtWidgets.QMainWindow):
             with open( fileName, 'r', encoding='utf-8' ) as file:
                 return file.read()
 
+    @ignore_exceptions
+    def _openSentences(self):
+        options = self._getFileDialogOptions()
+        fileName, _ = QFileDialog.getOpenFileName( self, "Choose a sentences file", "","Text Files (*.txt);;All Files (*)", options=options )
+
+        if fileName:
+
+            with open( fileName, 'r', encoding='utf-8' ) as file:
+                return file.read()
+
     @ignore_exceptions
     def handleGrammarBeautifing(self, qt_decorator_bug):
         firstGrammar = ChomskyGrammar.load_from_text_lines( self.grammarTextEditWidget.toPlainText() )
@@ -356,63 +397,87 @@ class ProgramWindow(QtWidgets.QMainWindow):
         setTextWithoutCleaningHistory( self.grammarTextEditWidget, str( firstGrammar ) )
 
     @ignore_exceptions
-    def _handleFunctionAsync(self, target_function, initial_message):
-        isToStop = [False]
-        results_dialog = StringOutputDialog( self, self.settings, self.getMainFontOptions(), self._getFileDialogOptions(), isToStop )
-
-        target_function.results = ""
-        target_function.isToStop = isToStop
-        self.qtUpdateThread = run_function_async( target_function, results_dialog, initial_message )
+    def _handleFunctionAsync(self, operation, initial_message, arguments=(), history_sink=None, is_streaming=False):
+        """
+            Runs the `grammar_operations` module `operation( function, grammar_text, *arguments )`
+            with the current grammar text, on a worker process if they are enabled, see
+            `handleUseWorkerProcesses()`, otherwise, on a background thread of this process.
 
-    @ignore_exceptions
-    def handleCalculateFirstAndFollow(self, qt_decorator_bug):
+            If a `history_sink` is given, it is set as `function.history_sink` to write the
+            grammar history to a file while it is created, which the results dialog displays line by
+            line, as it can be too big to keep all of it in memory.
+        """
+        cancellationToken = CancellationToken()
+        results_dialog = StringOutputDialog( self, self.settings, self.getMainFontOptions(), self._getFileDialogOptions(), cancellationToken )
+        grammar_text = self.grammarTextEditWidget.toPlainText()
 
         @ignore_exceptions
         def function():
-            results = []
-            firstGrammar = ChomskyGrammar.load_from_text_lines( self.grammarTextEditWidget.toPlainText() )
-            results.append( str( firstGrammar ) )
+            operation( function, grammar_text, *arguments )
+
+        function.results = ""
+        function.cancellation_token = cancellationToken
+        function.operation = operation
+        function.grammar_text = grammar_text
+        function.arguments = arguments
+
+        if is_streaming:
+            function.is_streaming = True
 
-            first_terminals = firstGrammar.first_terminals()
-            first_non_terminals = firstGrammar.first_non_terminals()
-            follow_terminals = firstGrammar.follow_terminals( first_terminals )
+        if history_sink is not None:
+            function.history_sink = history_sink
+            results_dialog.historySink = history_sink
 
-            results.append( "\n\n# Has the following Terminal's FIRST\n" )
-            results.append( dictionary_to_string( first_terminals ) )
+        self.qtUpdateThread = run_function_async( function, results_dialog, initial_message, self.workerPool )
 
-            results.append( "\n\n# And Non Terminal's FIRST\n" )
-            results.append( dictionary_to_string( first_non_terminals ) )
+    @ignore_exceptions
+    def handleUseWorkerProcesses(self, isChecked):
+        """
+            Starts or stops the worker processes running the grammar operations, which keep this
+            user interface responsive, as the grammar computations do not compete with it for the
+            Python global interpreter lock, and allows to run several operations at the same time.
+        """
+        self.settings.setValue( "useWorkerProcesses", isChecked )
 
-            results.append( "\n\n# And Terminal's FOLLOW\n" )
-            results.append( dictionary_to_string( follow_terminals ) )
+        if isChecked:
 
-            function.results = "".join( results )
+            if self.workerPool is None:
+                self.workerPool = WorkerPool()
 
-        self._handleFunctionAsync( function, "# The following grammar:" )
+        elif self.workerPool is not None:
+            self.workerPool.close()
+            self.workerPool = None
+
+        self.liveAnalysisPanel.workerPool = self.workerPool
 
     @ignore_exceptions
-    def handleIsGrammarFactored(self, qt_decorator_bug):
+    def handleUseLiveAnalysis(self, isChecked):
+        """
+            Shows the panel analyzing the grammar on background while it is edited, see
+            `LiveAnalysisPanel`.
+        """
+        self.settings.setValue( "useLiveAnalysis", isChecked )
+        self.liveAnalysisPanel.setVisible( isChecked )
 
-        @ignore_exceptions
-        def function():
-            results = []
-            firstGrammar = ChomskyGrammar.load_from_text_lines( self.grammarTextEditWidget.toPlainText() )
-            results.append( str( firstGrammar ) )
+        if isChecked:
+            self.liveAnalysisPanel.scheduleAnalysis( self.grammarTextEditWidget.toPlainText() )
 
-            factors = firstGrammar.factors()
-            is_factored = firstGrammar.is_factored()
+        else:
+            self.liveAnalysisPanel.cancelAnalysis()
 
-            if is_factored:
-                results.append( "\n\n# Is Factored!" )
+    @ignore_exceptions
+    def handleGrammarTextChanged(self):
 
-            else:
-                results.append( "\n\n# Is NOT Factored!" )
-                results.append( "\n\n# It does still has the following factor/nondeterminism(s)\n" )
-                results.append( convert_to_text_lines( get_duplicated_elements( factors ), sort=sort_correctly ) )
+        if self.useLiveAnalysis.isChecked():
+            self.liveAnalysisPanel.scheduleAnalysis( self.grammarTextEditWidget.toPlainText() )
 
-            function.results = "".join( results )
+    @ignore_exceptions
+    def handleCalculateFirstAndFollow(self, qt_decorator_bug):
+        self._handleFunctionAsync( grammar_operations.calculate_first_and_follow, "# The following grammar:" )
 
-        self._handleFunctionAsync( function, "# The following grammar:" )
+    @ignore_exceptions
+    def handleIsGrammarFactored(self, qt_decorator_bug):
+        self._handleFunctionAsync( grammar_operations.is_grammar_factored, "# The following grammar:" )
 
     @ignore_exceptions
     def handleTryToFactorGrammar(self, qt_decorator_bug):
@@ -422,161 +487,63 @@ class ProgramWindow(QtWidgets.QMainWindow):
         if not isAccepted:
             return
 
-        @ignore_exceptions
-        def function():
-            results = []
-            firstGrammar = ChomskyGrammar.load_from_text_lines( self.grammarTextEditWidget.toPlainText() )
-            results.append( str( firstGrammar ) )
-
-            was_factored = firstGrammar.factor_it( maximumSteps )
+        self._handleFunctionAsync( grammar_operations.try_to_factor_grammar,
+                "# Trying to factor the following grammar in `%s` steps:" % maximumSteps, ( maximumSteps, ), FileHistorySink() )
 
-            if was_factored:
-                results.append( "\n\n# It was successfully factored in `%s` steps!" % firstGrammar.last_factoring_step )
-                results.append( "\n\n# The new factored grammar is:" )
+    @ignore_exceptions
+    def handleRecognizeSentences(self, qt_decorator_bug):
+        fontOptions = self.getMainFontOptions()
+        ( inputSentences, isAccepted ) = StringInputDialog.getNewUserInput( self, self.settings, fontOptions,
+                self._openSentences, "Sentences", "Write one sentence per line, with its terminals separated by spaces" )
 
-            else:
-                factors = firstGrammar.factors()
-                results.append( "\n\n# It could not be successfully factored in `%s` steps!\n\n" % maximumSteps )
-                results.append( "\n\n# Does still has the following factor/nondeterminism(s)\n" )
+        if not isAccepted:
+            return
 
-                results.append( convert_to_text_lines( factors, sort=sort_correctly ) )
-                results.append( "\n\n# The last non factored grammar produced was:" )
+        self._handleFunctionAsync( grammar_operations.recognize_sentences, "# The following grammar:", ( inputSentences, ) )
 
-            results.append( "\n" )
-            results.append( str( firstGrammar ) )
+    @ignore_exceptions
+    def handleGenerateSentences(self, qt_decorator_bug):
+        fontOptions = self.getMainFontOptions()
+        ( maximumLength, isAccepted ) = IntegerInputDialog.getNewUserInput( self, self.settings, fontOptions,
+                "# Write here bellow, an integer with the maximum sentences length\n\n5" )
 
-            results.append( self._get_history_string( firstGrammar ) )
-            function.results = "".join( results )
+        if not isAccepted:
+            return
 
-        self._handleFunctionAsync( function, "# Trying to factor the following grammar in `%s` steps:" % maximumSteps )
+        self._handleFunctionAsync( grammar_operations.generate_sentences, "# The following grammar:", ( maximumLength, ), is_streaming=True )
 
     @ignore_exceptions
     def handleGrammarHasLeftRecursion(self, qt_decorator_bug):
-
-        @ignore_exceptions
-        def function():
-            results = []
-            firstGrammar = ChomskyGrammar.load_from_text_lines( self.grammarTextEditWidget.toPlainText() )
-            results.append( str( firstGrammar ) )
-
-            left_recursion = firstGrammar.left_recursion()
-            has_left_recursion = firstGrammar.has_left_recursion()
-            firstGrammar.eliminate_left_recursion()
-
-            if has_left_recursion:
-                results.append( "\n\n# Has the following Left Recursion(s)\n" )
-                results.append( convert_to_text_lines( left_recursion, sort=sort_correctly ) )
-
-                results.append( "\n\n# And has the following Left Recursion Free Grammar:\n" )
-                results.append( str( firstGrammar ) )
-
-            else:
-                results.append( "\n\n# Has NO Left Recursion." )
-
-            results.append( self._get_history_string( firstGrammar ) )
-            function.results = "".join( results )
-
-        self._handleFunctionAsync( function, "# The following grammar:" )
+        self._handleFunctionAsync( grammar_operations.eliminate_left_recursion, "# The following grammar:", history_sink=FileHistorySink() )
 
     @ignore_exceptions
-    def _handleGrammarIsSomething(self, function_to_check, property_name, inverse_boolean=False):
+    def _handleGrammarIsSomething(self, method_name, property_name, inverse_boolean=False):
         """
-            How to pass member function as argument in python?
-            https://stackoverflow.com/questions/10181450/how-to-pass-member-function-as-argument-in-python
+            The `method_name` is the name of the `ChomskyGrammar` method checking the property, as
+            the methods themselves are not sent to the worker processes.
         """
-
-        @ignore_exceptions
-        def function():
-            results = []
-            firstGrammar = ChomskyGrammar.load_from_text_lines( self.grammarTextEditWidget.toPlainText() )
-            is_empty = function_to_check( firstGrammar )
-
-            results.append( str( firstGrammar ) )
-            results.append( "\n\n# Is %s%s.\n" % ( "" if (not is_empty if inverse_boolean else is_empty) else "NOT ", property_name ) )
-            function.results = "".join( results )
-
-        self._handleFunctionAsync( function, "# The following grammar:" )
+        self._handleFunctionAsync( grammar_operations.check_grammar_property, "# The following grammar:",
+                ( method_name, property_name, inverse_boolean ) )
 
     @ignore_exceptions
     def handleGrammarIsFiniteInfiniteOrEmpty(self, qt_decorator_bug):
-
-        @ignore_exceptions
-        def function():
-            results = []
-            firstGrammar = ChomskyGrammar.load_from_text_lines( self.grammarTextEditWidget.toPlainText() )
-            is_empty = firstGrammar.is_empty()
-            is_finite = firstGrammar.is_finite()
-            is_infinite = firstGrammar.is_infinite()
-
-            if is_empty:
-                property_name = "Empty"
-
-            elif is_finite:
-                property_name = "Finite"
-
-            elif is_infinite:
-                property_name = "Infinite"
-
-            else:
-                property_name = "Unknown"
-
-            results.append( str( firstGrammar ) )
-            results.append( "\n\n# Is %s.\n" % ( property_name ) )
-
-            results.append( self._get_history_string( firstGrammar ) )
-            function.results = "".join( results )
-
-        self._handleFunctionAsync( function, "# The following grammar:" )
+        self._handleFunctionAsync( grammar_operations.classify_grammar_language, "# The following grammar:" )
 
     @ignore_exceptions
     def handleIsGrammarEmpty(self, function_to_check):
-        self._handleGrammarIsSomething( ChomskyGrammar.is_empty, "empty" )
+        self._handleGrammarIsSomething( "is_empty", "empty" )
 
     @ignore_exceptions
     def handleIsGrammarFinite(self, function_to_check):
-        self._handleGrammarIsSomething( ChomskyGrammar.is_finite, "finite" )
+        self._handleGrammarIsSomething( "is_finite", "finite" )
 
     @ignore_exceptions
     def handleIsGrammarInfinite(self, function_to_check):
-        self._handleGrammarIsSomething( ChomskyGrammar.is_infinite, "infinite" )
+        self._handleGrammarIsSomething( "is_infinite", "infinite" )
 
     @ignore_exceptions
     def handleConvertToProperGrammar(self, qt_decorator_bug):
-
-        @ignore_exceptions
-        def function():
-            results = []
-            firstGrammar = ChomskyGrammar.load_from_text_lines( self.grammarTextEditWidget.toPlainText() )
-            results.append( str( firstGrammar ) )
-
-            non_terminal_epsilon = firstGrammar.non_terminal_epsilon()
-            fertile = firstGrammar.fertile()
-            reachable = firstGrammar.reachable()
-            simple_non_terminals = firstGrammar.simple_non_terminals()
-            firstGrammar.convert_to_proper()
-
-            results.append( "\n\n# Has the following Proper version:\n" )
-            results.append( str( firstGrammar ) )
-
-            results.append( "\n\n# It has the following Non Terminal Epsilon set (Ne):\n" )
-            results.append( convert_to_text_lines( non_terminal_epsilon ) )
-
-            results.append( "\n\n# It has the following Fertile Non Terminal's set (Nf):\n" )
-            results.append( convert_to_text_lines( fertile ) )
-
-            results.append( "\n\n# It has the following Reachable Symbols' set (Vi):\n" )
-            results.append( convert_to_text_lines( reachable ) )
-
-            results.append( "\n\n# It has the following Simple Non Terminal's set (Na):\n" )
-            results.append( dictionary_to_string( simple_non_terminals ) )
-
-            results.append( self._get_history_string( firstGrammar ) )
-            function.results = "".join( results )
-
-        self._handleFunctionAsync( function, "# The following grammar:" )
-
-    def _get_history_string(self, firstGrammar, extra_lines="\n\n\n"):
-        return "%s%s\n\n%s" % ( extra_lines, HISTORY_KEY_LINE, firstGrammar.get_operation_history() )
+        self._handleFunctionAsync( grammar_operations.convert_to_proper_grammar, "# The following grammar:", history_sink=FileHistorySink() )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Licensing
+#
+# Recognize Sentences Command Line Interface
+# Copyright (C) 2018 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+    Checks whether the sentences belong to the language of a LL(1) grammar, using its LL(1) parsing
+    table, or of any context free grammar with the `--cyk` or `--earley` options. Each sentence goes on its own line, with its terminals separated by spaces, and `&` is
+    the empty sentence. Empty lines and lines starting with `#` are ignored.
+
+    Usage:
+        python source/recognize_sentences.py grammar.grammar sentences.txt
+        cat sentences.txt | python source/recognize_sentences.py grammar.grammar
+        python source/recognize_sentences.py --cyk ambiguous.grammar sentences.txt
+        python source/recognize_sentences.py --earley ambiguous.grammar sentences.txt
+
+    The exit code is 0 when all sentences were accepted, 1 otherwise and 2 when the grammar is not LL(1).
+"""
+
+import sys
+import argparse
+
+from grammar.grammar import ChomskyGrammar
+from grammar.intermediate_grammar import HistoryPolicy
+
+
+def main():
+    argumentParser = argparse.ArgumentParser( description="Recognize sentences with a LL(1) grammar parsing table, the CYK or the Earley algorithms." )
+    argumentParser.add_argument( "grammar", help="the grammar file" )
+    argumentParser.add_argument( "sentences", nargs="?", help="the sentences file, defaults to the standard input" )
+    argumentParser.add_argument( "-q", "--quiet", action="store_true", help="only print the accepted and rejected counts" )
+    argumentParser.add_argument( "-t", "--table", action="store_true", help="print the LL(1) parsing table first" )
+    argumentParser.add_argument( "-c", "--cyk", action="store_true", help="use the CYK algorithm, which accepts any context free grammar" )
+    argumentParser.add_argument( "-e", "--earley", action="store_true", help="use the Earley algorithm, which accepts any context free grammar" )
+    arguments = argumentParser.parse_args()
+
+    with open( arguments.grammar, 'r', encoding='utf-8' ) as file:
+        firstGrammar = ChomskyGrammar.load_from_text_lines( file.read() )
+
+    # Only the final grammar is used, then, do not spend time saving its operations history
+    firstGrammar.history_policy = HistoryPolicy.NONE
+
+    if arguments.cyk:
+        recognizer = firstGrammar.build_cyk_recognizer()
+
+    elif arguments.earley:
+        recognizer = firstGrammar.build_earley_parser()
+
+    else:
+
+        try:
+            recognizer = firstGrammar.build_ll1_table()
+
+        except RuntimeError as error:
+            print( error, file=sys.stderr )
+            return 2
+
+        if arguments.table:
+            print( recognizer )
+
+    if arguments.sentences:
+        sentences_file = open( arguments.sentences, 'r', encoding='utf-8' )
+
+    else:
+        sentences_file = sys.stdin
+
+    accepted = 0
+    rejected = 0
+
+    with sentences_file:
+
+        for sentence in sentences_file:
+            sentence = sentence.strip()
+
+            if not sentence or sentence.startswith( "#" ):
+                continue
+
+            if recognizer.recognize( sentence ):
+                accepted += 1
+                is_accepted = "Accepted"
+
+            else:
+                rejected += 1
+                is_accepted = "Rejected"
+
+            if not arguments.quiet:
+                print( "%s: %s" % ( is_accepted, sentence ) )
+
+    print( "# Accepted: %s, Rejected: %s" % ( accepted, rejected ) )
+    return 1 if rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit( main() )
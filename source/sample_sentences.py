@@ -0,0 +1,73 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Licensing
+#
+# Sample Sentences Command Line Interface
+# Copyright (C) 2018 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+    Prints random sentences of a context free grammar with an exact number of terminals, uniformly
+    drawn among its derivations, one sentence per line, which can be used to fuzz parsers.
+
+    Usage:
+        python source/sample_sentences.py grammar.grammar 20
+        python source/sample_sentences.py --count 100000 --seed 7 --processes 4 grammar.grammar 20
+
+    The exit code is 0 when the sentences were printed and 1 when the grammar has no sentences with
+    the given length.
+"""
+
+import sys
+import argparse
+
+from grammar.grammar import ChomskyGrammar
+from grammar.intermediate_grammar import HistoryPolicy
+
+
+def main():
+    argumentParser = argparse.ArgumentParser( description="Print random sentences of a grammar with an exact length." )
+    argumentParser.add_argument( "grammar", help="the grammar file" )
+    argumentParser.add_argument( "length", type=int, help="the number of terminals of each sentence" )
+    argumentParser.add_argument( "-n", "--count", type=int, default=10, help="how many sentences to print, defaults to 10" )
+    argumentParser.add_argument( "-s", "--seed", type=int, default=None, help="the random numbers seed, for reproducible samples" )
+    argumentParser.add_argument( "-p", "--processes", type=int, default=1, help="how many processes draw the samples, defaults to 1" )
+    arguments = argumentParser.parse_args()
+
+    with open( arguments.grammar, 'r', encoding='utf-8' ) as file:
+        firstGrammar = ChomskyGrammar.load_from_text_lines( file.read() )
+
+    # Only the final grammar is used, then, do not spend time saving its operations history
+    firstGrammar.history_policy = HistoryPolicy.NONE
+
+    sentenceSampler = firstGrammar.build_sentence_sampler( arguments.seed )
+
+    try:
+
+        for sentence in sentenceSampler.samples( arguments.length, arguments.count, arguments.processes ):
+            print( sentence )
+
+    except RuntimeError as error:
+        print( error, file=sys.stderr )
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit( main() )
@@ -23,7 +23,11 @@
 
 import os
 import sys
+import time
+import tempfile
 import lark
+import json
+import collections
 
 import unittest
 import profile
@@ -54,7 +58,18 @@ from grammar.production import epsilon_terminal
 
 from grammar.tree_transformer import ChomskyGrammarTreeTransformer
 
+from grammar.history_sink import FileHistorySink
+from grammar.intermediate_grammar import HistoryPolicy
 from grammar.intermediate_grammar import IntermediateGrammar
+from grammar.budget import GrammarBudget
+from grammar.cancellation import Cancelled
+from grammar.language_class import LanguageClass
+from grammar.cancellation import CancellationToken
+from grammar.cyk import CYKRecognizer
+
+from user_interface import grammar_operations
+from user_interface.process_backend import WorkerPool
+from user_interface.lines_file_model import LinesFileModel
 
 log = getLogger( 127, os.path.basename( os.path.dirname( os.path.abspath ( __file__ ) ) ) )
 log( 1, "Importing " + __name__ )
@@ -158,6 +173,22 @@ class TestChomskyGrammar(TestingUtilities):
         self.assertFalse( firstGrammar.has_recursion_on_the_non_terminal( non_terminal_S ) )
         self.assertTrue( firstGrammar.has_recursion_on_the_non_terminal( non_terminal_A ) )
 
+    def test_grammarRemoveStartNonTerminalRemovedByItsProductions(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> a | A b
+            A -> B
+            B -> A a
+        """ ) )
+
+        non_terminal_B = NonTerminal( "B", lock=True )
+        firstGrammar.remove_start_non_terminal( non_terminal_B )
+
+        self.assertTextEqual(
+        r"""
+            + S -> a
+        """, firstGrammar )
+
     def test_grammarIsEmptyStoSandA(self):
         firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
         r"""
@@ -226,6 +257,40 @@ class TestChomskyGrammar(TestingUtilities):
 
         self.assertTrue( firstGrammar.is_infinite() )
 
+    def test_grammarClassifyLanguageEmpty(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> B
+            B -> B
+        """ ) )
+
+        self.assertEqual( LanguageClass.EMPTY, firstGrammar.classify_language() )
+
+    def test_grammarClassifyLanguageFinite(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> A B | a | C c
+            A -> S | b
+            B -> &
+            C -> c C
+        """ ) )
+
+        self.assertEqual( LanguageClass.FINITE, firstGrammar.classify_language() )
+
+    def test_grammarClassifyLanguageInfinite(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> a S b | c | A
+            A -> a A | &
+        """ ) )
+
+        self.assertEqual( LanguageClass.INFINITE, firstGrammar.classify_language() )
+        self.assertTextEqual(
+        r"""
+            + S -> c | A | a S b
+            + A -> & | a A
+        """, firstGrammar )
+
     def test_grammarHistoryBeginningIntroReplacement(self):
         firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
         r"""
@@ -258,6 +323,193 @@ class TestChomskyGrammar(TestingUtilities):
             +  S -> & | a S
         """, firstGrammar.get_operation_history() )
 
+    def test_grammarHistorySavesOnlyTheChangedProductions(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> a A | a B | c
+            A -> a | b
+            B -> c | d
+        """ ) )
+        firstGrammar.factor_it( 1 )
+        operations_history = firstGrammar.operations_history
+
+        self.assertIsNotNone( operations_history[0].version.snapshot )
+        self.assertTrue( all( operation.grammar is None for operation in operations_history ) )
+        self.assertTrue( all( operation.version.snapshot is None for operation in operations_history[1:] ) )
+
+        self.assertEqual( [( 'S', 'a A', False ), ( 'S', 'a B', False ), ( 'S', 'a S1', True ), ( 'S1', 'A', True ), ( 'S1', 'B', True )],
+                sorted( ( str( start_symbol ), str( production ), is_added )
+                for operation in operations_history for ( start_symbol, production ), is_added in operation.version.changes.productions.items() ) )
+
+        self.assertTextEqual(
+        r"""
+            +  S -> c | a S1
+            +  A -> a | b
+            +  B -> c | d
+            + S1 -> A | B
+        """, firstGrammar.get_operation_history().split( "\n\n" )[-1].split( "\n", 2 )[-1] )
+
+        self.assertEqual( str( firstGrammar ), operations_history[-1].grammar )
+
+    def test_grammarHistoryPolicy(self):
+        grammar_text = wrap_text(
+        r"""
+            S -> S a | A b | &
+            A -> A c | S d | B
+            B -> e
+        """ )
+
+        fullGrammar = ChomskyGrammar.load_from_text_lines( grammar_text )
+        fullGrammar.eliminate_left_recursion()
+        full_history = fullGrammar.get_operation_history()
+
+        noneGrammar = ChomskyGrammar.load_from_text_lines( grammar_text )
+        noneGrammar.history_policy = HistoryPolicy.NONE
+        noneGrammar.eliminate_left_recursion()
+
+        self.assertEqual( str( fullGrammar ), str( noneGrammar ) )
+        self.assertEqual( [], noneGrammar.operations_history )
+        self.assertEqual( 0, len( noneGrammar.history_changes ) )
+        self.assertEqual( HistoryPolicy.NONE, noneGrammar.copy().history_policy )
+
+        # Enabling the history again saves all the productions on the next entry
+        noneGrammar.history_policy = HistoryPolicy.FULL
+        noneGrammar.factor_it()
+        self.assertIsNotNone( noneGrammar.operations_history[0].version.snapshot )
+        self.assertIn( str( noneGrammar ), noneGrammar.get_operation_history() )
+
+        summaryGrammar = ChomskyGrammar.load_from_text_lines( grammar_text )
+        summaryGrammar.history_policy = HistoryPolicy.SUMMARY
+        summaryGrammar.eliminate_left_recursion()
+
+        self.assertIn( "Eliminate indirect left recursion", full_history )
+        self.assertNotIn( "Eliminate indirect left recursion", summaryGrammar.get_operation_history() )
+        self.assertTrue( all( operation.stage.value != IntermediateGrammar.MIDDLE for operation in summaryGrammar.operations_history ) )
+
+        snapshotsGrammar = ChomskyGrammar.load_from_text_lines( grammar_text )
+        snapshotsGrammar.history_policy = HistoryPolicy.FULL_WITH_SNAPSHOTS
+        snapshotsGrammar.eliminate_left_recursion()
+
+        self.assertTrue( all( operation.version.snapshot is not None for operation in snapshotsGrammar.operations_history ) )
+        self.assertEqual( full_history, snapshotsGrammar.get_operation_history() )
+
+        with self.assertRaisesRegex( RuntimeError, "Invalid history policy" ):
+            fullGrammar.history_policy = 4
+
+    def test_grammarHistorySinkStreamsTheEntries(self):
+        grammar_text = wrap_text(
+        r"""
+            S -> S a | A b | &
+            A -> A c | S d | B
+            B -> e
+        """ )
+
+        fullGrammar = ChomskyGrammar.load_from_text_lines( grammar_text )
+        fullGrammar.factor_it( 3 )
+        full_history = fullGrammar.get_operation_history()
+
+        for json_lines in ( False, True ):
+            history_sink = FileHistorySink( json_lines=json_lines, ring_size=2 )
+            firstGrammar = ChomskyGrammar.load_from_text_lines( grammar_text )
+            firstGrammar.history_sink = history_sink
+            firstGrammar.factor_it( 3 )
+
+            self.assertEqual( 2, len( firstGrammar.operations_history ) )
+            firstGrammar.finish_history()
+
+            entries = history_sink.read_entries( 0, 3 ) + history_sink.read_entries( 3, len( history_sink ) )
+            self.assertEqual( full_history.count( "\n\n# " ) + 1, len( entries ) )
+
+            if json_lines:
+                self.assertEqual( str( firstGrammar ), json.loads( entries[-1] )['grammar'] )
+
+            else:
+                self.assertEqual( full_history, "\n\n".join( entries ) )
+                self.assertEqual( full_history, history_sink.text() )
+
+                with open( history_sink.file_path, 'r', encoding='utf-8' ) as file:
+                    self.assertEqual( full_history, file.read() )
+
+            history_sink.close()
+            self.assertFalse( os.path.exists( history_sink.file_path ) )
+
+    def test_grammarSnapshotAndRestoreVersions(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> A b | A B c
+            A -> a A | a | B
+            B -> b B | &
+        """ ) )
+        original_grammar = str( firstGrammar )
+        original_version = firstGrammar.snapshot()
+
+        firstGrammar.convert_to_proper()
+        proper_grammar = str( firstGrammar )
+        proper_version = firstGrammar.snapshot()
+
+        # Without changes, the same version is returned, and it only holds the changes since the last one
+        self.assertIs( proper_version, firstGrammar.snapshot() )
+        self.assertIsNone( proper_version.snapshot )
+
+        firstGrammar.factor_it( 1 )
+        factored_grammar = str( firstGrammar )
+
+        firstGrammar.restore( proper_version )
+        self.assertEqual( proper_grammar, str( firstGrammar ) )
+
+        firstGrammar.factor_it( 10 )
+        self.assertNotEqual( factored_grammar, str( firstGrammar ) )
+
+        # The versions saved before the restore are not changed by the new branch
+        firstGrammar.restore( original_version )
+        self.assertEqual( original_grammar, str( firstGrammar ) )
+
+        secondGrammar = ChomskyGrammar()
+        secondGrammar.restore( proper_version )
+        self.assertEqual( proper_grammar, str( secondGrammar ) )
+
+        # Each history entry is a version which can be resumed, even after the restores
+        firstGrammar.get_operation_history()
+
+        for operation in firstGrammar.operations_history:
+            secondGrammar.restore( operation.version )
+            self.assertEqual( operation.grammar, secondGrammar.compact_str() )
+
+        changes = original_version.diff( proper_version )
+        productions = original_version.productions()
+        changes.apply( productions )
+
+        self.assertTrue( len( changes ) )
+        self.assertEqual( proper_version.productions(), productions )
+
+    def test_grammarNewSymbolRemembersTheUsedNames(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> a S' | S1 b
+            S' -> a S'' | b
+            S'' -> a
+            S1 -> b S3
+            S3 -> b
+        """ ) )
+
+        self.assertEqual( "S'''", str( firstGrammar.new_symbol( "S" ) ) )
+        self.assertEqual( "S2", str( firstGrammar.new_symbol( "S", True ) ) )
+        self.assertEqual( "S2", str( firstGrammar.new_symbol( "S", True ) ) )
+        self.assertEqual( "S4", str( firstGrammar.new_symbol( "S3", True ) ) )
+
+        for new_symbol_name in ( "S2", "S4", "S5" ):
+            new_symbol = firstGrammar.new_symbol( "S", True )
+            self.assertEqual( new_symbol_name, str( new_symbol ) )
+            firstGrammar.add_production( new_symbol, Production( [Terminal( "c" )], lock=True ) )
+
+        self.assertEqual( "S6", str( firstGrammar.new_symbol( "S3", True ) ) )
+        self.assertEqual( "T1", str( firstGrammar.new_symbol( "T", True ) ) )
+
+        # Removing `S3` also removes `S1`, which only produces it, then, `S1` is free again
+        firstGrammar.remove_start_non_terminal( Production( [NonTerminal( "S3" )], lock=True ) )
+        self.assertEqual( { ( "T", True, 0 ): 0 }, firstGrammar.new_symbols_counters )
+        self.assertEqual( "S1", str( firstGrammar.new_symbol( "S", True ) ) )
+
 
 class TestGrammarLeftRecursionEliminationSymbols(TestingUtilities):
 
@@ -785,6 +1037,51 @@ class TestGrammarLeftRecursionEliminationSymbols(TestingUtilities):
         self.assertTrue( firstGrammar.is_epsilon_free() )
 
 
+    def test_grammarEliminateLeftRecursionExceedingProductionsBudget(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> S a | A b | c
+            A -> S d | A e | f
+        """ ) )
+        firstGrammar.budget = GrammarBudget( maximum_productions=8 )
+
+        self.assertIsNone( firstGrammar.eliminate_left_recursion() )
+        self.assertEqual( 6, firstGrammar.productions_count )
+        self.assertEqual( 10, firstGrammar.symbols_count )
+
+        self.assertTextEqual(
+        r"""
+            + # 1. Eliminating Left Recursion, Beginning
+            +  S -> c | A b | S a
+            +  A -> f | A e | S d
+            +
+            + # 2. Eliminating Infertile Symbols, End
+            + #    No changes performed.
+            +
+            + # 3. Eliminating Unreachable Symbols, End
+            + #    No changes performed.
+            +
+            + # 4. Budget Exceeded, End
+            + #    `eliminate_left_recursion()` exceeded the maximum productions count of 8 (9 productions), the grammar was restored to its state before `eliminate_left_recursion()` started.
+            +  S -> c | A b | S a
+            +  A -> f | A e | S d
+        """, firstGrammar.get_operation_history() )
+
+        firstGrammar.budget = None
+        firstGrammar.eliminate_left_recursion()
+
+        self.assertTextEqual(
+        r"""
+            +  S -> c S' | A b S'
+            +  A -> f A' | c S' d A'
+            + A' -> & | e A' | b S' d A'
+            + S' -> & | a S'
+        """, firstGrammar )
+
+        self.assertEqual( 9, firstGrammar.productions_count )
+        self.assertEqual( 19, firstGrammar.symbols_count )
+
+
 class TestGrammarFactoringElimination(TestingUtilities):
 
     def test_grammarFactorsOfChapter5Example1First(self):
@@ -1566,6 +1863,174 @@ class TestGrammarFactoringElimination(TestingUtilities):
         """, convert_to_text_lines( get_duplicated_elements( firstGrammar.factors() ) ) )
 
 
+    def test_grammarFactoringWithProductionsPrefixOfOthers(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> a b c d | a b c | a b | d
+        """ ) )
+
+        self.assertTrue( firstGrammar.factor_it( 5 ) )
+        self.assertTextEqual(
+        r"""
+            + # 1. Factoring, Beginning
+            +  S -> d | a b | a b c | a b c d
+            +
+            + # 2. Eliminating Direct Factors, End
+            + #    Direct factors eliminated: {S: [a b]}
+            +   S -> d | a b S1
+            +  S1 -> & | c | c d
+            +
+            + # 3. Eliminating Direct Factors, End
+            + #    Direct factors eliminated: {S1: [c]}
+            +   S -> d | a b S1
+            +  S1 -> & | c S2
+            +  S2 -> & | d
+        """, firstGrammar.get_operation_history() )
+
+    def test_grammarFactoringExceedingSymbolsBudget(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> a S b | a S c | a b | a c | a d
+        """ ) )
+        firstGrammar.budget = GrammarBudget( maximum_symbols=12 )
+
+        self.assertFalse( firstGrammar.factor_it( 5 ) )
+        self.assertTextEqual(
+        r"""
+            + # 1. Factoring, Beginning
+            +  S -> a b | a c | a d | a S b | a S c
+            +
+            + # 2. Budget Exceeded, End
+            + #    `eliminate_direct_factors()` exceeded the maximum symbols count of 12 (14 symbols), the grammar was restored to its state before `factor_it()` started.
+            +  S -> a b | a c | a d | a S b | a S c
+        """, firstGrammar.get_operation_history() )
+
+        self.assertTextEqual(
+        r"""
+            + `eliminate_direct_factors()` exceeded the maximum symbols count of 12 (14 symbols)
+        """, str( firstGrammar.last_budget_error ) )
+
+    def test_grammarFactoringExceedingTimeBudgetWithoutNewProductions(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> a S | b
+        """ ) )
+
+        # A deadline already passed, as checking only the new productions would never abort
+        budget = firstGrammar.budget = GrammarBudget( maximum_seconds=1 )
+        budget.start = lambda: setattr( budget, 'deadline', 1 )
+
+        self.assertFalse( firstGrammar.factor_it( 5 ) )
+        self.assertTextEqual(
+        r"""
+            + `factor_it()` exceeded the maximum time of 1 seconds
+        """, str( firstGrammar.last_budget_error ) )
+
+    def test_grammarOperationsCancellation(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> a S b | a S c | a b | a c | a d
+        """ ) )
+        firstGrammar.cancellation_token = CancellationToken()
+
+        self.assertTrue( firstGrammar.factor_it( 5 ) )
+        self.assertEqual( {'S': {'a'}, 'S1': {'a', 'b', 'c', 'd'}, 'S2': {'b', 'c'}}, { str( key ): set( map( str, value ) ) for key, value in firstGrammar.first_terminals().items() } )
+
+        secondGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> a S b | a S c | a b | a c | a d
+        """ ) )
+        secondGrammar.cancellation_token = CancellationToken()
+        secondGrammar.cancellation_token.cancel()
+        self.assertIs( secondGrammar.cancellation_token, secondGrammar.copy().cancellation_token )
+
+        with self.assertRaises( Cancelled ):
+            secondGrammar.factor_it( 5 )
+
+        with self.assertRaises( Cancelled ):
+            secondGrammar.first_terminals()
+
+        with self.assertRaises( Cancelled ):
+            list( secondGrammar.sentences( 3 ) )
+
+    def test_grammarOperationsProgressReporting(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> a S b | a S c | a b | a c | a d
+        """ ) )
+        reports = []
+        firstGrammar.progress_callback = lambda operation_name, progress: reports.append( ( operation_name, progress ) )
+
+        self.assertTrue( firstGrammar.factor_it( 5 ) )
+        self.assertIn( ( "Factoring", { 'step': 1, 'maximum_steps': 5, 'productions_count': 5 } ), reports )
+
+        reports.clear()
+        firstGrammar.copy().first_terminals()
+        self.assertEqual( [1, 2], [progress['sweep'] for operation_name, progress in reports if operation_name == "FIRST terminals"] )
+
+    def test_grammarMergeEquivalentNonTerminals(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S  -> a A | b B | c C | S1
+            A  -> x A1 | y
+            B  -> x B1 | y
+            C  -> x C | y
+            A1 -> d | e
+            B1 -> e | d
+            S1 -> a A | b B | c C | S
+        """ ) )
+        merged_non_terminals = firstGrammar.merge_equivalent_non_terminals()
+
+        self.assertEqual( { 'B': 'A', 'B1': 'A1', 'S1': 'S' }, { str( key ): str( value ) for key, value in merged_non_terminals.items() } )
+        self.assertTextEqual(
+        r"""
+            + # 1. Merging Equivalent Non Terminals, Beginning
+            +   S -> S1 | a A | b B | c C
+            +   A -> y | x A1
+            +   B -> y | x B1
+            +   C -> y | x C
+            +  A1 -> d | e
+            +  B1 -> d | e
+            +  S1 -> S | a A | b B | c C
+            +
+            + # 2. Merging Equivalent Non Terminals, End
+            + #    Merged non terminals: A <- B; A1 <- B1; S <- S1
+            +   S -> a A | b A | c C
+            +   A -> y | x A1
+            +   C -> y | x C
+            +  A1 -> d | e
+        """, firstGrammar.get_operation_history() )
+
+        self.assertEqual( {}, firstGrammar.merge_equivalent_non_terminals() )
+
+    def test_grammarMergeEquivalentNonTerminalsLeavingOnlyTheSelfLoop(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> A b | a
+            A -> C
+            C -> C
+        """ ) )
+        merged_non_terminals = firstGrammar.merge_equivalent_non_terminals()
+
+        self.assertEqual( { 'C': 'A' }, { str( key ): str( value ) for key, value in merged_non_terminals.items() } )
+        self.assertTextEqual(
+        r"""
+            + S -> a
+        """, str( firstGrammar ) )
+
+        secondGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> B
+            A -> C | S b B | a B b
+            B -> B
+            C -> S C
+        """ ) )
+        secondGrammar.merge_equivalent_non_terminals()
+
+        self.assertTrue( all( secondGrammar.productions[start_symbol] for start_symbol in secondGrammar.productions ) )
+        self.assertTrue( secondGrammar.is_empty() )
+
+
 class TestGrammarFirstAndFollow(TestingUtilities):
 
     def test_grammarNonTerminalFirstCalculationOfChapter5Example1First(self):
@@ -1888,6 +2353,107 @@ class TestGrammarFirstAndFollow(TestingUtilities):
         """, dictionary_to_string( follow ) )
 
 
+    def test_ll1ConflictsChapter5Example1(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> Ab | A Bc
+            A -> aA | &
+            B -> bB | Ad | &
+        """ ) )
+        ll1_analyzer = firstGrammar.ll1_analyzer()
+
+        self.assertFalse( firstGrammar.is_factored() )
+        self.assertTextEqual(
+        r"""
+            + FIRST/FIRST conflict on S with `a`: S -> A b | A B c
+            + FIRST/FIRST conflict on S with `b`: S -> A b | A B c
+            + FIRST/FOLLOW conflict on A with `a`: A -> & | a A
+        """, "\n".join( str( conflict ) for conflict in ll1_analyzer.conflicts ) )
+
+    def test_ll1FirstPlusWithoutConflicts(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> a S b | A
+            A -> c A | &
+        """ ) )
+        ll1_analyzer = firstGrammar.ll1_analyzer()
+        first_plus = []
+
+        for non_terminal_id, start_symbol in enumerate( ll1_analyzer.non_terminals ):
+
+            for production, bits in zip( ll1_analyzer.alternatives[non_terminal_id], ll1_analyzer.first_plus[non_terminal_id] ):
+                first_plus.append( "%s -> %s: %s" % ( start_symbol, production,
+                        " ".join( sorted( str( terminal ) for terminal in ll1_analyzer.bitset_terminals( bits ) ) ) ) )
+
+        self.assertTrue( ll1_analyzer.is_ll1() )
+        self.assertTextEqual(
+        r"""
+            + S -> A: $ b c
+            + S -> a S b: a
+            + A -> &: $ b
+            + A -> c A: c
+        """, "\n".join( first_plus ) )
+
+
+    def test_ll1TableRecognizeExpressions(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+             E -> T E1
+            E1 -> + T E1 | &
+             T -> F T1
+            T1 -> * F T1 | &
+             F -> ( E ) | id
+        """ ) )
+        ll1_table = firstGrammar.build_ll1_table()
+
+        self.assertTextEqual(
+        r"""
+            + E, (: E -> T E1
+            + E, id: E -> T E1
+            + F, (: F -> ( E )
+            + F, id: F -> id
+            + T, (: T -> F T1
+            + T, id: T -> F T1
+            + E1, ): E1 -> &
+            + E1, +: E1 -> + T E1
+            + E1, $: E1 -> &
+            + T1, ): T1 -> &
+            + T1, *: T1 -> * F T1
+            + T1, +: T1 -> &
+            + T1, $: T1 -> &
+        """, ll1_table )
+
+        self.assertTrue( ll1_table.recognize( "id" ) )
+        self.assertTrue( ll1_table.recognize( "id + id * ( id + id ) * id" ) )
+        self.assertTrue( ll1_table.recognize( ["(", "id", ")"] ) )
+
+        self.assertFalse( ll1_table.recognize( "&" ) )
+        self.assertFalse( ll1_table.recognize( "id $" ) )
+        self.assertFalse( ll1_table.recognize( "id + * id" ) )
+        self.assertFalse( ll1_table.recognize( "( id + id" ) )
+        self.assertFalse( ll1_table.recognize( "id id" ) )
+
+    def test_ll1TableEmptySentenceAndConflicts(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> a S b | &
+        """ ) )
+        ll1_table = firstGrammar.build_ll1_table()
+
+        self.assertTrue( ll1_table.recognize( "&" ) )
+        self.assertTrue( ll1_table.recognize( "" ) )
+        self.assertTrue( ll1_table.recognize( "a a b b" ) )
+        self.assertFalse( ll1_table.recognize( "a a b" ) )
+
+        secondGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> a S | a
+        """ ) )
+
+        with self.assertRaisesRegex( RuntimeError, "FIRST/FIRST conflict on S with `a`: S -> a | a S" ):
+            secondGrammar.build_ll1_table()
+
+
 class TestGrammarEpsilonConversion(TestingUtilities):
 
     def test_grammarConvertToEpsilonFreeWithTerminalOnTheMiddle(self):
@@ -2167,6 +2733,551 @@ class TestGrammarEpsilonConversion(TestingUtilities):
             + ]
         """, wrap_text( sort_alphabetically_and_by_length( firstGrammar.non_terminal_epsilon() ), wrap=100 ) )
 
+    def test_grammarConvertToEpsilonFreeLazyChapter5Example1First(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> Ab | A Bc
+            A -> aA | &
+            B -> bB | Ad | &
+        """ ) )
+        firstGrammar.convert_to_epsilon_free( lazy=True )
+
+        self.assertTextEqual(
+        r"""
+            + # 1. Converting to Epsilon Free, Beginning
+            +  S -> A b | A B c
+            +  A -> & | a A
+            +  B -> & | A d | b B
+            +
+            + # 2. Converting to Epsilon Free, End
+            + #    Non Terminal's Deriving Epsilon: A -> &; B -> &
+            +  S -> [A] b | [A] [B] c
+            +  A -> a [A]
+            +  B -> [A] d | b [B]
+        """, firstGrammar.get_operation_history() )
+
+        self.assertTextEqual(
+        r"""
+            + S: a b c d
+            + A: a
+            + B: a b d
+        """, dictionary_to_string( firstGrammar.first_terminals() ) )
+
+        self.assertTextEqual(
+        r"""
+            + S: $
+            + A: a b c d
+            + B: c
+        """, dictionary_to_string( firstGrammar.follow_terminals() ) )
+
+        self.assertTrue( firstGrammar.is_epsilon_free() )
+        self.assertTextEqual(
+        r"""
+            +  S -> b | c | A b | A c | B c | A B c
+            +  A -> a | a A
+            +  B -> b | d | A d | b B
+        """, firstGrammar )
+
+        # Printing the grammar expands a copy of it, keeping its compact form
+        self.assertTextEqual(
+        r"""
+            +  S -> [A] b | [A] [B] c
+            +  A -> a [A]
+            +  B -> [A] d | b [B]
+        """, firstGrammar.compact_str() )
+
+    def test_grammarConvertToEpsilonFreeLazyWithOnlyEpsilonSymbols(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> a X Y b | X
+            X -> &
+            Y -> X X | c Y | &
+        """ ) )
+        firstGrammar.convert_to_epsilon_free( lazy=True )
+
+        self.assertTextEqual(
+        r"""
+            +  S -> & | a [Y] b
+            +  Y -> c [Y]
+        """, firstGrammar.compact_str() )
+
+        self.assertFalse( firstGrammar.is_empty() )
+        self.assertTextEqual(
+        r"""
+            +  S -> & | a b | a Y b
+            +  Y -> c | c Y
+        """, firstGrammar )
+
+    def test_grammarConvertToEpsilonFreeLazyFirstWithNullableInitialSymbol(self):
+        grammar_text = wrap_text(
+        r"""
+            S -> & | a
+            A -> & | C a | S S C
+            C -> & | c
+        """ )
+        firstGrammar = ChomskyGrammar.load_from_text_lines( grammar_text )
+        secondGrammar = ChomskyGrammar.load_from_text_lines( grammar_text )
+
+        firstGrammar.convert_to_epsilon_free()
+        secondGrammar.convert_to_epsilon_free( lazy=True )
+
+        # The optional initial symbol keeps its `S -> &`, then, `[S] [S] [C]` derives epsilon
+        self.assertTextEqual(
+        r"""
+            +  S -> & | a
+            +  A -> [C] a | [S] [S] [C]
+            +  C -> c
+        """, secondGrammar.compact_str() )
+
+        first_terminals = { str( key ): sorted( map( str, value ) ) for key, value in firstGrammar.first_terminals().items() }
+        self.assertEqual( ['&', 'a', 'c'], first_terminals['A'] )
+        self.assertEqual( first_terminals, { str( key ): sorted( map( str, value ) ) for key, value in secondGrammar.first_terminals().items() } )
+
+    def test_grammarConvertToEpsilonFreeWithOnlyEpsilonSymbols(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> B A | &
+            A -> &
+            B -> b A B | S c
+        """ ) )
+        firstGrammar.convert_to_epsilon_free()
+
+        self.assertTextEqual(
+        r"""
+            + # 1. Converting to Epsilon Free, Beginning
+            +  S -> & | B A
+            +  A -> &
+            +  B -> S c | b A B
+            +
+            + # 2. Converting to Epsilon Free, End
+            + #    Non Terminal's Deriving Epsilon: S -> &; A -> &
+            +  S' -> & | B
+            +   B -> c | b B | S c
+            +   S -> B
+        """, firstGrammar.get_operation_history() )
+
+        secondGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> A A | &
+            A -> &
+        """ ) )
+        secondGrammar.convert_to_epsilon_free()
+
+        self.assertTextEqual(
+        r"""
+            +  S -> &
+        """, secondGrammar )
+
+
+class TestGrammarChomskyNormalForm(TestingUtilities):
+
+    def test_grammarConvertToChomskyNormalForm(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> a S b | S S | &
+        """ ) )
+        firstGrammar.convert_to_cnf()
+
+        self.assertTextEqual(
+        r"""
+            + # 1. Converting to Chomsky Normal Form, Beginning
+            +  S -> & | S S | a S b
+            +
+            + # 2. Converting to Epsilon Free, End
+            + #    Non Terminal's Deriving Epsilon: S -> &
+            +  S' -> & | S | a b | S S | a S b
+            +   S -> S | a b | S S | a S b
+            +
+            + # 3. Converting to Epsilon Free, End
+            + #    Non Terminal's Deriving Epsilon: S' -> &
+            +  S' -> & | S | a b | S S | a S b
+            +   S -> S | a b | S S | a S b
+            +
+            + # 4. Eliminating Simple Productions, End
+            + #    Simple Non Terminals: S -> {S}; S' -> {S', S}
+            +  S' -> & | a b | S S | a S b
+            +   S -> a b | S S | a S b
+            +
+            + # 5. Eliminating Infertile Symbols, End
+            + #    No changes performed.
+            +
+            + # 6. Eliminating Unreachable Symbols, End
+            + #    No changes performed.
+            +
+            + # 7. Converting to Chomsky Normal Form, End
+            + #    Terminals replaced: T1 -> a; T2 -> b
+            + #    Productions broken: S1 -> S T2
+            +  S' -> & | S S | T1 S1 | T1 T2
+            +   S -> S S | T1 S1 | T1 T2
+            +  S1 -> S T2
+            +  T1 -> a
+            +  T2 -> b
+        """, firstGrammar.get_operation_history() )
+
+        self.assertTrue( firstGrammar.is_cnf() )
+
+    def test_grammarCykRecognizeAmbiguousGrammar(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            E -> E + E | E * E | ( E ) | id
+        """ ) )
+        self.assertFalse( firstGrammar.is_cnf() )
+
+        for use_numpy in ( True, False ):
+            cyk_recognizer = firstGrammar.build_cyk_recognizer( use_numpy )
+
+            self.assertTrue( cyk_recognizer.recognize( "id" ) )
+            self.assertTrue( cyk_recognizer.recognize( "id + id * ( id + id ) * id" ) )
+            self.assertTrue( cyk_recognizer.recognize( ["(", "id", ")"] ) )
+
+            self.assertFalse( cyk_recognizer.recognize( "&" ) )
+            self.assertFalse( cyk_recognizer.recognize( "id + * id" ) )
+            self.assertFalse( cyk_recognizer.recognize( "( id + id" ) )
+            self.assertFalse( cyk_recognizer.recognize( "id id" ) )
+
+        emptyGrammar = ChomskyGrammar.load_from_text_lines( "S -> a S | S" )
+        self.assertFalse( emptyGrammar.build_cyk_recognizer().recognize( "a" ) )
+
+        with self.assertRaisesRegex( RuntimeError, "must be on the Chomsky Normal Form" ):
+            CYKRecognizer( firstGrammar )
+
+
+class TestGrammarGreibachNormalForm(TestingUtilities):
+
+    def test_grammarConvertToGreibachNormalForm(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> A b | &
+            A -> S a | a
+        """ ) )
+        statistics = firstGrammar.convert_to_gnf()
+
+        self.assertTextEqual(
+        r"""
+            +  S' -> & | a T1 | a A' T1
+            +  A' -> b T2 | b T2 A'
+            +  T1 -> b
+            +  T2 -> a
+        """, str( firstGrammar ) )
+
+        self.assertTrue( firstGrammar.is_gnf() )
+        self.assertEqual( ( 'Original grammar', 4, 5 ), statistics[0] )
+        self.assertEqual( ( 'Unuseful symbols eliminated', 7, 12 ), statistics[-1] )
+        self.assertIn( "Productions per step: Original grammar: 4 productions, 5 symbols; ", firstGrammar.get_operation_history() )
+
+    def test_grammarGreibachNormalFormRecognizesTheSameLanguage(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            E -> E + T | T
+            T -> T * F | F
+            F -> ( E ) | id
+        """ ) )
+        self.assertEqual( ['F', 'T', 'E'], [str( symbol ) for symbol in firstGrammar.left_corner_order()] )
+
+        secondGrammar = firstGrammar.copy()
+        secondGrammar.convert_to_gnf()
+
+        self.assertTrue( secondGrammar.is_gnf() )
+        self.assertFalse( secondGrammar.has_left_recursion() )
+
+        first_parser = firstGrammar.build_earley_parser()
+        second_parser = secondGrammar.build_earley_parser()
+
+        for sentence in ( "id", "id + id * ( id + id ) * id", "( ( id ) )", "id + * id", "( id + id", "id id", "&" ):
+            self.assertEqual( first_parser.recognize( sentence ), second_parser.recognize( sentence ), sentence )
+
+    def test_grammarGreibachNormalFormWithoutExpandingTheNullableSymbols(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> & | B | S a B
+            A -> B | B a | S A
+            B -> & | A B
+        """ ) )
+        secondGrammar = firstGrammar.copy()
+        statistics = secondGrammar.convert_to_gnf()
+
+        # Expanding the `A' -> &` productions after eliminating the left recursion, and
+        # substituting the equivalent non terminal's, created about 95000 productions
+        self.assertTrue( secondGrammar.is_gnf() )
+        self.assertEqual( ( 'Unuseful symbols eliminated', 25, 65 ), statistics[-1] )
+
+        first_parser = firstGrammar.build_earley_parser()
+        second_parser = secondGrammar.build_earley_parser()
+
+        for sentence in ( "&", "a", "a a", "a a a a a", "b" ):
+            self.assertEqual( first_parser.recognize( sentence ), second_parser.recognize( sentence ), sentence )
+
+    def test_grammarGreibachNormalFormExceedingBudget(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> A | C b | A A B
+            A -> a S A | B S b | B
+            B -> a C a | C | S A
+            C -> b C | a | A b | a A C
+        """ ) )
+        original_grammar = str( firstGrammar )
+
+        # Without a budget, it takes more than 30 seconds to create more than 18000 productions
+        firstGrammar.budget = GrammarBudget( maximum_symbols=1000 )
+        self.assertIsNone( firstGrammar.convert_to_gnf() )
+        self.assertEqual( original_grammar, str( firstGrammar ) )
+
+        # The exceeding symbols count depends on the productions order, which depends on the sets order
+        self.assertIn( "exceeded the maximum symbols count of 1000 (", str( firstGrammar.last_budget_error ) )
+
+        firstGrammar.budget = GrammarBudget( maximum_seconds=1 )
+        start_time = time.time()
+
+        self.assertIsNone( firstGrammar.convert_to_gnf() )
+        self.assertLess( time.time() - start_time, 5 )
+        self.assertEqual( original_grammar, str( firstGrammar ) )
+
+        self.assertTextEqual(
+        r"""
+            + `convert_to_gnf()` exceeded the maximum time of 1 seconds
+        """, str( firstGrammar.last_budget_error ) )
+
+
+class TestGrammarEarleyParser(TestingUtilities):
+
+    def test_earleyParserAmbiguousExpressionsForest(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            E -> E + E | E * E | ( E ) | id
+        """ ) )
+        earley_parser = firstGrammar.build_earley_parser()
+        parse_forest = earley_parser.parse( "id + id * id" )
+
+        self.assertTextEqual(
+        r"""
+            + E, 0, 5: (E -> E * . E, 0, 4) (E, 4, 5) | (E -> E + . E, 0, 2) (E, 2, 5)
+            + E -> E + . E, 0, 2: (E -> E . + E, 0, 1) (+, 1, 2)
+            + E -> E . + E, 0, 1: (E, 0, 1)
+            + E, 0, 1: (id, 0, 1)
+            + E, 2, 5: (E -> E * . E, 2, 4) (E, 4, 5)
+            + E -> E * . E, 2, 4: (E -> E . * E, 2, 3) (*, 3, 4)
+            + E -> E . * E, 2, 3: (E, 2, 3)
+            + E, 2, 3: (id, 2, 3)
+            + E -> E * . E, 0, 4: (E -> E . * E, 0, 3) (*, 3, 4)
+            + E -> E . * E, 0, 3: (E, 0, 3)
+            + E, 0, 3: (E -> E + . E, 0, 2) (E, 2, 3)
+            + E, 4, 5: (id, 4, 5)
+        """, parse_forest.forest_str() )
+
+        self.assertTrue( parse_forest.is_ambiguous() )
+        self.assertEqual( 2, parse_forest.count_trees() )
+        self.assertEqual( 5, earley_parser.parse( "id + id + id + id" ).count_trees() )
+        self.assertEqual( 1, earley_parser.parse( "( id + id ) * id" ).count_trees() )
+
+        self.assertIsNone( earley_parser.parse( "id + * id" ) )
+        self.assertFalse( earley_parser.recognize( "&" ) )
+        self.assertFalse( earley_parser.recognize( "id id" ) )
+
+        cyclicGrammar = ChomskyGrammar.load_from_text_lines( "S -> S | a" )
+        self.assertEqual( float( 'inf' ), cyclicGrammar.build_earley_parser().parse( "a" ).count_trees() )
+
+    def test_earleyParserStreamingTokensWithEpsilon(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> A B c B
+            A -> a | &
+            B -> a | b | &
+        """ ) )
+        earley_parser = firstGrammar.build_earley_parser()
+
+        self.assertTrue( earley_parser.feed( "a" ) )
+        self.assertFalse( earley_parser.is_accepted() )
+        self.assertTrue( earley_parser.feed( "c" ) )
+        self.assertTrue( earley_parser.is_accepted() )
+        self.assertTrue( earley_parser.feed( "b" ) )
+        self.assertTrue( earley_parser.is_accepted() )
+
+        self.assertTextEqual(
+        r"""
+            + S, 0, 3: (S -> A B c . B, 0, 2) (B, 2, 3)
+            + S -> A B c . B, 0, 2: (S -> A B . c B, 0, 1) (c, 1, 2)
+            + S -> A B . c B, 0, 1: (S -> A . B c B, 0, 0) (B, 0, 1) | (S -> A . B c B, 0, 1) (B, 1, 1)
+            + S -> A . B c B, 0, 1: (A, 0, 1)
+            + A, 0, 1: (a, 0, 1)
+            + B, 1, 1: (&, 1, 1)
+            + S -> A . B c B, 0, 0: (A, 0, 0)
+            + A, 0, 0: (&, 0, 0)
+            + B, 0, 1: (a, 0, 1)
+            + B, 2, 3: (b, 2, 3)
+        """, earley_parser.forest().forest_str() )
+
+        self.assertFalse( earley_parser.feed( "c" ) )
+        self.assertFalse( earley_parser.is_accepted() )
+        self.assertIsNone( earley_parser.forest() )
+
+        earley_parser.reset()
+        self.assertEqual( 1, earley_parser.parse( "c" ).count_trees() )
+        self.assertEqual( 2, earley_parser.parse( "a c" ).count_trees() )
+
+
+class TestGrammarSentencesEnumeration(TestingUtilities):
+
+    def test_sentencesEnumerationOfAmbiguousGrammars(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            E -> E + E | E * E | ( E ) | id
+        """ ) )
+
+        self.assertEqual( ['id', '( id )', 'id * id', 'id + id'], list( firstGrammar.sentences( 3 ) ) )
+        self.assertEqual( 1 + 3 + 11, len( list( firstGrammar.sentences( 6 ) ) ) )
+
+        with self.assertRaisesRegex( RuntimeError, "The grammar language is infinite" ):
+            firstGrammar.sentences()
+
+        secondGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> A B | B A
+            A -> a | &
+            B -> b | S | &
+        """ ) )
+
+        self.assertEqual( ['&', 'a', 'b', 'a a', 'a b', 'b a', 'a a a', 'a a b', 'a b a', 'b a a'],
+                list( secondGrammar.sentences( 3 ) ) )
+
+    def test_sentencesEnumerationOfFiniteLanguage(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> A b B | A
+            A -> a | c | &
+            B -> A A | A
+        """ ) )
+
+        self.assertTextEqual(
+        r"""
+            + &
+            + a
+            + b
+            + c
+            + a b
+            + b a
+            + b c
+            + c b
+            + a b a
+            + a b c
+            + b a a
+            + b a c
+            + b c a
+            + b c c
+            + c b a
+            + c b c
+            + a b a a
+            + a b a c
+            + a b c a
+            + a b c c
+            + c b a a
+            + c b a c
+            + c b c a
+            + c b c c
+        """, "\n".join( firstGrammar.sentences() ) )
+
+        emptyGrammar = ChomskyGrammar.load_from_text_lines( "S -> a S | S" )
+        self.assertEqual( [], list( emptyGrammar.sentences() ) )
+
+        secondEmptyGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> A
+            A -> a B S
+            B -> a a | B b a
+        """ ) )
+        self.assertEqual( [], list( secondEmptyGrammar.sentences() ) )
+
+
+class TestGrammarLanguageCounter(TestingUtilities):
+
+    def test_languageCounterGrowthCurvesAndAmbiguity(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( "E -> E + E | E * E | ( E ) | id" )
+        languageCounter = firstGrammar.build_language_counter()
+
+        self.assertEqual( [0, 1, 0, 3, 0, 15, 0, 93, 0, 645], languageCounter.derivations_by_length( 9 ) )
+        self.assertEqual( languageCounter.derivations( 61 ) % 1000, firstGrammar.build_language_counter( 1000 ).derivations( 61 ) )
+        self.assertIsNone( languageCounter.language_size() )
+        self.assertTextEqual( "+ E -> id | ( E ) | E * E | E + E", str( firstGrammar ) )
+
+        sentences_counts = [0] * 6
+
+        for sentence in firstGrammar.sentences( 5 ):
+            sentences_counts[len( sentence.split() )] += 1
+
+        self.assertEqual( [0, 1, 0, 3, 0, 11], sentences_counts )
+        self.assertIsNone( languageCounter.ambiguous_length( 5 ) )
+        self.assertEqual( 5, languageCounter.ambiguous_length( 5, sentences_counts ) )
+
+        secondGrammar = ChomskyGrammar.load_from_text_lines( "S -> S S | a" )
+        self.assertEqual( 3, secondGrammar.build_language_counter().ambiguous_length( 5 ) )
+
+        thirdGrammar = ChomskyGrammar.load_from_text_lines( "S -> a S b | &" )
+        languageCounter = thirdGrammar.build_language_counter()
+
+        self.assertEqual( [1, 0, 1, 0, 1, 0, 1], languageCounter.derivations_by_length( 6 ) )
+        self.assertIsNone( languageCounter.ambiguous_length( 20 ) )
+
+    def test_languageCounterOnlyCountsTheChomskyNormalFormDerivations(self):
+        # Both grammars are ambiguous, but the conversion to the Chomsky Normal Form merges the
+        # derivations of their simple and epsilon productions
+        firstGrammar = ChomskyGrammar.load_from_text_lines( "S -> A | B\nA -> a\nB -> a" )
+        languageCounter = firstGrammar.build_language_counter()
+
+        self.assertEqual( [0, 1, 0], languageCounter.derivations_by_length( 2 ) )
+        self.assertIsNone( languageCounter.ambiguous_length( 2, [0, 1, 0] ) )
+
+        secondGrammar = ChomskyGrammar.load_from_text_lines( "S -> A A\nA -> a | &" )
+        languageCounter = secondGrammar.build_language_counter()
+
+        self.assertEqual( [1, 1, 1, 0], languageCounter.derivations_by_length( 3 ) )
+        self.assertIsNone( languageCounter.ambiguous_length( 3, [1, 1, 1, 0] ) )
+
+    def test_languageCounterFiniteLanguageSize(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( wrap_text(
+        r"""
+            S -> A b B | A
+            A -> a | c | &
+            B -> A A | A
+        """ ) )
+        languageCounter = firstGrammar.build_language_counter()
+
+        self.assertEqual( 4, languageCounter.longest_length() )
+        self.assertEqual( 24, languageCounter.language_size() )
+        self.assertEqual( [1, 3, 4, 8, 8], languageCounter.derivations_by_length( 4 ) )
+        self.assertEqual( 0, ChomskyGrammar.load_from_text_lines( "S -> a S | S" ).build_language_counter().language_size() )
+
+
+class TestGrammarSentenceSampler(TestingUtilities):
+
+    def test_sentenceSamplerUniformDistribution(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( "S -> a S b | c S | d" )
+        sentenceSampler = firstGrammar.build_sentence_sampler( 3 )
+
+        sentences = [sentence for sentence in firstGrammar.sentences( 7 ) if len( sentence.split() ) == 7]
+        samples = collections.Counter( sentenceSampler.samples( 7, 6500 ) )
+
+        self.assertEqual( 13, len( sentences ) )
+        self.assertEqual( set( sentences ), set( samples ) )
+        self.assertTrue( all( 400 < count < 600 for count in samples.values() ), samples )
+
+        with self.assertRaisesRegex( RuntimeError, "The grammar has no sentences with 0 terminals" ):
+            sentenceSampler.sample( 0 )
+
+    def test_sentenceSamplerSeedsAndProcesses(self):
+        firstGrammar = ChomskyGrammar.load_from_text_lines( "E -> E + E | ( E ) | id" )
+
+        firstSamples = list( firstGrammar.build_sentence_sampler( 5 ).samples( 9, 10 ) )
+        secondSamples = list( firstGrammar.build_sentence_sampler( 5 ).samples( 9, 10 ) )
+
+        self.assertEqual( firstSamples, secondSamples )
+        self.assertTrue( all( len( sample.split() ) == 9 for sample in firstSamples ) )
+
+        firstSamples = list( firstGrammar.build_sentence_sampler( 5 ).samples( 9, 20, processes=2 ) )
+        secondSamples = list( firstGrammar.build_sentence_sampler( 5 ).samples( 9, 20, processes=2 ) )
+
+        self.assertEqual( 20, len( firstSamples ) )
+        self.assertEqual( firstSamples, secondSamples )
+        self.assertTrue( all( firstGrammar.build_earley_parser().recognize( sample ) for sample in firstSamples ) )
+
 
 class TestGrammarFertileSymbols(TestingUtilities):
 
@@ -3430,6 +4541,114 @@ class TestGrammarTreeParsing(TestingUtilities):
         """, firstGrammar.pretty() )
 
 
+class TestGrammarOperationsWorkerProcess(TestingUtilities):
+
+    def test_grammarOperationOnWorkerProcess(self):
+        grammar_text = "S -> a S b | a S c | S S | c | A\nA -> a A | &"
+
+        function = lambda: None
+        function.cancellation_token = CancellationToken()
+        function.progress_callback = None
+        function.history_sink = FileHistorySink()
+        grammar_operations.try_to_factor_grammar( function, grammar_text, 5 )
+        function.history_sink.close()
+
+        worker_pool = WorkerPool( 1 )
+        worker = worker_pool.acquire()
+        history_sink = FileHistorySink()
+
+        try:
+            worker.connection.send( ( grammar_operations.try_to_factor_grammar, grammar_text, ( 5, ), history_sink.file_path ) )
+            messages = []
+
+            while not messages or messages[-1][0] not in ( "results", "error" ):
+                messages.append( worker.connection.recv() )
+
+            self.assertEqual( "results", messages[-1][0] )
+            self.assertTextEqual( function.results, messages[-1][1] )
+            self.assertEqual( function.history_sink.offsets, messages[-1][2] )
+
+            history_sink.offsets = messages[-1][2]
+            self.assertEqual( len( function.history_sink ), len( history_sink.read_entries( 0, len( history_sink ) ) ) )
+
+            worker.connection.send( ( grammar_operations.calculate_first_and_follow, "S -> -> a", (), None ) )
+            self.assertEqual( "error", worker.connection.recv()[0] )
+            worker_pool.release( worker )
+
+        finally:
+            history_sink.close()
+            worker_pool.close()
+
+
+class TestGrammarOperationsLiveAnalysis(TestingUtilities):
+
+    def setUp(self):
+        super().setUp()
+        self.function = lambda: None
+        self.function.cancellation_token = CancellationToken()
+        self.function.progress_callback = None
+
+    def test_analyzeGrammarUselessSymbols(self):
+        grammar_operations.analyze_grammar( self.function, "S -> a S | B | C\nB -> b B\nC -> c\nD -> d" )
+
+        self.assertTextEqual(
+        r"""
+            + # Is NOT Empty.
+            + # Has the following Useless Symbols, infertile: B, unreachable: D
+            + # Has NO Left Recursion.
+            + # Has NO LL(1) conflicts.
+        """, self.function.results )
+
+    def test_analyzeGrammarUselessSymbolsOnlyReachableByInfertileProductions(self):
+        grammar_operations.analyze_grammar( self.function, "S -> a | B C\nB -> b B\nC -> c", ( "Useless Symbols", ) )
+
+        self.assertTextEqual(
+        r"""
+            + # Has the following Useless Symbols, infertile: B, unreachable: C
+        """, self.function.results )
+
+    def test_analyzeGrammarInvalidGrammar(self):
+        grammar_operations.analyze_grammar( self.function, "S -> -> a", ( "Emptiness", ) )
+        self.assertTrue( self.function.results.startswith( "# The grammar is not valid yet:" ) )
+
+    def test_analyzeGrammarCancelled(self):
+        self.function.cancellation_token.cancel()
+
+        with self.assertRaises( Cancelled ):
+            grammar_operations.analyze_grammar( self.function, "S -> S a | b" )
+
+
+class TestLinesFileModel(TestingUtilities):
+
+    def test_linesFileModelGrowingFile(self):
+        file_descriptor, file_path = tempfile.mkstemp( suffix=".txt", prefix="grammar_results_" )
+
+        with open( file_descriptor, 'w', encoding='utf-8', newline='\n' ) as file:
+            lines_model = LinesFileModel( file_path )
+            self.assertEqual( 0, lines_model.rowCount() )
+
+            file.write( "S -> a S | b\n\na b" )
+            file.flush()
+            lines_model.refresh()
+            self.assertEqual( 3, lines_model.rowCount() )
+            self.assertEqual( ["S -> a S | b", "", "a b"], [lines_model.line( row ) for row in range( 3 )] )
+
+            file.write( " ç\na a b\n" )
+            file.flush()
+            lines_model.refresh()
+            self.assertEqual( 4, lines_model.rowCount() )
+            self.assertEqual( ["a b ç", "a a b"], [lines_model.line( row ) for row in range( 2, 4 )] )
+            self.assertEqual( len( "S -> a S | b" ), lines_model.maximum_line_length )
+
+            self.assertEqual( 0, lines_model.find( "a" ) )
+            self.assertEqual( 2, lines_model.find( "a", 1 ) )
+            self.assertEqual( 3, lines_model.find( "a a" ) )
+            self.assertEqual( -1, lines_model.find( "S", 1 ) )
+            lines_model.close()
+
+        os.remove( file_path )
+
+
 class TestProduction(TestingUtilities):
 
     def setUp(self):
@@ -0,0 +1,341 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Licensing
+#
+# Grammar Operations of the User Interface
+# Copyright (C) 2018 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+    The operations run by the main window buttons, as module level functions, then, they can be
+    sent by `pickle` to a worker process, see `process_backend.py`, without importing PyQt.
+
+    Each operation is called as `operation( function, grammar_text, *arguments )`, where the
+    `function` has the `cancellation_token`, `progress_callback` and optional `history_sink` for
+    the grammar, and the `send_string_signal` to stream partial results, then, the operation sets
+    its final results on `function.results`.
+"""
+
+import time
+
+from grammar.grammar import ChomskyGrammar
+from grammar.symbols import HISTORY_KEY_LINE
+from grammar.cancellation import Cancelled
+
+from debug_tools.utilities import sort_correctly
+from debug_tools.utilities import convert_to_text_lines
+from debug_tools.utilities import dictionary_to_string
+
+from debug_tools import getLogger
+
+log = getLogger( 127, __name__ )
+
+
+## The names of the cheap analyses `analyze_grammar()` can run, as the live analysis panel does
+## while the grammar is edited
+LIVE_ANALYSES = ( "Emptiness", "Useless Symbols", "Left Recursion", "LL(1) Conflicts" )
+
+
+def load_grammar(function, grammar_text):
+    """
+        Return the grammar of the `grammar_text`, reporting to the `function` it is run by.
+    """
+    firstGrammar = ChomskyGrammar.load_from_text_lines( grammar_text )
+    firstGrammar.cancellation_token = function.cancellation_token
+    firstGrammar.progress_callback = function.progress_callback
+
+    if hasattr( function, 'history_sink' ):
+        firstGrammar.history_sink = function.history_sink
+
+    return firstGrammar
+
+
+def get_history_string(firstGrammar, extra_lines="\n\n\n"):
+    firstGrammar.finish_history()
+    return "%s%s" % ( extra_lines, HISTORY_KEY_LINE )
+
+
+def calculate_first_and_follow(function, grammar_text):
+    results = []
+    firstGrammar = load_grammar( function, grammar_text )
+    results.append( str( firstGrammar ) )
+
+    first_terminals = firstGrammar.first_terminals()
+    first_non_terminals = firstGrammar.first_non_terminals()
+    follow_terminals = firstGrammar.follow_terminals( first_terminals )
+
+    results.append( "\n\n# Has the following Terminal's FIRST\n" )
+    results.append( dictionary_to_string( first_terminals ) )
+
+    results.append( "\n\n# And Non Terminal's FIRST\n" )
+    results.append( dictionary_to_string( first_non_terminals ) )
+
+    results.append( "\n\n# And Terminal's FOLLOW\n" )
+    results.append( dictionary_to_string( follow_terminals ) )
+
+    function.results = "".join( results )
+
+
+def is_grammar_factored(function, grammar_text):
+    results = []
+    firstGrammar = load_grammar( function, grammar_text )
+    results.append( str( firstGrammar ) )
+
+    ll1_analyzer = firstGrammar.ll1_analyzer()
+    has_left_recursion = firstGrammar.has_left_recursion()
+
+    if not has_left_recursion and not ll1_analyzer.has_first_first_conflicts():
+        results.append( "\n\n# Is Factored!" )
+
+    else:
+        results.append( "\n\n# Is NOT Factored!" )
+
+    if has_left_recursion:
+        results.append( "\n\n# It does still has left recursion" )
+
+    if ll1_analyzer.conflicts:
+        results.append( "\n\n# It does still has the following LL(1) conflict(s)\n" )
+        results.append( "\n".join( str( conflict ) for conflict in ll1_analyzer.conflicts ) )
+
+    else:
+        results.append( "\n\n# It has no LL(1) conflicts" )
+
+    function.results = "".join( results )
+
+
+def try_to_factor_grammar(function, grammar_text, maximumSteps):
+    results = []
+    firstGrammar = load_grammar( function, grammar_text )
+    results.append( str( firstGrammar ) )
+
+    was_factored = firstGrammar.factor_it( maximumSteps )
+
+    if was_factored:
+        results.append( "\n\n# It was successfully factored in `%s` steps!" % firstGrammar.last_factoring_step )
+        results.append( "\n\n# The new factored grammar is:" )
+
+    else:
+        factors = firstGrammar.factors()
+        results.append( "\n\n# It could not be successfully factored in `%s` steps!\n\n" % maximumSteps )
+        results.append( "\n\n# Does still has the following factor/nondeterminism(s)\n" )
+
+        results.append( convert_to_text_lines( factors, sort=sort_correctly ) )
+        results.append( "\n\n# The last non factored grammar produced was:" )
+
+    results.append( "\n" )
+    results.append( str( firstGrammar ) )
+
+    results.append( get_history_string( firstGrammar ) )
+    function.results = "".join( results )
+
+
+def recognize_sentences(function, grammar_text, inputSentences):
+    results = []
+    firstGrammar = load_grammar( function, grammar_text )
+    results.append( str( firstGrammar ) )
+
+    ll1_table = firstGrammar.build_ll1_table()
+    results.append( "\n\n# Has the following LL(1) parsing table\n" )
+    results.append( str( ll1_table ) )
+    results.append( "\n\n# And recognizes the following sentences\n" )
+
+    for sentence in inputSentences.split( "\n" ):
+        sentence = sentence.strip()
+
+        if not sentence or sentence.startswith( "#" ):
+            continue
+
+        results.append( "\n%s: %s" % ( "Accepted" if ll1_table.recognize( sentence ) else "Rejected", sentence ) )
+
+    function.results = "".join( results )
+
+
+def generate_sentences(function, grammar_text, maximumLength):
+    firstGrammar = load_grammar( function, grammar_text )
+    function.send_string_signal.emit( str( firstGrammar ) )
+    function.send_string_signal.emit( "\n# Generates the following sentences with up to `%s` terminals\n" % maximumLength )
+
+    sentences = []
+    sentences_count = 0
+    last_sending_time = time.perf_counter()
+
+    try:
+
+        # Send the sentences in batches, as each dialog update also repaints it
+        for sentence in firstGrammar.sentences( maximumLength ):
+
+            if function.cancellation_token.is_cancelled:
+                break
+
+            sentences.append( sentence )
+            sentences_count += 1
+
+            if len( sentences ) > 999 or time.perf_counter() - last_sending_time > 0.2:
+                function.send_string_signal.emit( "\n".join( sentences ) )
+                last_sending_time = time.perf_counter()
+                sentences.clear()
+
+    # Stopped while the sentences of the next length were being computed
+    except Cancelled:
+        pass
+
+    if sentences:
+        function.send_string_signal.emit( "\n".join( sentences ) )
+
+    function.results = "\n# Generated `%s` sentences%s." % ( sentences_count, " before being stopped" if function.cancellation_token.is_cancelled else "" )
+
+
+def eliminate_left_recursion(function, grammar_text):
+    results = []
+    firstGrammar = load_grammar( function, grammar_text )
+    results.append( str( firstGrammar ) )
+
+    left_recursion = firstGrammar.left_recursion()
+    has_left_recursion = firstGrammar.has_left_recursion()
+    firstGrammar.eliminate_left_recursion()
+
+    if has_left_recursion:
+        results.append( "\n\n# Has the following Left Recursion(s)\n" )
+        results.append( convert_to_text_lines( left_recursion, sort=sort_correctly ) )
+
+        results.append( "\n\n# And has the following Left Recursion Free Grammar:\n" )
+        results.append( str( firstGrammar ) )
+
+    else:
+        results.append( "\n\n# Has NO Left Recursion." )
+
+    results.append( get_history_string( firstGrammar ) )
+    function.results = "".join( results )
+
+
+def check_grammar_property(function, grammar_text, method_name, property_name, inverse_boolean=False):
+    """
+        Calls the `ChomskyGrammar` method `method_name`, as `is_empty`, which returns whether the
+        grammar has the `property_name`.
+    """
+    results = []
+    firstGrammar = load_grammar( function, grammar_text )
+    is_empty = getattr( firstGrammar, method_name )()
+
+    results.append( str( firstGrammar ) )
+    results.append( "\n\n# Is %s%s.\n" % ( "" if (not is_empty if inverse_boolean else is_empty) else "NOT ", property_name ) )
+    function.results = "".join( results )
+
+
+def classify_grammar_language(function, grammar_text):
+    results = []
+    firstGrammar = load_grammar( function, grammar_text )
+    language_class = firstGrammar.classify_language()
+
+    results.append( str( firstGrammar ) )
+    results.append( "\n\n# Is %s.\n" % ( language_class ) )
+    function.results = "".join( results )
+
+
+def convert_to_proper_grammar(function, grammar_text):
+    results = []
+    firstGrammar = load_grammar( function, grammar_text )
+    results.append( str( firstGrammar ) )
+
+    non_terminal_epsilon = firstGrammar.non_terminal_epsilon()
+    fertile = firstGrammar.fertile()
+    reachable = firstGrammar.reachable()
+    simple_non_terminals = firstGrammar.simple_non_terminals()
+    firstGrammar.convert_to_proper()
+
+    results.append( "\n\n# Has the following Proper version:\n" )
+    results.append( str( firstGrammar ) )
+
+    results.append( "\n\n# It has the following Non Terminal Epsilon set (Ne):\n" )
+    results.append( convert_to_text_lines( non_terminal_epsilon ) )
+
+    results.append( "\n\n# It has the following Fertile Non Terminal's set (Nf):\n" )
+    results.append( convert_to_text_lines( fertile ) )
+
+    results.append( "\n\n# It has the following Reachable Symbols' set (Vi):\n" )
+    results.append( convert_to_text_lines( reachable ) )
+
+    results.append( "\n\n# It has the following Simple Non Terminal's set (Na):\n" )
+    results.append( dictionary_to_string( simple_non_terminals ) )
+
+    results.append( get_history_string( firstGrammar ) )
+    function.results = "".join( results )
+
+
+def analyze_grammar(function, grammar_text, analyses=LIVE_ANALYSES):
+    """
+        Runs the `analyses` of `LIVE_ANALYSES` with the grammar, reporting an invalid grammar as
+        its results, instead of raising an error, as it is run while the grammar is being typed.
+    """
+    results = []
+
+    try:
+        firstGrammar = load_grammar( function, grammar_text )
+
+    except Exception as error:
+        function.results = "# The grammar is not valid yet:\n%s" % error
+        return
+
+    # The emptiness and useless symbols are computed first, as the other analyses expand the
+    # grammar optional symbols
+    if "Emptiness" in analyses:
+        is_empty = firstGrammar.initial_symbol not in firstGrammar.fertile()
+        results.append( "# Is %sEmpty." % ( "" if is_empty else "NOT " ) )
+
+    if "Useless Symbols" in analyses:
+        function.cancellation_token.check()
+        fertile = firstGrammar.fertile()
+
+        # As `eliminate_unuseful()`, the symbols only reachable by infertile productions are
+        # also unreachable, then, the reachable ones are computed after eliminating them
+        fertileGrammar = firstGrammar.copy()
+        fertileGrammar.eliminate_infertile()
+        reachable = fertileGrammar.reachable()
+
+        infertile = [symbol for symbol in firstGrammar.productions if symbol not in fertile]
+        unreachable = [symbol for symbol in firstGrammar.productions if symbol in fertile and symbol not in reachable]
+
+        if infertile or unreachable:
+            results.append( "# Has the following Useless Symbols, infertile: %s, unreachable: %s" % (
+                    ", ".join( str( symbol ) for symbol in infertile ) or "none",
+                    ", ".join( str( symbol ) for symbol in unreachable ) or "none" ) )
+
+        else:
+            results.append( "# Has NO Useless Symbols." )
+
+    if "Left Recursion" in analyses:
+        function.cancellation_token.check()
+        left_recursion = firstGrammar.left_recursion()
+
+        if left_recursion:
+            results.append( "# Has the following Left Recursion(s)\n%s" % convert_to_text_lines( left_recursion, sort=sort_correctly ) )
+
+        else:
+            results.append( "# Has NO Left Recursion." )
+
+    if "LL(1) Conflicts" in analyses:
+        function.cancellation_token.check()
+        ll1_analyzer = firstGrammar.ll1_analyzer()
+
+        if ll1_analyzer.conflicts:
+            results.append( "# Has the following LL(1) conflict(s)\n%s" % "\n".join( str( conflict ) for conflict in ll1_analyzer.conflicts ) )
+
+        else:
+            results.append( "# Has NO LL(1) conflicts." )
+
+    function.results = "\n".join( results )
@@ -64,7 +64,7 @@ class IntegerInputDialog(QMainWindow):
         https://stackoverflow.com/questions/27420338/how-to-clear-child-window-reference-stored-in-parent-application-when-child-wind
     """
 
-    def __init__(self, parent, settings, fontOptions):
+    def __init__(self, parent, settings, fontOptions, inputMessage):
         super().__init__( parent )
         self.result = 0
 
@@ -107,7 +107,7 @@ class IntegerInputDialog(QMainWindow):
         self.textEditWidget.installEventFilter( self )
 
         # Set initial value of text
-        self.textEditWidget.document().setPlainText( "# Write here bellow, an integer with the number of steps\n\n5" )
+        self.textEditWidget.document().setPlainText( inputMessage )
         self.textEditWidget.selectAll()
 
         # OK and Cancel buttons
@@ -187,12 +187,12 @@ class IntegerInputDialog(QMainWindow):
 
     # static method to create the dialog and return ( date, time, accepted )
     @classmethod
-    def getNewUserInput(cls, parent, settings, fontOptions):
+    def getNewUserInput(cls, parent, settings, fontOptions, inputMessage="# Write here bellow, an integer with the number of steps\n\n5"):
         result = 1
         integer = 5
 
         while result:
-            dialog = IntegerInputDialog( parent, settings, fontOptions )
+            dialog = IntegerInputDialog( parent, settings, fontOptions, inputMessage )
             result = dialog.exec_()
 
             if result:
@@ -0,0 +1,208 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Licensing
+#
+# Lines File Model
+# Copyright (C) 2018 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import mmap
+import array
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtCore import QSize
+from PyQt5.QtCore import QModelIndex
+from PyQt5.QtCore import QAbstractListModel
+
+from debug_tools import getLogger
+
+log = getLogger( 127, __name__ )
+
+
+class LinesFileModel(QAbstractListModel):
+    """
+        Displays each line of an UTF-8 text file as a row of a `QListView`, without loading the
+        file, as it can have millions of lines.
+
+        The file is memory mapped, and only the byte offset of each line start is kept, then,
+        each line is only decoded when the view displays it. The file can keep growing, as
+        while the results are streamed to it, see `refresh()`.
+    """
+
+    def __init__(self, file_path, parent=None):
+        super().__init__( parent )
+
+        ## The path of the text file displayed
+        self.file_path = file_path
+
+        ## The memory map of the file, or None while it is empty
+        self.file_map = None
+
+        ## The byte offset of each line start, and the end of the last complete line
+        self.line_starts = array.array( 'q', [0] )
+
+        ## The file size when it was last mapped
+        self.file_size = 0
+
+        ## The bytes count of the longest line, which is the width of all rows, as the views use
+        ## uniform rows sizes, then, they do not ask the size of each row
+        self.maximum_line_length = 0
+
+        ## The width of one character and the height of one line, to compute the rows size, see
+        ## `set_character_size()`
+        self.character_size = None
+
+        self.refresh()
+
+    def refresh(self):
+        """
+            Maps again the file if it has grown since, indexing its new lines, and updating the
+            views of this model.
+        """
+        file_size = os.path.getsize( self.file_path )
+
+        if file_size <= self.file_size:
+            return
+
+        old_rows_count = self.rowCount()
+        self._close_map()
+
+        with open( self.file_path, 'rb' ) as file:
+            self.file_map = mmap.mmap( file.fileno(), 0, access=mmap.ACCESS_READ )
+
+        file_map = self.file_map
+        line_starts = array.array( 'q' )
+        line_start = self.line_starts[-1]
+        line_end = file_map.find( b"\n", line_start )
+        maximum_line_length = self.maximum_line_length
+
+        while line_end > -1:
+            maximum_line_length = max( maximum_line_length, line_end - line_start )
+            line_start = line_end + 1
+            line_starts.append( line_start )
+            line_end = file_map.find( b"\n", line_start )
+
+        # The last line, which does not end with a new line yet
+        maximum_line_length = max( maximum_line_length, file_size - line_start )
+
+        if maximum_line_length > self.maximum_line_length:
+            self.maximum_line_length = maximum_line_length
+            self.layoutAboutToBeChanged.emit()
+            self.layoutChanged.emit()
+
+        # The last line was incomplete, and its new end must be displayed
+        if old_rows_count and self.line_starts[-1] < self.file_size:
+            self.dataChanged.emit( self.index( old_rows_count - 1 ), self.index( old_rows_count - 1 ) )
+
+        new_rows_count = self._rows_count( len( self.line_starts ) + len( line_starts ), line_starts[-1] if line_starts else self.line_starts[-1], file_size )
+
+        if new_rows_count > old_rows_count:
+            self.beginInsertRows( QModelIndex(), old_rows_count, new_rows_count - 1 )
+            self.line_starts.extend( line_starts )
+            self.file_size = file_size
+            self.endInsertRows()
+
+        else:
+            self.line_starts.extend( line_starts )
+            self.file_size = file_size
+
+    @staticmethod
+    def _rows_count(line_starts_count, last_line_start, file_size):
+        """
+            Return how many lines there are, given the count of line starts, where the last one is
+            after the end of the file, unless its last line does not end with a new line.
+        """
+        return line_starts_count if last_line_start < file_size else line_starts_count - 1
+
+    def rowCount(self, parent=QModelIndex()):
+
+        if parent.isValid():
+            return 0
+
+        return self._rows_count( len( self.line_starts ), self.line_starts[-1], self.file_size )
+
+    def data(self, index, role=Qt.DisplayRole):
+
+        if not index.isValid():
+            return None
+
+        if role == Qt.DisplayRole:
+            return self.line( index.row() )
+
+        if role == Qt.SizeHintRole and self.character_size is not None:
+            character_width, line_height = self.character_size
+            return QSize( character_width * ( self.maximum_line_length + 2 ), line_height )
+
+    def set_character_size(self, character_width, line_height):
+        """
+            Sets the size of the characters of the font used by the views, which are expected to
+            be monospaced, then, the rows are as wide as the longest line.
+        """
+        self.character_size = ( character_width, line_height )
+
+    def line(self, row):
+        """
+            Return the text of the line `row`, where the first line is 0.
+        """
+        line_starts = self.line_starts
+        line_start = line_starts[row]
+        line_end = line_starts[row + 1] - 1 if row + 1 < len( line_starts ) else self.file_size
+
+        return self.file_map[line_start:line_end].decode( 'utf-8', errors='replace' ).rstrip( "\r" )
+
+    def find(self, text, start_row=0):
+        """
+            Return the first row starting from `start_row` which has the `text`, searching the
+            memory mapped file directly, or -1 if there is none.
+        """
+        rows_count = self.rowCount()
+
+        if not text or start_row >= rows_count:
+            return -1
+
+        position = self.file_map.find( text.encode( 'utf-8' ), self.line_starts[start_row], self.file_size )
+
+        if position < 0:
+            return -1
+
+        # The row whose start is the last one before the text position
+        lower_row, upper_row = start_row, rows_count - 1
+
+        while lower_row < upper_row:
+            middle_row = ( lower_row + upper_row + 1 ) // 2
+
+            if self.line_starts[middle_row] <= position:
+                lower_row = middle_row
+
+            else:
+                upper_row = middle_row - 1
+
+        return lower_row
+
+    def _close_map(self):
+
+        if self.file_map is not None:
+            self.file_map.close()
+            self.file_map = None
+
+    def close(self):
+        """
+            Releases the memory map of the file, which must be done before deleting it.
+        """
+        self._close_map()
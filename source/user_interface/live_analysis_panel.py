@@ -0,0 +1,198 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Licensing
+#
+# Live Analysis Panel
+# Copyright (C) 2018 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from PyQt5.QtCore import QTimer
+
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtWidgets import QLabel
+from PyQt5.QtWidgets import QCheckBox
+from PyQt5.QtWidgets import QPlainTextEdit
+from PyQt5.QtWidgets import QVBoxLayout
+from PyQt5.QtWidgets import QHBoxLayout
+
+from grammar.cancellation import CancellationToken
+
+from .utilities import ignore_exceptions
+from .grammar_operations import analyze_grammar
+from .grammar_operations import LIVE_ANALYSES
+from .run_function_async import RunFunctionAsyncThread
+from .run_function_async import RunFunctionInProcessThread
+
+from debug_tools import getLogger
+
+log = getLogger( 127, __name__ )
+
+
+class LiveAnalysisPanel(QWidget):
+    """
+        Displays the results of the `grammar_operations.LIVE_ANALYSES` checked by the user, run
+        on background after the grammar stops being edited for `ANALYSIS_DELAY` milliseconds,
+        instead of waiting for the results dialog of each operation.
+
+        When the grammar is edited again, the analysis still running is cancelled by its
+        `CancellationToken`, then, only the results of the last grammar are displayed.
+    """
+
+    ## How many milliseconds after the last edit the grammar is analyzed
+    ANALYSIS_DELAY = 700
+
+    def __init__(self, parent, settings, fontOptions):
+        super().__init__( parent )
+        self.settings = settings
+
+        ## The `WorkerPool` running the analyses, or None to run them on threads
+        self.workerPool = None
+
+        ## The grammar text to analyze, and the last one analyzed, which is not analyzed again
+        self.grammarText = None
+        self.lastAnalyzedText = None
+
+        ## The function of the analysis running, if any, whose results are not displayed after it
+        ## was cancelled, see `handleAnalysisFinished()`
+        self.runningFunction = None
+
+        ## The threads of the analyses still running, including the cancelled ones
+        self.runningThreads = set()
+
+        self.analysisTimer = QTimer( self )
+        self.analysisTimer.setSingleShot( True )
+        self.analysisTimer.setInterval( self.ANALYSIS_DELAY )
+        self.analysisTimer.timeout.connect( self.startAnalysis )
+
+        self.resultsTextEditWidget = QPlainTextEdit( self )
+        self.resultsTextEditWidget.setStyleSheet( fontOptions )
+        self.resultsTextEditWidget.setLineWrapMode( QPlainTextEdit.NoWrap )
+        self.resultsTextEditWidget.setReadOnly( True )
+        self.resultsTextEditWidget.setMaximumHeight( 150 )
+
+        self.statusLabel = QLabel()
+        self.analysesLayout = QHBoxLayout()
+        self.analysesCheckBoxes = {}
+
+        for analysis in LIVE_ANALYSES:
+            analysisCheckBox = QCheckBox( analysis )
+            analysisCheckBox.setChecked( settings.value( "liveAnalysis%s" % analysis, True, type=bool ) )
+            analysisCheckBox.toggled.connect( self.handleAnalysesChanged )
+
+            self.analysesCheckBoxes[analysis] = analysisCheckBox
+            self.analysesLayout.addWidget( analysisCheckBox )
+
+        self.analysesLayout.addStretch()
+        self.analysesLayout.addWidget( self.statusLabel )
+
+        self.verticalLayout = QVBoxLayout( self )
+        self.verticalLayout.setContentsMargins( 0, 0, 0, 0 )
+        self.verticalLayout.addLayout( self.analysesLayout )
+        self.verticalLayout.addWidget( self.resultsTextEditWidget )
+
+    def getAnalyses(self):
+        return tuple( analysis for analysis in LIVE_ANALYSES if self.analysesCheckBoxes[analysis].isChecked() )
+
+    def scheduleAnalysis(self, grammarText):
+        """
+            Analyzes the `grammarText` after `ANALYSIS_DELAY`, unless this is called again before,
+            cancelling the analysis running, as its results are already stale.
+        """
+        self.grammarText = grammarText
+        self.cancelAnalysis()
+        self.analysisTimer.start()
+
+    def cancelAnalysis(self):
+        self.analysisTimer.stop()
+
+        if self.runningFunction is not None:
+            self.runningFunction.cancellation_token.cancel()
+            self.runningFunction = None
+            self.statusLabel.setText( "" )
+
+    @ignore_exceptions
+    def handleAnalysesChanged(self, isChecked):
+
+        for analysis, analysisCheckBox in self.analysesCheckBoxes.items():
+            self.settings.setValue( "liveAnalysis%s" % analysis, analysisCheckBox.isChecked() )
+
+        self.lastAnalyzedText = None
+
+        if self.grammarText is not None:
+            self.scheduleAnalysis( self.grammarText )
+
+    @ignore_exceptions
+    def startAnalysis(self):
+        grammarText = self.grammarText
+        analyses = self.getAnalyses()
+
+        if ( grammarText, analyses ) == self.lastAnalyzedText:
+            return
+
+        def function():
+            analyze_grammar( function, grammarText, analyses )
+
+        function.results = ""
+        function.cancellation_token = CancellationToken()
+        function.operation = analyze_grammar
+        function.grammar_text = grammarText
+        function.arguments = ( analyses, )
+
+        if self.workerPool is None:
+            analysisThread = RunFunctionAsyncThread( function, "", self )
+
+        else:
+            analysisThread = RunFunctionInProcessThread( function, "", self, self.workerPool )
+
+        analysisThread.set_progress_signal.connect( self.setProgressText )
+        analysisThread.finished.connect( lambda: self.handleAnalysisFinished( analysisThread, function ) )
+
+        self.runningFunction = function
+        self.runningThreads.add( analysisThread )
+        self.statusLabel.setText( "Analyzing..." )
+        analysisThread.start()
+
+    @ignore_exceptions
+    def setProgressText(self, progressText):
+
+        if progressText and self.runningFunction is not None:
+            self.statusLabel.setText( "Analyzing... %s" % progressText )
+
+    @ignore_exceptions
+    def handleAnalysisFinished(self, analysisThread, function):
+        self.runningThreads.discard( analysisThread )
+
+        if function.cancellation_token.is_cancelled:
+            return
+
+        self.runningFunction = None
+        self.lastAnalyzedText = ( function.grammar_text, function.arguments[0] )
+        self.statusLabel.setText( "" )
+        self.resultsTextEditWidget.document().setPlainText( function.results )
+
+    def close(self):
+        """
+            Cancels the analyses running, and waits for them to stop.
+        """
+        self.cancelAnalysis()
+
+        for analysisThread in list( self.runningThreads ):
+            analysisThread.function.cancellation_token.cancel()
+            analysisThread.wait()
+
+        return super().close()
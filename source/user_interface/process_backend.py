@@ -0,0 +1,201 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Licensing
+#
+# Worker Processes for the Grammar Operations
+# Copyright (C) 2018 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import time
+import threading
+import multiprocessing
+
+from grammar.history_sink import FileHistorySink
+from grammar.cancellation import CancellationToken
+
+from debug_tools import getLogger
+
+log = getLogger( 127, __name__ )
+
+
+class PipeSignal(object):
+    """
+        Sends each emitted string through the worker process pipe, as the `send_string_signal` of
+        the `RunFunctionAsyncThread` does to the results dialog.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def emit(self, text):
+        self.connection.send( ( "text", text ) )
+
+
+class WorkerFunction(object):
+    """
+        The `function` the grammar operations are run with on a worker process, see
+        `grammar_operations.py`, which sends their partial results and progress through the pipe.
+    """
+
+    ## The minimum seconds between two progress reports sent through the pipe
+    PROGRESS_INTERVAL = 0.25
+
+    def __init__(self, connection, history_file):
+        """
+            `history_file` the path of the `FileHistorySink` file of the results dialog, or None.
+        """
+        self.connection = connection
+        self.results = ""
+        self.send_string_signal = PipeSignal( connection )
+        self.last_progress_time = 0.0
+
+        ## The worker process is killed to stop the operation, then, this is never cancelled
+        self.cancellation_token = CancellationToken()
+
+        if history_file is not None:
+            self.history_sink = FileHistorySink( history_file )
+
+    def progress_callback(self, operation_name, progress):
+        current_time = time.perf_counter()
+
+        if current_time - self.last_progress_time >= self.PROGRESS_INTERVAL:
+            self.last_progress_time = current_time
+            self.connection.send( ( "progress", operation_name, progress ) )
+
+    def close(self):
+        """
+            Return the offsets of the history entries written, see `FileHistorySink.offsets`, or
+            None if there is no history.
+        """
+
+        if hasattr( self, 'history_sink' ):
+            self.history_sink.close()
+            return self.history_sink.offsets
+
+
+def run_worker(connection):
+    """
+        The main loop of a worker process, which receives the operations through its `connection`
+        as tuples `( operation, grammar_text, arguments, history_file )` and sends back the
+        messages `( "text", text )`, `( "progress", operation_name, progress )`, and at the end,
+        `( "results", results, history_offsets )` or `( "error", error_message )`.
+    """
+
+    while True:
+
+        try:
+            operation, grammar_text, arguments, history_file = connection.recv()
+
+        except EOFError:
+            return
+
+        function = WorkerFunction( connection, history_file )
+
+        try:
+            operation( function, grammar_text, *arguments )
+            connection.send( ( "results", function.results, function.close() ) )
+
+        except Exception as error:
+            log.exception( "" )
+            function.close()
+            connection.send( ( "error", str( error ) ) )
+
+
+class WorkerProcess(object):
+    """
+        A process started ahead of time, running the operations sent through its `connection`.
+    """
+
+    def __init__(self, context):
+        self.connection, worker_connection = context.Pipe()
+        self.process = context.Process( target=run_worker, args=( worker_connection, ), daemon=True )
+        self.process.start()
+
+        # Only the worker keeps its end of the pipe open, then, `recv()` fails if it dies
+        worker_connection.close()
+
+    def kill(self):
+        self.process.terminate()
+        self.process.join()
+        self.connection.close()
+
+
+class WorkerPool(object):
+    """
+        Keeps `size` idle worker processes started, then, the operations do not wait for a new
+        process to start and import the grammar modules. When all of them are busy, new ones are
+        started, then, several operations can run at the same time.
+
+        The workers are started with `spawn`, as forking a process with the user interface
+        threads running is not safe.
+    """
+
+    def __init__(self, size=2):
+        self.size = size
+        self.context = multiprocessing.get_context( "spawn" )
+
+        ## The workers can be acquired by the user interface thread, and released by the threads
+        ## waiting for their results
+        self.lock = threading.Lock()
+        self.idle_workers = [WorkerProcess( self.context ) for index in range( size )]
+
+    def acquire(self):
+        """
+            Return an idle `WorkerProcess`, which must be given back by `release()` or `discard()`.
+        """
+
+        with self.lock:
+
+            if self.idle_workers:
+                return self.idle_workers.pop()
+
+        return WorkerProcess( self.context )
+
+    def release(self, worker):
+        """
+            Gives back a `worker` which finished its operation.
+        """
+
+        with self.lock:
+
+            if len( self.idle_workers ) < self.size:
+                self.idle_workers.append( worker )
+                return
+
+        worker.kill()
+
+    def discard(self, worker):
+        """
+            Kills a `worker` which is still running its operation, starting another one on its place.
+        """
+        worker.kill()
+
+        with self.lock:
+            is_replaced = len( self.idle_workers ) < self.size
+
+        if is_replaced:
+            self.release( WorkerProcess( self.context ) )
+
+    def close(self):
+
+        with self.lock:
+            idle_workers = self.idle_workers
+            self.idle_workers = []
+
+        for worker in idle_workers:
+            worker.kill()
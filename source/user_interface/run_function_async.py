@@ -22,6 +22,7 @@
 #
 
 import os
+import time
 
 from PyQt5 import QtGui
 from PyQt5 import QtCore
@@ -30,6 +31,7 @@ from PyQt5.QtCore import Qt
 from debug_tools import getLogger
 
 from .utilities import ignore_exceptions
+from grammar.cancellation import Cancelled
 
 # level 4 - Abstract Syntax Tree Parsing
 log = getLogger( 127-4, __name__ )
@@ -38,6 +40,12 @@ log = getLogger( 127-4, __name__ )
 class RunFunctionAsyncThread(QtCore.QThread):
     """
         Dynamically updates the user interface with new sentences generated by the program.
+
+        The function runs on this thread, and its results are sent as soon as it returns, by the
+        `finished` signal. Meanwhile, a timer on the user interface thread calls `waiting()` once
+        per second. When the `results_dialog` asks to stop, the function `cancellation_token` is
+        cancelled, which the grammar operations check while running, instead of terminating this
+        thread, which could leave the Python interpreter state corrupted.
     """
 
     ## Send the given `function` full or partial results to the `results_dialog` window
@@ -55,12 +63,22 @@ class RunFunctionAsyncThread(QtCore.QThread):
     ## Restore the saved cursor/caret position by `save_cursor_position_signal`
     set_scroll_to_maximum_signal = QtCore.pyqtSignal()
 
-    def __init__(self, function, initial_message):
+    ## Displays the grammar history written by the `function.history_sink` on the `results_dialog` window
+    set_history_sink_signal = QtCore.pyqtSignal( [object] )
+
+    ## Displays the last progress reported by the `function` grammar operations, or hides it when empty
+    set_progress_signal = QtCore.pyqtSignal( [str] )
+
+    ## The minimum seconds between two progress updates, as the grammar operations can report
+    ## their progress thousands of times per second
+    PROGRESS_INTERVAL = 0.25
+
+    def __init__(self, function, initial_message, parent=None):
         """
             Qt- What is the difference between new QThread(this) and new QThread()?
             https://stackoverflow.com/questions/46293674/qt-what-is-the-difference-between-new-qthreadthis-and-new-qthread
         """
-        QtCore.QThread.__init__(self)
+        QtCore.QThread.__init__( self, parent )
 
         ## The function which will run asynchronously on this background thread
         self.function = function
@@ -68,101 +86,237 @@ class RunFunctionAsyncThread(QtCore.QThread):
         ## The initial message to display right after the the computation is finished
         self.initial_message = initial_message
 
-        ## The thread which will continually running the given `function`
-        self.process_thread = None
-
         ## Determines whether the waiting message was displayed one or not
         self.has_showed_waiting = False
 
         if hasattr( function, 'force_first_run' ):
             ## Whether or not the to force the `waiting` function to run at least one time, as it
-            ## can some time never be called
+            ## is not called when the function finishes before the first timer tick
             self.force_first_run = True
 
         else:
             self.force_first_run = False
 
+        ## When the last progress was sent by `reportProgress()`
+        self.last_progress_time = 0.0
+
+        ## The grammar operations report their progress to this thread, see
+        ## `ChomskyGrammar.progress_callback`
+        function.progress_callback = self.reportProgress
+
+        ## Whether the `function` sends its results with `function.send_string_signal` while they
+        ## are computed, instead of setting them all on `function.results` after it finishes
+        self.is_streaming = hasattr( function, 'is_streaming' )
+
         if hasattr( function, 'waiting' ):
-            ## A function to perform some periodic task one the thread has started
+            ## A function to perform some periodic task while the `function` is running, called on
+            ## the user interface thread by the `waiting_timer`
             self.waiting = function.waiting
 
         else:
 
             def default(self):
                 self.send_string_signal.emit( "Computing... No results available yet... " )
-                self.sleep( 1 )
 
             self.waiting = default
 
+        ## Calls `waiting()` once per second while the `function` is running
+        self.waiting_timer = QtCore.QTimer( self )
+        self.waiting_timer.setInterval( 1000 )
+        self.waiting_timer.timeout.connect( self.handleWaitingTimeout )
+
+        self.started.connect( self.waiting_timer.start )
+        self.finished.connect( self.handleFinished )
+
     @ignore_exceptions
     def run(self):
         """
             Process asynchronously in background the given function.
-
-            After starting, periodically calls each second the function `self.waiting()`.
         """
 
-        class ProcessThread(QtCore.QThread):
+        if self.is_streaming:
+            self.function.send_string_signal = self.send_string_signal
+            self.send_string_signal.emit( self.initial_message )
 
-            def __init__(self, parent, function):
-                QtCore.QThread.__init__(self, parent)
-                self.function = function
+        try:
+            self.function()
 
-            def run(self):
-                self.function()
+        except Cancelled:
+            self.function.results = "\n# The computation was stopped before finishing."
 
-        self.process_thread = ProcessThread( self.parent(), self.function )
-        self.process_thread.start()
+    def reportProgress(self, operation_name, progress):
+        """
+            Called on this thread by the `function` grammar operations, sending their progress to
+            the `results_dialog`, at most once each `PROGRESS_INTERVAL` seconds.
+        """
+        current_time = time.perf_counter()
 
-        force_first_run = self.force_first_run
-        self.sleep( 1 )
+        if current_time - self.last_progress_time < self.PROGRESS_INTERVAL:
+            return
 
-        while self.process_thread.isRunning() or force_first_run:
-            force_first_run = False
-            self.has_showed_waiting = True
+        self.last_progress_time = current_time
+        self.set_progress_signal.emit( "%s: %s" % ( operation_name,
+                ", ".join( "%s %s" % ( key.replace( "_", " " ), value ) for key, value in progress.items() ) ) )
 
-            self.set_scroll_to_maximum_signal.emit()
+    @ignore_exceptions
+    def handleWaitingTimeout(self):
+        """
+            Called each second on the user interface thread while the function is running.
+        """
+        self.set_scroll_to_maximum_signal.emit()
+
+        if not self.is_streaming and not self.function.cancellation_token.is_cancelled:
+            self.has_showed_waiting = True
             self.waiting( self )
 
-            if self.function.isToStop[0]:
-                self.sleep( 1 )
+    @ignore_exceptions
+    def handleFinished(self):
+        """
+            Called on the user interface thread as soon as the function has finished, or was
+            cancelled, to display its results.
+        """
+        self.waiting_timer.stop()
+        self.set_progress_signal.emit( "" )
 
-                if self.process_thread.isRunning():
-                    self.process_thread.terminate()
+        if self.force_first_run and not self.has_showed_waiting and not self.is_streaming:
+            self.has_showed_waiting = True
+            self.waiting( self )
 
-        # If it was not stopped by the close event setting isToStop, then append the success message
-        self.process_thread.wait()
-        self.send_string_signal.emit( self.initial_message )
+        if not self.is_streaming:
+            self.send_string_signal.emit( self.initial_message )
 
         if self.has_showed_waiting:
             self.send_string_signal.emit("")
 
         self.save_cursor_position_signal.emit()
         self.send_string_signal.emit( self.function.results )
-        self.msleep( 300 )
+
+        if hasattr( self.function, 'history_sink' ):
+            self.set_history_sink_signal.emit( self.function.history_sink )
 
         self.disable_stop_button_signal.emit()
         self.restore_cursor_position_signal.emit()
 
+        # The parent window keeps this thread alive while it runs, as several ones can run at the
+        # same time, but it would also keep all the finished ones, as nothing else releases them
+        self.deleteLater()
+
+
+class RunFunctionInProcessThread(RunFunctionAsyncThread):
+    """
+        Runs the `function.operation` of `grammar_operations.py` on a process of the `worker_pool`,
+        instead of on this thread, then, the grammar computations do not hold the Python global
+        interpreter lock of the user interface process.
+
+        This thread only waits for the messages the worker sends through its pipe, see
+        `process_backend.run_worker()`, and kills the worker when the function is cancelled.
+    """
+
+    def __init__(self, function, initial_message, parent, worker_pool):
+        super().__init__( function, initial_message, parent )
+
+        ## The `WorkerPool` running the function operation
+        self.worker_pool = worker_pool
+
+    @ignore_exceptions
+    def run(self):
+        """
+            Sends the function operation to a worker process, and waits for its results.
+        """
+        function = self.function
+        history_sink = getattr( function, 'history_sink', None )
+
+        if self.is_streaming:
+            self.send_string_signal.emit( self.initial_message )
+
+        worker = self.worker_pool.acquire()
+        connection = worker.connection
+
+        # The worker is only reused after sending its results, otherwise, it can still be running
+        # the operation, or its pipe can be broken
+        is_worker_idle = False
+
+        try:
+            connection.send( ( function.operation, function.grammar_text, function.arguments,
+                    history_sink.file_path if history_sink is not None else None ) )
+
+            while True:
+
+                if function.cancellation_token.is_cancelled:
+                    function.results = "\n# The computation was stopped before finishing."
+                    return
+
+                if not connection.poll( 0.1 ):
+                    continue
+
+                message = connection.recv()
+
+                if message[0] == "text":
+                    self.send_string_signal.emit( message[1] )
+
+                elif message[0] == "progress":
+                    self.reportProgress( message[1], message[2] )
+
+                elif message[0] == "results":
+                    is_worker_idle = True
+                    function.results = message[1]
+
+                    if history_sink is not None:
+                        history_sink.offsets = message[2]
+
+                    break
+
+                else:
+                    is_worker_idle = True
+                    raise RuntimeError( message[1] )
+
+        except EOFError:
+            function.results = "\n# The worker process stopped unexpectedly."
+
+        finally:
+
+            if is_worker_idle:
+                self.worker_pool.release( worker )
+
+            else:
+                self.worker_pool.discard( worker )
 
 @ignore_exceptions
-def run_function_async(function, results_dialog, initial_message):
+def run_function_async(function, results_dialog, initial_message, worker_pool=None):
     """
         Create the updating thread and connect
         it's received signal to append
         every received chunk of data/text will be appended to the text
+
+        With a `worker_pool`, the function operation runs on a worker process, see
+        `RunFunctionInProcessThread`, and the main window is not blocked while it runs, then,
+        several operations can run at the same time.
     """
-    qtUpdateThread = RunFunctionAsyncThread( function, initial_message )
+
+    if worker_pool is None:
+        qtUpdateThread = RunFunctionAsyncThread( function, initial_message, results_dialog.parent() )
+
+    else:
+        qtUpdateThread = RunFunctionInProcessThread( function, initial_message, results_dialog.parent(), worker_pool )
+
     qtUpdateThread.send_string_signal.connect( results_dialog.appendText )
     qtUpdateThread.disable_stop_button_signal.connect( results_dialog.disableStopButton )
     qtUpdateThread.save_cursor_position_signal.connect( results_dialog.saveCursorPosition )
     qtUpdateThread.restore_cursor_position_signal.connect( results_dialog.restoreCursorPosition )
     qtUpdateThread.set_scroll_to_maximum_signal.connect( results_dialog.setScrollToMaximum )
+    qtUpdateThread.set_history_sink_signal.connect( results_dialog.setHistorySink )
+    qtUpdateThread.set_progress_signal.connect( results_dialog.setProgressText )
+
+    # Connected after `handleFinished()`, then, the dialog receives the last results before it
+    results_dialog.isFunctionRunning = True
+    qtUpdateThread.finished.connect( results_dialog.handleFunctionFinished )
     qtUpdateThread.start()
 
     # Block QMainWindow while child widget is alive, pyqt
     # https://stackoverflow.com/questions/22410663/block-qmainwindow-while-child-widget-is-alive-pyqt
-    results_dialog.setWindowModality( Qt.ApplicationModal )
+    if worker_pool is None:
+        results_dialog.setWindowModality( Qt.ApplicationModal )
+
     results_dialog.show()
 
     return qtUpdateThread
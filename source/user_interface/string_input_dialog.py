@@ -176,8 +176,8 @@ class StringInputDialog(QMainWindow):
 
     # static method to create the dialog and return ( date, time, accepted )
     @staticmethod
-    def getNewUserInput(parent, fontOptions, _openFileCall, dialogTypeName, dialogTitleMessage):
-        dialog = StringInputDialog( parent, fontOptions, _openFileCall, dialogTypeName, dialogTitleMessage )
+    def getNewUserInput(parent, settings, fontOptions, _openFileCall, dialogTypeName, dialogTitleMessage):
+        dialog = StringInputDialog( parent, settings, fontOptions, _openFileCall, dialogTypeName, dialogTitleMessage )
         result = dialog.exec_()
 
         # dialog.deleteLater()
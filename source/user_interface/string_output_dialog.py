@@ -22,12 +22,15 @@
 #
 
 import os
+import shutil
+import tempfile
 import PyQt5
 
 from PyQt5.QtGui import QKeySequence
+from PyQt5.QtGui import QTextCursor
 
 from PyQt5.QtCore import Qt
-from PyQt5.QtCore import QCoreApplication
+from PyQt5.QtCore import QTimer
 
 from PyQt5.QtWidgets import QDialog
 from PyQt5.QtWidgets import QWidget
@@ -40,7 +43,11 @@ from PyQt5.QtWidgets import QVBoxLayout
 from PyQt5.QtWidgets import QHBoxLayout
 
 from PyQt5.QtWidgets import QPlainTextEdit
+from PyQt5.QtWidgets import QListView
+from PyQt5.QtWidgets import QLineEdit
+from PyQt5.QtWidgets import QAbstractItemView
 from PyQt5.QtWidgets import QPushButton
+from PyQt5.QtWidgets import QLabel
 from PyQt5.QtWidgets import QShortcut
 
 
@@ -56,6 +63,7 @@ from .utilities import get_screen_center
 from .utilities import ignore_exceptions
 from .utilities import set_scroll_to_maximum
 from .utilities import setTextWithoutCleaningHistory
+from .lines_file_model import LinesFileModel
 
 
 class StringOutputDialog(QMainWindow):
@@ -67,10 +75,20 @@ class StringOutputDialog(QMainWindow):
         https://stackoverflow.com/questions/27420338/how-to-clear-child-window-reference-stored-in-parent-application-when-child-wind
     """
 
-    def __init__(self, parent, settings, fontOptions, fileDialogOptions, isToStop):
+    ## The milliseconds the text received by `appendText()` is buffered, before being inserted
+    ## all at once, then, the results streamed in many small strings do not repaint the dialog
+    ## for each one of them
+    APPEND_INTERVAL = 100
+
+    ## How many characters the results text editor displays, after which, all the results are
+    ## written to a file and displayed by a `LinesFileModel`, as a too big document makes the
+    ## dialog unresponsive and uses too much memory
+    MAXIMUM_EDITOR_CHARACTERS = 2000000
+
+    def __init__(self, parent, settings, fontOptions, fileDialogOptions, cancellationToken):
         super().__init__( parent )
         self.settings = settings
-        self.isToStop = isToStop
+        self.cancellationToken = cancellationToken
         self.fileDialogOptions = fileDialogOptions
 
         # QWidget::setLayout: Attempting to set QLayout “” on ProgramWindow “”, which already has a layout
@@ -124,42 +142,249 @@ class StringOutputDialog(QMainWindow):
         self.standardButtons.rejected.connect( self.stopProcessing )
         self.saveFileButton.clicked.connect( self.handleSaveFileCall )
 
+        # The text received by `appendText()` waiting to be inserted by `flushText()`
+        self.pendingTexts = []
+        self.displayedCharacters = 0
+
+        # The temporary file with all the results, after they exceeded `MAXIMUM_EDITOR_CHARACTERS`,
+        # displayed by the `resultsListView` instead of the `textEditWidget`
+        self.resultsFile = None
+        self.resultsFilePath = None
+        self.resultsModel = None
+        self.cursorRow = 0
+
+        self.listViewFontOptions = fontOptions.replace( "QPlainTextEdit", "QListView" )
+        self.resultsListView = self.createListView()
+        self.resultsListView.setVisible( False )
+
+        self.appendTimer = QTimer( self )
+        self.appendTimer.setSingleShot( True )
+        self.appendTimer.setInterval( self.APPEND_INTERVAL )
+        self.appendTimer.timeout.connect( self.flushText )
+
+        # The grammar history lines are read from its file only when displayed, see `setHistorySink()`
+        self.historySink = None
+        self.historyModel = None
+        self.historyListView = self.createListView()
+        self.historyLabel = QLabel()
+
+        # While the function is running, its thread can still write to the history file, and send
+        # more results, then, after closing, the files are only closed by `handleFunctionFinished()`
+        self.isFunctionRunning = False
+        self.isClosed = False
+
+        # Searches the results and the history files directly, see `handleFindNext()`
+        self.searchLineEdit = QLineEdit()
+        self.searchLineEdit.setPlaceholderText( "Search the results and history" )
+        self.findNextButton = QPushButton( "Find next" )
+
+        self.searchLineEdit.returnPressed.connect( self.handleFindNext )
+        self.findNextButton.clicked.connect( self.handleFindNext )
+
+        # The progress reported by the grammar operations while they run, see `setProgressText()`
+        self.progressLabel = QLabel()
+        self.progressLabel.setVisible( False )
+
         # Setup the main layout
         self.verticalLayout = QVBoxLayout( self.centralwidget )
         self.horizontalLayout = QHBoxLayout()
+        self.searchLayout = QHBoxLayout()
 
         self.verticalLayout.addWidget( self.textEditWidget )
+        self.verticalLayout.addWidget( self.resultsListView )
+        self.verticalLayout.addWidget( self.historyLabel )
+        self.verticalLayout.addWidget( self.historyListView )
+        self.verticalLayout.addWidget( self.progressLabel )
+        self.verticalLayout.addLayout( self.searchLayout )
         self.verticalLayout.addLayout( self.horizontalLayout )
 
+        self.searchLayout.addWidget( self.searchLineEdit )
+        self.searchLayout.addWidget( self.findNextButton )
+        self.setHistoryWidgetsVisible( False )
+
         self.horizontalLayout.addWidget( self.saveFileButton )
         self.horizontalLayout.addWidget( self.standardButtons )
 
+    def createListView(self):
+        """
+            Return a view for a `LinesFileModel`, which only asks the rows displayed to it, as all
+            its rows have the same height.
+        """
+        listView = QListView( self )
+        listView.setStyleSheet( self.listViewFontOptions )
+        listView.setUniformItemSizes( True )
+        listView.setWordWrap( False )
+        listView.setTextElideMode( Qt.ElideNone )
+        listView.setHorizontalScrollBarPolicy( Qt.ScrollBarAsNeeded )
+        listView.setSelectionMode( QAbstractItemView.ExtendedSelection )
+        return listView
+
+    def createLinesModel(self, listView, filePath):
+        linesModel = LinesFileModel( filePath, self )
+        listView.ensurePolished()
+
+        fontMetrics = listView.fontMetrics()
+        linesModel.set_character_size( fontMetrics.averageCharWidth(), fontMetrics.height() )
+        listView.setModel( linesModel )
+        return linesModel
+
     def appendText(self, textToAppend):
-        self.textEditWidget.appendPlainText( textToAppend )
-        self.textEditWidget.repaint()
-        QCoreApplication.processEvents()
+        """
+            Appends the text as a new paragraph, after at most `APPEND_INTERVAL` milliseconds,
+            together with the text received meanwhile.
+        """
+        self.pendingTexts.append( textToAppend )
+
+        if not self.appendTimer.isActive():
+            self.appendTimer.start()
+
+    def flushText(self):
+        """
+            Inserts the text received by `appendText()` all at once, on the results text editor
+            up to the `MAXIMUM_EDITOR_CHARACTERS`, otherwise, on the results file.
+        """
+        self.appendTimer.stop()
+
+        if not self.pendingTexts:
+            return
+
+        text = "\n".join( self.pendingTexts )
+        self.pendingTexts.clear()
+
+        if self.resultsFile is None:
+
+            if self.displayedCharacters + len( text ) <= self.MAXIMUM_EDITOR_CHARACTERS:
+                self.textEditWidget.appendPlainText( text )
+                self.displayedCharacters += len( text ) + 1
+                return
+
+            self.switchToResultsFile()
+
+        if self.resultsFile.tell():
+            self.resultsFile.write( "\n" )
+
+        self.resultsFile.write( text )
+        self.resultsFile.flush()
+        self.resultsModel.refresh()
+
+    def switchToResultsFile(self):
+        """
+            Moves the results displayed by the text editor to a temporary file, displayed by the
+            `resultsListView`, which only reads the lines displayed from it.
+        """
+        fileDescriptor, self.resultsFilePath = tempfile.mkstemp( suffix=".txt", prefix="grammar_results_" )
+        self.resultsFile = open( fileDescriptor, 'w', encoding='utf-8', newline='\n' )
+        self.resultsFile.write( self.textEditWidget.toPlainText() )
+        self.resultsFile.flush()
+
+        self.resultsModel = self.createLinesModel( self.resultsListView, self.resultsFilePath )
+        self.textEditWidget.setVisible( False )
+        self.textEditWidget.document().setPlainText( "" )
+        self.resultsListView.setVisible( True )
 
     def saveCursorPosition(self):
-        textEditWidget = self.textEditWidget
-        self.textCursor = textEditWidget.textCursor()
-        self.cursorPosition = self.textCursor.position()
+        self.flushText()
+
+        if self.resultsModel is None:
+            textEditWidget = self.textEditWidget
+            self.textCursor = textEditWidget.textCursor()
+            self.cursorPosition = self.textCursor.position()
+            self.cursorRow = self.textCursor.blockNumber()
+
+        else:
+            self.cursorRow = max( 0, self.resultsModel.rowCount() - 1 )
 
     def restoreCursorPosition(self):
-        textCursor = self.textCursor
-        textEditWidget = self.textEditWidget
-        textCursor.setPosition( self.cursorPosition )
-        textEditWidget.setTextCursor( textCursor )
-        set_scroll_to_maximum( textEditWidget )
+        self.flushText()
+
+        if self.resultsModel is None:
+            textCursor = self.textCursor
+            textEditWidget = self.textEditWidget
+            textCursor.setPosition( self.cursorPosition )
+            textEditWidget.setTextCursor( textCursor )
+            set_scroll_to_maximum( textEditWidget )
+
+        else:
+            self.resultsListView.scrollTo( self.resultsModel.index( self.cursorRow ), QAbstractItemView.PositionAtTop )
 
     def setScrollToMaximum(self):
-        textEditWidget = self.textEditWidget
-        set_scroll_to_maximum( textEditWidget, True )
+        self.flushText()
+
+        if self.resultsModel is None:
+            textEditWidget = self.textEditWidget
+            set_scroll_to_maximum( textEditWidget, True )
+
+        else:
+            self.resultsListView.scrollToBottom()
 
     def disableStopButton(self):
         self.stopButton.setEnabled( False )
 
+    def setProgressText(self, progressText):
+        self.progressLabel.setText( progressText )
+        self.progressLabel.setVisible( bool( progressText ) )
+
+    def setHistoryWidgetsVisible(self, isVisible):
+        self.historyListView.setVisible( isVisible )
+        self.historyLabel.setVisible( isVisible )
+
+    def setHistorySink(self, historySink):
+        """
+            Displays the grammar history written to the given `FileHistorySink` file, reading only
+            the lines displayed from it, instead of loading all of it.
+        """
+        self.historySink = historySink
+        historySink.file.flush()
+
+        self.historyModel = self.createLinesModel( self.historyListView, historySink.file_path )
+        self.historyLabel.setText( "The grammar history has %s entries:" % len( historySink ) )
+        self.setHistoryWidgetsVisible( True )
+
+    @ignore_exceptions
+    def handleFindNext(self, qt_decorator_bug=None):
+        """
+            Selects the next line with the searched text on the results, or on the history after
+            them, starting again from the beginning of the results after the end of the history.
+        """
+        text = self.searchLineEdit.text()
+
+        if not text:
+            return
+
+        for isFromStart in ( False, True ):
+
+            if self.findOnResults( text, isFromStart ):
+                return
+
+            if self.historyModel is not None and self.findOnListView( self.historyListView, self.historyModel, text, isFromStart ):
+                return
+
+        self.statusBar().showMessage( "`%s` was not found." % text, 5000 )
+
+    def findOnResults(self, text, isFromStart):
+
+        if self.resultsModel is not None:
+            return self.findOnListView( self.resultsListView, self.resultsModel, text, isFromStart )
+
+        if isFromStart:
+            self.textEditWidget.moveCursor( QTextCursor.Start )
+
+        return self.textEditWidget.find( text )
+
+    def findOnListView(self, listView, linesModel, text, isFromStart):
+        row = linesModel.find( text, 0 if isFromStart else listView.currentIndex().row() + 1 )
+
+        if row < 0:
+            return False
+
+        index = linesModel.index( row )
+        listView.setCurrentIndex( index )
+        listView.scrollTo( index, QAbstractItemView.PositionAtCenter )
+        listView.setFocus()
+        return True
+
     def stopProcessing(self):
-        self.isToStop[0] = True
+        self.cancellationToken.cancel()
         self.disableStopButton()
 
     def closeEvent(self, event=None):
@@ -171,6 +396,42 @@ class StringOutputDialog(QMainWindow):
         # self.event.quit()
 
         self.stopProcessing()
+        self.appendTimer.stop()
+        self.isClosed = True
+
+        if not self.isFunctionRunning:
+            self.closeFiles()
+
+    def handleFunctionFinished(self):
+        """
+            Called after the function thread finished, and sent its last results, then, if this
+            dialog was already closed, its files can be closed and deleted.
+        """
+        self.isFunctionRunning = False
+
+        if self.isClosed:
+            self.closeFiles()
+
+    def closeFiles(self):
+        """
+            Closes and deletes the history and results files, after the function stopped writing to
+            them, then, deletes this dialog.
+        """
+        self.appendTimer.stop()
+        self.pendingTexts.clear()
+
+        # The memory maps must be closed before the files are deleted
+        if self.historyModel is not None:
+            self.historyModel.close()
+
+        if self.historySink is not None:
+            self.historySink.close()
+
+        if self.resultsFile is not None:
+            self.resultsModel.close()
+            self.resultsFile.close()
+            os.remove( self.resultsFilePath )
+
         self.deleteLater()
 
     def keyPressEvent(self, event):
@@ -186,7 +447,22 @@ class StringOutputDialog(QMainWindow):
         fileName, _ = QFileDialog.getSaveFileName( self, "Choose a name", "","Text Files (*.txt)", options=self.fileDialogOptions )
 
         if fileName:
+            self.flushText()
 
             with open( fileName + '.txt', 'w', encoding='utf-8' ) as file:
-                file.write( self.textEditWidget.toPlainText() )
+
+                if self.resultsFile is None:
+                    file.write( self.textEditWidget.toPlainText() )
+
+                else:
+
+                    with open( self.resultsFilePath, 'r', encoding='utf-8' ) as resultsFile:
+                        shutil.copyfileobj( resultsFile, file )
+
+                if self.historySink is not None:
+                    file.write( "\n\n" )
+                    self.historySink.file.flush()
+
+                    with open( self.historySink.file_path, 'r', encoding='utf-8' ) as historyFile:
+                        shutil.copyfileobj( historyFile, file )
 
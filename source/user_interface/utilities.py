@@ -90,9 +90,6 @@ def set_scroll_to_maximum(textEditWidget, to_bottom=False):
     textEditWidget.moveCursor( QtGui.QTextCursor.StartOfLine )
     textEditWidget.ensureCursorVisible()
 
-    textEditWidget.repaint()
-    QCoreApplication.processEvents()
-
 
 def get_screen_center(self):
     """